@@ -0,0 +1,44 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin/contracts/utils/Address.sol";
+import "@openzeppelin/contracts/utils/Create2.sol";
+
+/**
+ * @dev Deploys contracts with CREATE2, so their addresses depend only on the
+ * deployer, salt and init code and are known before deployment.
+ * Salts are bound to the sender, nobody else can take a deployer's addresses.
+ * Contracts granting roles to their creator grant them to this contract,
+ * `calls` made right after the deployment hand them over.
+ */
+contract HighriseCreate2Deployer {
+    event Deployed(address indexed deployer, address addr, bytes32 salt);
+
+    function deploy(
+        bytes32 salt,
+        bytes memory initCode,
+        bytes[] memory calls
+    ) external returns (address addr) {
+        addr = Create2.deploy(0, _salt(msg.sender, salt), initCode);
+        for (uint256 i = 0; i < calls.length; i++) {
+            Address.functionCall(addr, calls[i]);
+        }
+        emit Deployed(msg.sender, addr, salt);
+    }
+
+    function computeAddress(
+        address deployer,
+        bytes32 salt,
+        bytes32 initCodeHash
+    ) external view returns (address) {
+        return Create2.computeAddress(_salt(deployer, salt), initCodeHash);
+    }
+
+    function _salt(address deployer, bytes32 salt)
+        internal
+        pure
+        returns (bytes32)
+    {
+        return keccak256(abi.encodePacked(deployer, salt));
+    }
+}
@@ -0,0 +1,111 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin/contracts/utils/cryptography/ECDSA.sol";
+import "@openzeppelin/contracts/utils/introspection/ERC165Checker.sol";
+
+import "../../interfaces/IHighriseLand.sol";
+
+/**
+ * @dev Land sale of the fund contracts: buyers pay for land reservations signed by the owner,
+ * who enables and disables the sale. Inheriting contracts hold owner and land contract,
+ * immutable unless deployed as clones, and decide what happens to the funds.
+ */
+abstract contract HighriseLandFundBase {
+    using ERC165Checker for address;
+    using ECDSA for bytes32;
+
+    event FundLandEvent(address indexed sender, uint256 fundAmount);
+    event FundStateChangedEvent(bool enabled);
+
+    enum FundState {
+        ENABLED,
+        DISABLED
+    }
+
+    // Wei funded per buyer
+    mapping(address => uint256) public addressToAmountFunded;
+    FundState public fundState;
+
+    modifier enabled() {
+        require(
+            fundState == FundState.ENABLED,
+            "Contract not enabled for funding"
+        );
+        _;
+    }
+
+    modifier disabled() {
+        require(
+            fundState == FundState.DISABLED,
+            "Disable contract before withdrawing"
+        );
+        _;
+    }
+
+    modifier onlyOwner() {
+        require(msg.sender == _fundOwner(), "Sender is not the owner");
+        _;
+    }
+
+    /**
+     * @dev Account signing the reservations, which manages the sale.
+     */
+    function _fundOwner() internal view virtual returns (address);
+
+    /**
+     * @dev Land contract minting the funded tokens.
+     */
+    function _fundLandContract() internal view virtual returns (address);
+
+    function _requireHighriseLand(address _landContract) internal view {
+        require(
+            _landContract.supportsInterface(type(IHighriseLand).interfaceId),
+            "IS_NOT_HIGHRISE_LAND_CONTRACT"
+        );
+    }
+
+    function fund(bytes memory data, bytes memory signature)
+        public
+        payable
+        enabled
+    {
+        require(
+            _verify(keccak256(data), signature, _fundOwner()),
+            "Payload verification failed"
+        );
+        (
+            uint256 tokenId,
+            uint256 expiry,
+            uint256 cost,
+            address approvedOwner
+        ) = abi.decode(
+                abi.encodePacked(data),
+                (uint256, uint256, uint256, address)
+            );
+        require(msg.sender == approvedOwner, "Sender not approved to buy token");
+        require(expiry > block.timestamp, "Reservation expired");
+        require(msg.value == cost, "Amount sent does not match land price");
+        addressToAmountFunded[msg.sender] += msg.value;
+        IHighriseLand(_fundLandContract()).mint(msg.sender, tokenId);
+        emit FundLandEvent(msg.sender, msg.value);
+    }
+
+    function enable() public onlyOwner {
+        fundState = FundState.ENABLED;
+        emit FundStateChangedEvent(true);
+    }
+
+    function disable() public onlyOwner {
+        fundState = FundState.DISABLED;
+        emit FundStateChangedEvent(false);
+    }
+
+    function _verify(
+        bytes32 data,
+        bytes memory signature,
+        address account
+    ) internal pure returns (bool) {
+        return data.recover(signature) == account;
+    }
+}
@@ -0,0 +1,47 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin/contracts/access/IAccessControl.sol";
+import "@openzeppelin/contracts/proxy/Clones.sol";
+
+import "./HighriseLandFundInitializable.sol";
+
+/**
+ * @dev Creates `HighriseLandFundInitializable` clones (EIP-1167) for sales of
+ * a land contract and grants them `MINTER_ROLE` in the same transaction.
+ * The factory must be granted the admin role of `MINTER_ROLE` on the land.
+ */
+contract HighriseLandFundFactory {
+    event FundCreated(address indexed fund, address indexed owner);
+
+    bytes32 public constant MINTER_ROLE = keccak256("MINTER_ROLE");
+
+    address public immutable owner;
+    address public immutable implementation;
+    address public immutable landContract;
+
+    constructor(address _implementation, address _landContract) {
+        owner = msg.sender;
+        implementation = _implementation;
+        landContract = _landContract;
+    }
+
+    modifier onlyOwner() {
+        require(msg.sender == owner, "Sender is not the owner");
+        _;
+    }
+
+    /**
+     * @dev Creates a fund owned by the sender, which signs its payloads.
+     */
+    function createFund(bool enabled) external onlyOwner returns (address fund) {
+        fund = Clones.clone(implementation);
+        HighriseLandFundInitializable(fund).initialize(
+            msg.sender,
+            landContract,
+            enabled
+        );
+        IAccessControl(landContract).grantRole(MINTER_ROLE, fund);
+        emit FundCreated(fund, msg.sender);
+    }
+}
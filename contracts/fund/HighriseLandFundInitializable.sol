@@ -0,0 +1,46 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin/contracts/proxy/utils/Initializable.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
+
+import "./HighriseLandFundBase.sol";
+
+/**
+ * @dev `HighriseLandFund` as an implementation of minimal proxy clones,
+ * created per sale by `HighriseLandFundFactory`. Owner and land contract are
+ * set by `initialize` instead of the constructor and kept in storage, as
+ * immutables would be shared by every clone.
+ */
+contract HighriseLandFundInitializable is Initializable, HighriseLandFundBase {
+    address public owner;
+    address public landContract;
+
+    /// Do not leave an implementation contract uninitialized.
+    /// @custom:oz-upgrades-unsafe-allow constructor
+    constructor() initializer {}
+
+    function initialize(
+        address _owner,
+        address _landContract,
+        bool _enabled
+    ) public initializer {
+        _requireHighriseLand(_landContract);
+        owner = _owner;
+        landContract = _landContract;
+        fundState = _enabled ? FundState.ENABLED : FundState.DISABLED;
+        emit FundStateChangedEvent(_enabled);
+    }
+
+    function _fundOwner() internal view override returns (address) {
+        return owner;
+    }
+
+    function _fundLandContract() internal view override returns (address) {
+        return landContract;
+    }
+
+    function withdraw() public onlyOwner disabled {
+        Address.sendValue(payable(msg.sender), address(this).balance);
+    }
+}
@@ -0,0 +1,38 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin/contracts/finance/PaymentSplitter.sol";
+
+import "./HighriseLandFundBase.sol";
+
+/**
+ * @dev `HighriseLandFund` variant splitting sale revenue between payees.
+ * Payments accrue to payees by their shares as they are received, payees
+ * withdraw their part with `release` at any time, without disabling the sale.
+ * Payees' parts are derived from the balance and released totals in `release`,
+ * so `fund` does no per-payee bookkeeping.
+ */
+contract HighriseLandSplitFund is HighriseLandFundBase, PaymentSplitter {
+    address public immutable owner;
+    address public immutable landContract;
+
+    constructor(
+        address _owner,
+        address _landContract,
+        address[] memory payees,
+        uint256[] memory shares_
+    ) PaymentSplitter(payees, shares_) {
+        _requireHighriseLand(_landContract);
+        owner = _owner;
+        fundState = FundState.DISABLED;
+        landContract = _landContract;
+    }
+
+    function _fundOwner() internal view override returns (address) {
+        return owner;
+    }
+
+    function _fundLandContract() internal view override returns (address) {
+        return landContract;
+    }
+}
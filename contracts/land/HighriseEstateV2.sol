@@ -0,0 +1,613 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin-upgradeable/contracts/token/ERC721/ERC721Upgradeable.sol";
+import "@openzeppelin-upgradeable/contracts/access/AccessControlEnumerableUpgradeable.sol";
+import "@openzeppelin-upgradeable/contracts/token/ERC721/utils/ERC721HolderUpgradeable.sol";
+import "@openzeppelin/contracts/token/ERC721/IERC721.sol";
+import "@openzeppelin/contracts/utils/introspection/ERC165Checker.sol";
+
+import "../../interfaces/IHighriseLandV3.sol";
+import "../opensea/OpenseaProxyCacheUpgradeable.sol";
+import "../opensea/Utils.sol";
+import "../upgrades/ERC721DefaultRoyaltyUpgradeable.sol";
+import "../upgrades/ERC721EnumerableRetiredUpgradeable.sol";
+
+contract HighriseEstateV2 is
+    Initializable,
+    ERC721Upgradeable,
+    ERC721EnumerableRetiredUpgradeable,
+    ERC721HolderUpgradeable,
+    ERC721DefaultRoyaltyUpgradeable,
+    AccessControlEnumerableUpgradeable,
+    OpenseaProxyCacheUpgradeable
+{
+    using ERC165Checker for address;
+
+    event EstateMinted(uint256 tokenId, address to, uint32[] parcelIds);
+
+    // CONSTANTS
+    bytes32 public constant OWNER_ROLE = keccak256("OWNER_ROLE");
+
+    // ------------------------ STORAGE --------------------------------------
+    string private _baseTokenURI;
+    address private _land;
+    mapping(uint256 => uint256[]) public estatesToParcels;
+    ProxyRegistry private _openseaProxyRegistry;
+    OpenseaProxyCache private _openseaProxies;
+    // Reverse index of estate parcels, see {parcelToEstate}
+    mapping(uint256 => uint256) private _parcelEstates;
+
+    // -----------------------------------------------------------------------
+
+    // ------------------------ INITIALIZER -----------------------------------
+    /// Do not leave an implementation contract uninitialized. An uninitialized implementation contract can be taken over by an attacker, which may impact the proxy
+    /// Including a constructor to automatically mark it as initialized.
+    /// @custom:oz-upgrades-unsafe-allow constructor
+    constructor() initializer {}
+
+    function initialize(
+        string memory name,
+        string memory symbol,
+        string memory baseTokenURI,
+        address land,
+        address openseaProxyRegistry
+    ) public virtual initializer {
+        require(
+            land.supportsInterface(type(IERC721).interfaceId),
+            "IS_NOT_ERC721_CONTRACT"
+        );
+        __HighriseEstateV2_init(
+            name,
+            symbol,
+            baseTokenURI,
+            land,
+            openseaProxyRegistry
+        );
+    }
+
+    function __HighriseEstateV2_init(
+        string memory name,
+        string memory symbol,
+        string memory baseTokenURI,
+        address land,
+        address openseaProxyRegistry
+    ) internal onlyInitializing {
+        __ERC721_init(name, symbol);
+        __ERC721DefaultRoyalty_init();
+        __ERC721Holder_init();
+        __AccessControlEnumerable_init();
+        __HighriseEstateV2_init_unchained(
+            name,
+            symbol,
+            baseTokenURI,
+            land,
+            openseaProxyRegistry
+        );
+    }
+
+    function __HighriseEstateV2_init_unchained(
+        string memory,
+        string memory,
+        string memory baseTokenURI,
+        address land,
+        address openseaProxyRegistry
+    ) internal onlyInitializing {
+        _baseTokenURI = baseTokenURI;
+        _land = land;
+        _openseaProxyRegistry = ProxyRegistry(openseaProxyRegistry);
+        _grantRole(DEFAULT_ADMIN_ROLE, msg.sender);
+        _grantRole(OWNER_ROLE, msg.sender);
+        _setDefaultRoyalty(msg.sender, 500);
+    }
+
+    // ------------------------------------------------------------------------
+
+    /**
+     * @dev Token URIs will be autogenerated based on `baseURI` and their token IDs.
+     * See {ERC721-tokenURI}.
+     */
+    function _baseURI() internal view virtual override returns (string memory) {
+        return _baseTokenURI;
+    }
+
+    function parseToCoordinates(uint32 tokenId)
+        public
+        pure
+        returns (int16[2] memory)
+    {
+        int16 x = int16(int32(tokenId >> 16));
+        int16 y = int16(int32(tokenId));
+        return [x, y];
+    }
+
+    /**
+    The expected array shape is:
+     | ----------   x
+     | [0  1  2]
+     | [3  4  5]
+     | [6  7  8]
+     y
+     */
+    function _isEstateShapeValid(uint32[] memory parcelIds) internal returns (uint256) {
+        uint32 size = 0;
+        if (parcelIds.length == 9) {
+            // We expect a 3x3 matrix.
+            size = 3;
+        } else if (parcelIds.length == 36) {
+            size = 6;
+        } else if (parcelIds.length == 81) {
+            size = 9;
+        } else if (parcelIds.length == 144) {
+            size = 12;
+        }
+        require(size != 0, "HRESTATE: Invalid estate shape");
+        // For each row,
+        for (uint32 y = 0; y < size; y++) {
+            // For each X except the last,
+            for (uint32 x = 0; x < size - 1; x++) {
+                uint32 curr = parcelIds[y * size + x];
+                uint32 right = parcelIds[y * size + x + 1];
+                int16[2] memory currCoords = parseToCoordinates(curr);
+                int16[2] memory rightCoords = parseToCoordinates(right);
+
+                // Validate neighboring column
+                require(
+                    currCoords[0] + 1 == rightCoords[0],
+                    "HRESTATE: Invalid coordinates. Land parcels are not adjacent horizontally"
+                );
+                // Validate that the row is the same
+                require(
+                    currCoords[1] == rightCoords[1],
+                    "HRESTATE: Invalid coordinates. Land parcels in row do not have same vertical coordinate"
+                );
+                // Validate that rows are one above other
+                if (x == 0 && y < size - 1) {
+                    uint32 upper = parcelIds[(y + 1) * size + x];
+                    int16[2] memory upperCoords = parseToCoordinates(upper);
+                    require(
+                        currCoords[0] == upperCoords[0],
+                        "HRESTATE: Invalid coordinates. Land parcel rows do not have same column coordinates"
+                    );
+                    require(
+                        currCoords[1] + 1 == upperCoords[1],
+                        "HRESTATE: Invalid coordinates. Land parcels are not adjacent vertically"
+                    );
+                }
+            }
+        }
+        // Estate tokenId is the same as land parcel tokenId of top-left coordinate
+        return parcelIds[(size - 1) * size];
+    }
+
+    function _tokensValid(uint32[] memory tokenIds) internal {
+        for (uint32 i = 0; i < tokenIds.length; i++) {
+            address owner = IERC721(_land).ownerOf(tokenIds[i]);
+            require(msg.sender == owner, "HRESTATE: Sender is not token owner");
+            address approved = IERC721(_land).getApproved(tokenIds[i]);
+            require(address(this) == approved, "HRESTATE: Estate contract not approved");
+        }
+
+    }
+
+    /**
+     * @dev Parcels are moved with the estate transfer grant of the sender when there is one,
+     * see {HighriseLandV3-grantEstateTransfer}, otherwise every parcel must be approved.
+     * Land implementations before V3 have no grants, approvals are used until land is upgraded.
+     */
+    function _pullParcels(uint32[] memory tokenIds) internal {
+        if (tokenIds.length == 0) {
+            return;
+        }
+        if (
+            _land.supportsInterface(type(IHighriseLandV3).interfaceId) &&
+            IHighriseLandV3(_land).estateTransferGrant(msg.sender) >
+            block.timestamp
+        ) {
+            IHighriseLandV3(_land).transferToEstate(msg.sender, tokenIds);
+            return;
+        }
+        _tokensValid(tokenIds);
+        for (uint32 i = 0; i < tokenIds.length; i++) {
+            IERC721(_land).safeTransferFrom(
+                msg.sender,
+                address(this),
+                tokenIds[i]
+            );
+        }
+    }
+
+    function mintFromParcels(uint32[] memory tokenIds)
+        public
+        returns (uint256)
+    {
+        uint256 tokenId = _isEstateShapeValid(tokenIds);
+        _pullParcels(tokenIds);
+        estatesToParcels[tokenId] = tokenIds;
+        _indexSquare(_square(tokenIds[0], tokenId), tokenId, true);
+        _mint(msg.sender, tokenId);
+        emit EstateMinted(tokenId, msg.sender, tokenIds);
+        return tokenId;
+    }
+
+    function burn(uint256 tokenId) public {
+        require(
+            _exists(tokenId),
+            "ERC721: operator query for nonexistent token"
+        );
+        require(
+            _isApprovedOrOwner(msg.sender, tokenId),
+            "ERC721Burnable: caller is not owner nor approved"
+        );
+        uint256[] memory parcels = estatesToParcels[tokenId];
+        _indexSquare(_square(uint32(parcels[0]), tokenId), tokenId, false);
+        _burn(tokenId);
+        // Returned after the burn, receivers can't move the burned estate
+        for (uint256 i = 0; i < parcels.length; i++) {
+            IERC721(_land).safeTransferFrom(
+                address(this),
+                msg.sender,
+                parcels[i]
+            );
+        }
+    }
+
+    // ------------------------ RESHAPE ---------------------------------------
+    event EstateReshaped(uint256[] fromTokenIds, uint32[] returnedParcelIds);
+
+    // Bottom-left coordinates and size of an estate
+    struct Square {
+        int32 x;
+        int32 y;
+        int32 size;
+    }
+
+    /**
+     * @dev Replaces estates `tokenIds` of the sender with estates made of `shapes`, moving only the delta parcels.
+     * Parcels of `shapes` outside the replaced estates are pulled from the sender like in {mintFromParcels},
+     * parcels of the replaced estates outside `shapes` are returned to the sender.
+     * Estates which keep their token ID are rewritten in place, others are burned or minted.
+     * {EstateMinted} is emitted for every resulting estate.
+     *
+     * Merging four 3x3 estates into a 6x6, splitting it back or growing it into a 9x9 are single reshapes.
+     */
+    function reshape(uint256[] memory tokenIds, uint32[][] memory shapes)
+        public
+        returns (uint256[] memory newTokenIds)
+    {
+        Square[] memory sources = new Square[](tokenIds.length);
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            require(
+                ownerOf(tokenIds[i]) == msg.sender,
+                "HRESTATE: Sender is not estate owner"
+            );
+            for (uint256 j = 0; j < i; j++) {
+                require(tokenIds[j] != tokenIds[i], "HRESTATE: Duplicate estate");
+            }
+            sources[i] = _square(
+                uint32(estatesToParcels[tokenIds[i]][0]),
+                tokenIds[i]
+            );
+        }
+        Square[] memory targets = new Square[](shapes.length);
+        newTokenIds = new uint256[](shapes.length);
+        for (uint256 i = 0; i < shapes.length; i++) {
+            newTokenIds[i] = _isEstateShapeValid(shapes[i]);
+            targets[i] = _square(shapes[i][0], newTokenIds[i]);
+            for (uint256 j = 0; j < i; j++) {
+                require(
+                    !_overlaps(targets[j], targets[i]),
+                    "HRESTATE: Estates overlap"
+                );
+            }
+        }
+
+        _pullParcels(_difference(targets, sources));
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            _indexSquare(sources[i], tokenIds[i], false);
+            if (!_includes(newTokenIds, tokenIds[i])) {
+                _burn(tokenIds[i]);
+            }
+        }
+        for (uint256 i = 0; i < shapes.length; i++) {
+            estatesToParcels[newTokenIds[i]] = shapes[i];
+            _indexSquare(targets[i], newTokenIds[i], true);
+            if (!_includes(tokenIds, newTokenIds[i])) {
+                _mint(msg.sender, newTokenIds[i]);
+            }
+            emit EstateMinted(newTokenIds[i], msg.sender, shapes[i]);
+        }
+        // Returned last, receivers see the reshaped estates only
+        uint32[] memory returned = _difference(sources, targets);
+        for (uint256 i = 0; i < returned.length; i++) {
+            IERC721(_land).safeTransferFrom(
+                address(this),
+                msg.sender,
+                returned[i]
+            );
+        }
+        emit EstateReshaped(tokenIds, returned);
+    }
+
+    function merge(uint256[] memory tokenIds, uint32[] memory parcelIds)
+        public
+        returns (uint256)
+    {
+        uint32[][] memory shapes = new uint32[][](1);
+        shapes[0] = parcelIds;
+        return reshape(tokenIds, shapes)[0];
+    }
+
+    function split(uint256 tokenId, uint32[][] memory shapes)
+        public
+        returns (uint256[] memory)
+    {
+        uint256[] memory tokenIds = new uint256[](1);
+        tokenIds[0] = tokenId;
+        return reshape(tokenIds, shapes);
+    }
+
+    function _square(uint32 firstParcelId, uint256 tokenId)
+        internal
+        pure
+        returns (Square memory)
+    {
+        // Estate token ID is the first parcel of the last row
+        int16[2] memory first = parseToCoordinates(firstParcelId);
+        int16[2] memory last = parseToCoordinates(uint32(tokenId));
+        return Square(first[0], first[1], int32(last[1]) - first[1] + 1);
+    }
+
+    function _contains(
+        Square[] memory squares,
+        int32 x,
+        int32 y
+    ) internal pure returns (bool) {
+        for (uint256 i = 0; i < squares.length; i++) {
+            Square memory square = squares[i];
+            if (
+                x >= square.x &&
+                x < square.x + square.size &&
+                y >= square.y &&
+                y < square.y + square.size
+            ) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    function _parcelId(int32 x, int32 y) internal pure returns (uint32) {
+        return (uint32(uint16(int16(x))) << 16) | uint32(uint16(int16(y)));
+    }
+
+    function _overlaps(Square memory a, Square memory b)
+        internal
+        pure
+        returns (bool)
+    {
+        return
+            a.x < b.x + b.size &&
+            b.x < a.x + a.size &&
+            a.y < b.y + b.size &&
+            b.y < a.y + a.size;
+    }
+
+    function _includes(uint256[] memory values, uint256 value)
+        internal
+        pure
+        returns (bool)
+    {
+        for (uint256 i = 0; i < values.length; i++) {
+            if (values[i] == value) {
+                return true;
+            }
+        }
+        return false;
+    }
+
+    /**
+     * @dev Parcel IDs of `squares` which are not covered by `others`.
+     */
+    function _difference(Square[] memory squares, Square[] memory others)
+        internal
+        pure
+        returns (uint32[] memory parcelIds)
+    {
+        uint256 count = 0;
+        for (uint256 i = 0; i < squares.length; i++) {
+            Square memory square = squares[i];
+            for (int32 y = square.y; y < square.y + square.size; y++) {
+                for (int32 x = square.x; x < square.x + square.size; x++) {
+                    if (!_contains(others, x, y)) {
+                        count++;
+                    }
+                }
+            }
+        }
+        parcelIds = new uint32[](count);
+        count = 0;
+        for (uint256 i = 0; i < squares.length; i++) {
+            Square memory square = squares[i];
+            for (int32 y = square.y; y < square.y + square.size; y++) {
+                for (int32 x = square.x; x < square.x + square.size; x++) {
+                    if (!_contains(others, x, y)) {
+                        parcelIds[count++] = _parcelId(x, y);
+                    }
+                }
+            }
+        }
+    }
+
+    // -------------------------------------------------------------------------
+
+    // ------------------------ PARCEL LOOKUP ----------------------------------
+    // Eight 32 bit lanes per slot, consecutive parcels of a column mostly share a slot
+    uint256 private constant _LANES_SHIFT = 3;
+    uint256 private constant _LANE_MASK = 0xFFFFFFFF;
+    // Stored estate IDs have this Y coordinate bit flipped so that zero means no estate,
+    // an estate ID equal to the flip would have Y = -32768 which is off the map
+    uint256 private constant _LANE_FLIP = 0x8000;
+
+    /**
+     * @dev Estate holding `parcelId`, a single storage read.
+     * Estates minted before this implementation are found once indexed with {indexEstates}.
+     */
+    function parcelToEstate(uint32 parcelId)
+        public
+        view
+        returns (bool inEstate, uint256 tokenId)
+    {
+        uint256 lane = (_parcelEstates[parcelId >> _LANES_SHIFT] >>
+            ((parcelId & 7) * 32)) & _LANE_MASK;
+        if (lane == 0) {
+            return (false, 0);
+        }
+        return (true, lane ^ _LANE_FLIP);
+    }
+
+    /**
+     * @dev Adds existing estates to the {parcelToEstate} index, e.g. the ones minted
+     * before this implementation. Anyone can index, the index only mirrors estate storage.
+     */
+    function indexEstates(uint256[] calldata tokenIds) public {
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            require(
+                _exists(tokenIds[i]),
+                "ERC721: operator query for nonexistent token"
+            );
+            _indexSquare(
+                _square(uint32(estatesToParcels[tokenIds[i]][0]), tokenIds[i]),
+                tokenIds[i],
+                true
+            );
+        }
+    }
+
+    function _indexSquare(
+        Square memory square,
+        uint256 tokenId,
+        bool indexed
+    ) internal {
+        uint256 lane = indexed ? tokenId ^ _LANE_FLIP : 0;
+        for (int32 x = square.x; x < square.x + square.size; x++) {
+            for (int32 y = square.y; y < square.y + square.size; y++) {
+                uint32 parcelId = _parcelId(x, y);
+                uint256 key = parcelId >> _LANES_SHIFT;
+                uint256 shift = (parcelId & 7) * 32;
+                _parcelEstates[key] =
+                    (_parcelEstates[key] & ~(_LANE_MASK << shift)) |
+                    (lane << shift);
+            }
+        }
+    }
+
+    // -------------------------------------------------------------------------
+
+    // --------------------------------------- OVERRIDES ---------------------------------------------
+    // The following functions are overrides required by Solidity.
+    /**
+     * @dev See {IERC165-supportsInterface}.
+     */
+    function supportsInterface(bytes4 interfaceId)
+        public
+        view
+        virtual
+        override(
+            AccessControlEnumerableUpgradeable,
+            ERC721Upgradeable,
+            ERC721DefaultRoyaltyUpgradeable
+        )
+        returns (bool)
+    {
+        return super.supportsInterface(interfaceId);
+    }
+
+    /**
+     * Override grantRole so that only one owner is allowd
+     */
+    function grantRole(bytes32 role, address account)
+        public
+        virtual
+        override(IAccessControlUpgradeable, AccessControlUpgradeable)
+        onlyRole(getRoleAdmin(role))
+    {
+        require(
+            role != OWNER_ROLE || getRoleMemberCount(OWNER_ROLE) == 0,
+            "There can be only one owner"
+        );
+        _grantRole(role, account);
+    }
+
+    // -----------------------------------------------------------------------------------------------
+
+    // ----------------------- HELPER LOGIC --------------------------------------------
+    // Token enumeration is retired, owner tokens are served by `scripts/ownership_indexer.py`
+    function setBaseTokenURI(string memory baseTokenURI)
+        public
+        onlyRole(DEFAULT_ADMIN_ROLE)
+    {
+        _baseTokenURI = baseTokenURI;
+    }
+
+    // ---------------------------------------------------------------------------------
+
+    // ------------------------- OWNERSHIP ---------------------------------------------
+    /**
+     * @dev Returns the address of the current owner.
+     * Only one wallet can have owner role at the time.
+     * Ensured by grantRole override.
+     */
+    function owner() public view returns (address) {
+        return getRoleMember(OWNER_ROLE, 0);
+    }
+
+    // ---------------------------------------------------------------------------------
+
+    // ----------------------- OPEN SEA REGISTRY ---------------------------------------
+    /**
+     * Override isApprovedForAll to whitelist user's OpenSea proxy accounts to enable gas-less listings.
+     * Local approvals are checked first, see {OpenseaProxyCacheUpgradeable-_isOpenseaProxy}.
+     */
+    function isApprovedForAll(address owner, address operator)
+        public
+        view
+        override(ERC721Upgradeable, IERC721Upgradeable)
+        returns (bool)
+    {
+        return
+            super.isApprovedForAll(owner, operator) ||
+            _isOpenseaProxy(owner, operator);
+    }
+
+    function _proxyRegistry() internal view override returns (ProxyRegistry) {
+        return _openseaProxyRegistry;
+    }
+
+    function _openseaProxyCache()
+        internal
+        view
+        override
+        returns (OpenseaProxyCache storage)
+    {
+        return _openseaProxies;
+    }
+
+    function _authorizeOpenseaAdmin()
+        internal
+        view
+        override
+        onlyRole(DEFAULT_ADMIN_ROLE)
+    {}
+
+    // ---------------------------------------------------------------------------------
+
+    // ----------------------- ROYALTY -------------------------------------------------
+    function setDefaultRoyalty(address receiver, uint96 feeNumerator)
+        public
+        onlyRole(DEFAULT_ADMIN_ROLE)
+    {
+        _setDefaultRoyalty(receiver, feeNumerator);
+    }
+    // ---------------------------------------------------------------------------------
+}
@@ -0,0 +1,314 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin-upgradeable/contracts/token/ERC721/ERC721Upgradeable.sol";
+import "@openzeppelin-upgradeable/contracts/access/AccessControlEnumerableUpgradeable.sol";
+import "@openzeppelin-upgradeable/contracts/proxy/utils/Initializable.sol";
+
+import "../../interfaces/IHighriseLand.sol";
+import "../../interfaces/IHighriseLandBatchMint.sol";
+import "../../interfaces/IHighriseLandV3.sol";
+import "../opensea/OpenseaProxyCacheUpgradeable.sol";
+import "../opensea/Utils.sol";
+import "../upgrades/ERC721DefaultRoyaltyUpgradeable.sol";
+import "../upgrades/ERC721EnumerableRetiredUpgradeable.sol";
+
+contract HighriseLandV3 is
+    Initializable,
+    ERC721Upgradeable,
+    ERC721EnumerableRetiredUpgradeable,
+    ERC721DefaultRoyaltyUpgradeable,
+    AccessControlEnumerableUpgradeable,
+    OpenseaProxyCacheUpgradeable,
+    IHighriseLand,
+    IHighriseLandBatchMint,
+    IHighriseLandV3
+{
+    // CONSTANTS
+    bytes32 public constant MINTER_ROLE = keccak256("MINTER_ROLE");
+    bytes32 public constant OWNER_ROLE = keccak256("OWNER_ROLE");
+    // STORAGE
+    string private _baseTokenURI;
+    ProxyRegistry private _openseaProxyRegistry;
+    OpenseaProxyCache private _openseaProxies;
+    address private _estate;
+    // One-shot estate transfer grants, owner => expiry timestamp
+    mapping(address => uint256) private _estateTransferGrants;
+
+    /// Do not leave an implementation contract uninitialized. An uninitialized implementation contract can be taken over by an attacker, which may impact the proxy
+    /// Including a constructor to automatically mark it as initialized.
+    /// @custom:oz-upgrades-unsafe-allow constructor
+    constructor() initializer {}
+
+    // ------------------------------ INITIALIZER ---------------------------------------------------------------------------
+    function initialize(
+        string memory name,
+        string memory symbol,
+        string memory baseTokenURI,
+        address openseaProxyRegistry
+    ) public virtual initializer {
+        __HighriseLandV3_init(
+            name,
+            symbol,
+            baseTokenURI,
+            openseaProxyRegistry
+        );
+    }
+
+    function __HighriseLandV3_init(
+        string memory name,
+        string memory symbol,
+        string memory baseTokenURI,
+        address openseaProxyRegistry
+    ) internal onlyInitializing {
+        __ERC721_init(name, symbol);
+        __ERC721DefaultRoyalty_init();
+        __AccessControlEnumerable_init();
+        __HighriseLandV3_init_unchained(
+            name,
+            symbol,
+            baseTokenURI,
+            openseaProxyRegistry
+        );
+    }
+
+    function __HighriseLandV3_init_unchained(
+        string memory,
+        string memory,
+        string memory baseTokenURI,
+        address openseaProxyRegistry
+    ) internal onlyInitializing {
+        _baseTokenURI = baseTokenURI;
+        _openseaProxyRegistry = ProxyRegistry(openseaProxyRegistry);
+        _grantRole(DEFAULT_ADMIN_ROLE, msg.sender);
+        _grantRole(MINTER_ROLE, msg.sender);
+        _grantRole(OWNER_ROLE, msg.sender);
+        _setDefaultRoyalty(msg.sender, 500);
+    }
+
+    // ----------------------------------------------------------------------------------------------------------------------
+
+    /**
+     * @dev Token URIs will be autogenerated based on `baseURI` and their token IDs.
+     * See {ERC721-tokenURI}.
+     */
+    function _baseURI() internal view virtual override returns (string memory) {
+        return _baseTokenURI;
+    }
+
+    /**
+     * @dev Creates a new token for `user` with token ID `tokenId`.
+     * Emits {IERC721-Transfer} event)
+     * The token URI is autogenerated based on the base URI passed at construction.
+     *
+     * See {ERC721-_mint}.
+     *
+     * Requirements:
+     *
+     * - the caller must have the `MINTER_ROLE`.
+     */
+    function mint(address user, uint256 tokenId)
+        external
+        onlyRole(MINTER_ROLE)
+    {
+        _safeMint(user, tokenId);
+    }
+
+    /**
+     * @dev Creates new tokens for `user` with token IDs `tokenIds`, checking
+     * the minter role once.
+     *
+     * Requirements:
+     *
+     * - the caller must have the `MINTER_ROLE`.
+     */
+    function mintBatch(address user, uint256[] calldata tokenIds)
+        external
+        onlyRole(MINTER_ROLE)
+    {
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            _safeMint(user, tokenIds[i]);
+        }
+    }
+
+    // --------------------------------------- OVERRIDES ---------------------------------------------
+    // The following functions are overrides required by Solidity.
+
+    /**
+     * @dev See {IERC165-supportsInterface}.
+     */
+    function supportsInterface(bytes4 interfaceId)
+        public
+        view
+        virtual
+        override(
+            AccessControlEnumerableUpgradeable,
+            ERC721Upgradeable,
+            ERC721DefaultRoyaltyUpgradeable
+        )
+        returns (bool)
+    {
+        return
+            interfaceId == type(IHighriseLand).interfaceId ||
+            interfaceId == type(IHighriseLandBatchMint).interfaceId ||
+            interfaceId == type(IHighriseLandV3).interfaceId ||
+            super.supportsInterface(interfaceId);
+    }
+
+    /**
+     * Override grantRole so that only one owner is allowd
+     */
+    function grantRole(bytes32 role, address account)
+        public
+        virtual
+        override(IAccessControlUpgradeable, AccessControlUpgradeable)
+        onlyRole(getRoleAdmin(role))
+    {
+        require(
+            role != OWNER_ROLE || getRoleMemberCount(OWNER_ROLE) == 0,
+            "There can be only one owner"
+        );
+        _grantRole(role, account);
+    }
+
+    // -----------------------------------------------------------------------------------------------
+
+    // ----------------------- HELPER LOGIC --------------------------------------------
+    // Token enumeration is retired, owner tokens are served by `scripts/ownership_indexer.py`
+    function setBaseTokenURI(string memory baseTokenURI)
+        public
+        onlyRole(DEFAULT_ADMIN_ROLE)
+    {
+        _baseTokenURI = baseTokenURI;
+    }
+
+    // ---------------------------------------------------------------------------------
+
+    // ------------------------- OWNERSHIP ---------------------------------------------
+    /**
+     * @dev Returns the address of the current owner.
+     * Only one wallet can have owner role at the time.
+     * Ensured by grantRole override.
+     */
+    function owner() public view returns (address) {
+        return getRoleMember(OWNER_ROLE, 0);
+    }
+
+    // ---------------------------------------------------------------------------------
+
+    // ----------------------- OPEN SEA REGISTRY ---------------------------------------
+    /**
+     * Override isApprovedForAll to whitelist user's OpenSea proxy accounts to enable gas-less listings.
+     * Local approvals are checked first, see {OpenseaProxyCacheUpgradeable-_isOpenseaProxy}.
+     */
+    function isApprovedForAll(address owner, address operator)
+        public
+        view
+        override(ERC721Upgradeable, IERC721Upgradeable)
+        returns (bool)
+    {
+        return
+            super.isApprovedForAll(owner, operator) ||
+            _isOpenseaProxy(owner, operator);
+    }
+
+    function _proxyRegistry() internal view override returns (ProxyRegistry) {
+        return _openseaProxyRegistry;
+    }
+
+    function _openseaProxyCache()
+        internal
+        view
+        override
+        returns (OpenseaProxyCache storage)
+    {
+        return _openseaProxies;
+    }
+
+    function _authorizeOpenseaAdmin()
+        internal
+        view
+        override
+        onlyRole(DEFAULT_ADMIN_ROLE)
+    {}
+
+    // ---------------------------------------------------------------------------------
+
+    // ----------------------- ROYALTY -------------------------------------------------
+    function setDefaultRoyalty(address receiver, uint96 feeNumerator)
+        public
+        onlyRole(DEFAULT_ADMIN_ROLE)
+    {
+        _setDefaultRoyalty(receiver, feeNumerator);
+    }
+    // ---------------------------------------------------------------------------------
+
+    // -------------------- BATCH APPROVE TOKENS ---------------------------------------
+    function approveForTransfer(address to, uint256[] memory tokenIds) public {
+        for (uint32 i = 0; i < tokenIds.length; i++) {
+            approve(to, tokenIds[i]);
+        }
+    }
+    // ---------------------------------------------------------------------------------
+
+    // -------------------- ESTATE TRANSFER GRANT --------------------------------------
+    event EstateContractChanged(address estate);
+    event EstateTransferGranted(address indexed owner, uint256 expiry);
+
+    function setEstateContract(address estate)
+        public
+        onlyRole(DEFAULT_ADMIN_ROLE)
+    {
+        _estate = estate;
+        emit EstateContractChanged(estate);
+    }
+
+    function estateContract() public view returns (address) {
+        return _estate;
+    }
+
+    /**
+     * @dev Grants the registered estate contract permission to move parcels of the sender
+     * until `expiry`, in a single storage write instead of one approval per parcel.
+     * The grant is one-shot, it is consumed by the next estate the sender mints.
+     */
+    function grantEstateTransfer(uint256 expiry) public {
+        require(expiry > block.timestamp, "HRLAND: Grant already expired");
+        _estateTransferGrants[msg.sender] = expiry;
+        emit EstateTransferGranted(msg.sender, expiry);
+    }
+
+    function estateTransferGrant(address owner)
+        public
+        view
+        override
+        returns (uint256)
+    {
+        return _estateTransferGrants[owner];
+    }
+
+    /**
+     * @dev Moves parcels of `owner` to the estate contract and consumes the grant of `owner`.
+     *
+     * Requirements:
+     *
+     * - the caller must be the registered estate contract.
+     * - `owner` must have an unexpired grant and own all `tokenIds`.
+     */
+    function transferToEstate(address owner, uint32[] calldata tokenIds)
+        external
+        override
+    {
+        require(msg.sender == _estate, "HRLAND: Sender is not estate contract");
+        require(
+            _estateTransferGrants[owner] > block.timestamp,
+            "HRLAND: Estate transfer not granted"
+        );
+        delete _estateTransferGrants[owner];
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            _transfer(owner, msg.sender, tokenIds[i]);
+        }
+    }
+    // ---------------------------------------------------------------------------------
+
+}
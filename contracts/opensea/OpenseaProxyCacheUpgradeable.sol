@@ -0,0 +1,99 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "./Utils.sol";
+
+/**
+ * @dev OpenSea proxy approvals of Land and Estate implementations, with proxies cached in storage
+ * and a switch which stops calls to the registry.
+ * The mixin declares no state variables. Storage stays in the inheriting contract, where the registry
+ * address has been since its first implementation, and is reached through `_proxyRegistry` and
+ * `_openseaProxyCache`, so that inheriting the mixin does not move any slot of a live proxy.
+ */
+abstract contract OpenseaProxyCacheUpgradeable {
+    struct OpenseaProxyCache {
+        // Cached OpenSea proxies, owner => proxy
+        mapping(address => address) proxies;
+        bool registryDisabled;
+    }
+
+    event OpenseaProxyChanged(address indexed owner, address proxy);
+    event OpenseaProxyRegistryStateChanged(bool enabled);
+
+    function _proxyRegistry() internal view virtual returns (ProxyRegistry);
+
+    function _openseaProxyCache()
+        internal
+        view
+        virtual
+        returns (OpenseaProxyCache storage);
+
+    /**
+     * @dev Reverts unless the sender may change cached proxies and enable or disable the registry.
+     */
+    function _authorizeOpenseaAdmin() internal view virtual;
+
+    /**
+     * @dev Whether `operator` is the OpenSea proxy of `owner`, to whitelist it in `isApprovedForAll`
+     * for gas-less listings. Cached proxies are checked first, the registry is called only on a miss.
+     */
+    function _isOpenseaProxy(address owner, address operator)
+        internal
+        view
+        returns (bool)
+    {
+        OpenseaProxyCache storage cache = _openseaProxyCache();
+        address proxy = cache.proxies[owner];
+        if (proxy != address(0)) {
+            return proxy == operator;
+        }
+        return
+            !cache.registryDisabled &&
+            address(_proxyRegistry().proxies(owner)) == operator;
+    }
+
+    /**
+     * @dev Caches registry proxies of `owners` in storage so that their
+     * approval checks skip the external registry call. Only registry proxies
+     * are cached, caching again picks up proxies changed in the registry.
+     */
+    function cacheOpenseaProxies(address[] calldata owners) public {
+        _authorizeOpenseaAdmin();
+        ProxyRegistry registry = _proxyRegistry();
+        for (uint256 i = 0; i < owners.length; i++) {
+            _setOpenseaProxy(owners[i], address(registry.proxies(owners[i])));
+        }
+    }
+
+    /**
+     * @dev Removes cached proxies of `owners`, their approvals go to the registry again.
+     */
+    function uncacheOpenseaProxies(address[] calldata owners) public {
+        _authorizeOpenseaAdmin();
+        for (uint256 i = 0; i < owners.length; i++) {
+            _setOpenseaProxy(owners[i], address(0));
+        }
+    }
+
+    function _setOpenseaProxy(address owner, address proxy) internal {
+        _openseaProxyCache().proxies[owner] = proxy;
+        emit OpenseaProxyChanged(owner, proxy);
+    }
+
+    function openseaProxy(address owner) public view returns (address) {
+        return _openseaProxyCache().proxies[owner];
+    }
+
+    /**
+     * @dev When disabled only cached proxies are approved, registry is never called.
+     */
+    function setOpenseaProxyRegistryEnabled(bool enabled) public {
+        _authorizeOpenseaAdmin();
+        _openseaProxyCache().registryDisabled = !enabled;
+        emit OpenseaProxyRegistryStateChanged(enabled);
+    }
+
+    function openseaProxyRegistryEnabled() public view returns (bool) {
+        return !_openseaProxyCache().registryDisabled;
+    }
+}
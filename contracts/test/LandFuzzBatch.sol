@@ -0,0 +1,65 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin/contracts/token/ERC721/IERC721Receiver.sol";
+
+/**
+ * @dev Account of a fuzzed user, calls on behalf of the batch which deployed it.
+ */
+contract FuzzActor is IERC721Receiver {
+    address private immutable _batch;
+
+    constructor() {
+        _batch = msg.sender;
+    }
+
+    function execute(address target, bytes calldata data)
+        external
+        returns (bool, bytes memory)
+    {
+        require(msg.sender == _batch, "FuzzActor: Sender is not batch");
+        return target.call(data);
+    }
+
+    function onERC721Received(
+        address,
+        address,
+        uint256,
+        bytes calldata
+    ) external pure override returns (bytes4) {
+        return IERC721Receiver.onERC721Received.selector;
+    }
+}
+
+/**
+ * @dev Runs a sequence of calls from several actors in a single transaction,
+ * for differential fuzzing in local tests.
+ * Reverted calls don't revert the batch, their result is emitted with the revert data.
+ */
+contract LandFuzzBatch {
+    struct Call {
+        uint256 actor;
+        address target;
+        bytes data;
+    }
+
+    event CallResult(uint256 index, bool success, bytes result);
+
+    FuzzActor[] public actors;
+
+    constructor(uint256 actorCount) {
+        for (uint256 i = 0; i < actorCount; i++) {
+            actors.push(new FuzzActor());
+        }
+    }
+
+    function run(Call[] calldata calls) external {
+        for (uint256 i = 0; i < calls.length; i++) {
+            (bool success, bytes memory result) = actors[calls[i].actor].execute(
+                calls[i].target,
+                calls[i].data
+            );
+            emit CallResult(i, success, result);
+        }
+    }
+}
@@ -0,0 +1,80 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin/contracts/token/ERC721/IERC721.sol";
+import "@openzeppelin/contracts/token/ERC721/IERC721Receiver.sol";
+
+interface IHighriseEstateReshape {
+    function mintFromParcels(uint32[] memory tokenIds)
+        external
+        returns (uint256);
+
+    function split(uint256 tokenId, uint32[][] memory shapes)
+        external
+        returns (uint256[] memory);
+}
+
+/**
+ * @dev Estate owner which, when land parcels are returned to it during a split,
+ * tries to sell the split estate to `buyer` from the `onERC721Received` callback.
+ */
+contract ReentrantEstateOwner is IERC721Receiver {
+    address private immutable _land;
+    address private immutable _estate;
+    address private immutable _buyer;
+    uint256 private _splitEstate;
+    bool private _splitting;
+
+    // Callbacks received during the split and whether a sale in them succeeded
+    uint256 public callbacks;
+    bool public sold;
+
+    constructor(
+        address land,
+        address estate,
+        address buyer
+    ) {
+        _land = land;
+        _estate = estate;
+        _buyer = buyer;
+    }
+
+    function mintFromParcels(uint32[] memory tokenIds)
+        external
+        returns (uint256)
+    {
+        IERC721(_land).setApprovalForAll(_estate, true);
+        return IHighriseEstateReshape(_estate).mintFromParcels(tokenIds);
+    }
+
+    function split(uint256 tokenId, uint32[][] memory shapes)
+        external
+        returns (uint256[] memory tokenIds)
+    {
+        _splitEstate = tokenId;
+        _splitting = true;
+        tokenIds = IHighriseEstateReshape(_estate).split(tokenId, shapes);
+        _splitting = false;
+    }
+
+    function onERC721Received(
+        address,
+        address,
+        uint256,
+        bytes calldata
+    ) external override returns (bytes4) {
+        if (_splitting && msg.sender == _land) {
+            callbacks++;
+            try
+                IERC721(_estate).transferFrom(
+                    address(this),
+                    _buyer,
+                    _splitEstate
+                )
+            {
+                sold = true;
+            } catch {}
+        }
+        return IERC721Receiver.onERC721Received.selector;
+    }
+}
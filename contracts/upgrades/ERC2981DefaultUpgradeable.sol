@@ -0,0 +1,85 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin-upgradeable/contracts/interfaces/IERC2981Upgradeable.sol";
+import "@openzeppelin-upgradeable/contracts/proxy/utils/Initializable.sol";
+import "@openzeppelin-upgradeable/contracts/utils/introspection/ERC165Upgradeable.sol";
+
+/**
+ * @dev Storage compatible replacement of `ERC2981Upgradeable` which only supports the default royalty.
+ * `royaltyInfo` is a single read of the packed default royalty slot.
+ * The per-token royalty mapping is kept as a placeholder, it was never set and is never read.
+ */
+abstract contract ERC2981DefaultUpgradeable is
+    Initializable,
+    IERC2981Upgradeable,
+    ERC165Upgradeable
+{
+    struct RoyaltyInfo {
+        address receiver;
+        uint96 royaltyFraction;
+    }
+
+    RoyaltyInfo private _defaultRoyaltyInfo;
+    mapping(uint256 => RoyaltyInfo) private _tokenRoyaltyInfo;
+
+    function __ERC2981Default_init() internal onlyInitializing {}
+
+    function __ERC2981Default_init_unchained() internal onlyInitializing {}
+
+    /**
+     * @dev See {IERC165-supportsInterface}.
+     */
+    function supportsInterface(bytes4 interfaceId)
+        public
+        view
+        virtual
+        override(IERC165Upgradeable, ERC165Upgradeable)
+        returns (bool)
+    {
+        return
+            interfaceId == type(IERC2981Upgradeable).interfaceId ||
+            super.supportsInterface(interfaceId);
+    }
+
+    /**
+     * @dev See {IERC2981-royaltyInfo}. Same royalty applies to every token.
+     */
+    function royaltyInfo(uint256, uint256 salePrice)
+        external
+        view
+        virtual
+        override
+        returns (address, uint256)
+    {
+        RoyaltyInfo memory royalty = _defaultRoyaltyInfo;
+        uint256 royaltyAmount = (salePrice * royalty.royaltyFraction) /
+            _feeDenominator();
+        return (royalty.receiver, royaltyAmount);
+    }
+
+    /**
+     * @dev The denominator with which to interpret the fee, i.e. fee is expressed in basis points.
+     */
+    function _feeDenominator() internal pure virtual returns (uint96) {
+        return 10000;
+    }
+
+    function _setDefaultRoyalty(address receiver, uint96 feeNumerator)
+        internal
+        virtual
+    {
+        require(
+            feeNumerator <= _feeDenominator(),
+            "ERC2981: royalty fee will exceed salePrice"
+        );
+        require(receiver != address(0), "ERC2981: invalid receiver");
+        _defaultRoyaltyInfo = RoyaltyInfo(receiver, feeNumerator);
+    }
+
+    function _deleteDefaultRoyalty() internal virtual {
+        delete _defaultRoyaltyInfo;
+    }
+
+    uint256[48] private __gap;
+}
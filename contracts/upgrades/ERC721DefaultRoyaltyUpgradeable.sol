@@ -0,0 +1,39 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin-upgradeable/contracts/token/ERC721/ERC721Upgradeable.sol";
+import "@openzeppelin-upgradeable/contracts/proxy/utils/Initializable.sol";
+
+import "./ERC2981DefaultUpgradeable.sol";
+
+/**
+ * @dev Storage compatible replacement of `ERC721RoyaltyUpgradeable` with default royalty only.
+ * There is no per-token royalty to clear, so `_burn` is left as is.
+ */
+abstract contract ERC721DefaultRoyaltyUpgradeable is
+    Initializable,
+    ERC2981DefaultUpgradeable,
+    ERC721Upgradeable
+{
+    function __ERC721DefaultRoyalty_init() internal onlyInitializing {}
+
+    function __ERC721DefaultRoyalty_init_unchained()
+        internal
+        onlyInitializing
+    {}
+
+    /**
+     * @dev See {IERC165-supportsInterface}.
+     */
+    function supportsInterface(bytes4 interfaceId)
+        public
+        view
+        virtual
+        override(ERC721Upgradeable, ERC2981DefaultUpgradeable)
+        returns (bool)
+    {
+        return super.supportsInterface(interfaceId);
+    }
+
+    uint256[50] private __gap;
+}
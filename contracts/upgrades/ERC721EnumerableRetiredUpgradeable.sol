@@ -0,0 +1,22 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+import "@openzeppelin-upgradeable/contracts/token/ERC721/ERC721Upgradeable.sol";
+import "@openzeppelin-upgradeable/contracts/proxy/utils/Initializable.sol";
+
+/**
+ * @dev Storage placeholder for `ERC721EnumerableUpgradeable`.
+ * Implementations which no longer enumerate tokens inherit it in place of the enumerable extension
+ * so that all the following storage keeps its slots.
+ * Data left in these slots by previous implementations is stale and is never read.
+ */
+abstract contract ERC721EnumerableRetiredUpgradeable is
+    Initializable,
+    ERC721Upgradeable
+{
+    mapping(address => mapping(uint256 => uint256)) private _ownedTokens;
+    mapping(uint256 => uint256) private _ownedTokensIndex;
+    uint256[] private _allTokens;
+    mapping(uint256 => uint256) private _allTokensIndex;
+    uint256[46] private __gap;
+}
@@ -5,6 +5,7 @@ import "@openzeppelin/contracts/utils/cryptography/ECDSA.sol";
 import "@openzeppelin/contracts/utils/introspection/ERC165Checker.sol";
 
 import "../../interfaces/IHighriseLand.sol";
+import "../../interfaces/IHighriseLandBatchMint.sol";
 
 contract HighriseLandWithdrawal {
     using ERC165Checker for address;
@@ -24,12 +25,12 @@ contract HighriseLandWithdrawal {
     // mapping to store which address deposited how much ETH
     WithdrawalState public withdrawalState;
 
-    constructor(address _landContract) {
+    constructor(address _owner, address _landContract) {
         require(
             _landContract.supportsInterface(type(IHighriseLand).interfaceId),
             "IS_NOT_HIGHRISE_LAND_CONTRACT"
         );
-        owner = msg.sender;
+        owner = _owner;
         withdrawalState = WithdrawalState.DISABLED;
         landContract = _landContract;
     }
@@ -62,6 +63,85 @@ contract HighriseLandWithdrawal {
         emit WithdrawLandEvent(msg.sender, tokenId);
     }
 
+    /**
+     * @dev Withdraws all tokens of a payload signed once, `data` is
+     * `abi.encode(approvedOwner, tokenIds)`. The owner comes first so that
+     * a batch payload decoded as a single one, or the other way round,
+     * is approved for an address nobody can send from.
+     */
+    function withdrawBatch(bytes memory data, bytes memory signature)
+        public
+        enabled
+    {
+        require(
+            _verify(keccak256(data), signature, owner),
+            "HLW: Payload verification failed"
+        );
+        (address approvedOwner, uint256[] memory tokenIds) = abi.decode(
+            data,
+            (address, uint256[])
+        );
+        require(
+            msg.sender == approvedOwner,
+            "HLW: Sender not approved to buy token"
+        );
+        _mintBatch(tokenIds);
+    }
+
+    /**
+     * @dev Withdraws the tokens of several single token payloads of `withdraw`.
+     */
+    function withdrawMany(bytes[] memory data, bytes[] memory signatures)
+        public
+        enabled
+    {
+        require(
+            data.length == signatures.length,
+            "HLW: Payload and signature count differ"
+        );
+        uint256[] memory tokenIds = new uint256[](data.length);
+        for (uint256 i = 0; i < data.length; i++) {
+            require(
+                _verify(keccak256(data[i]), signatures[i], owner),
+                "HLW: Payload verification failed"
+            );
+            (uint256 tokenId, address approvedOwner) = abi.decode(
+                data[i],
+                (uint256, address)
+            );
+            require(
+                msg.sender == approvedOwner,
+                "HLW: Sender not approved to buy token"
+            );
+            tokenIds[i] = tokenId;
+        }
+        _mintBatch(tokenIds);
+    }
+
+    /**
+     * @dev Mints with a single call when the land implementation supports
+     * batch minting, token by token otherwise.
+     */
+    function _mintBatch(uint256[] memory tokenIds) internal {
+        if (
+            landContract.supportsInterface(
+                type(IHighriseLandBatchMint).interfaceId
+            )
+        ) {
+            IHighriseLandBatchMint(landContract).mintBatch(
+                msg.sender,
+                tokenIds
+            );
+        } else {
+            for (uint256 i = 0; i < tokenIds.length; i++) {
+                IHighriseLand(landContract).mint(msg.sender, tokenIds[i]);
+            }
+        }
+        for (uint256 i = 0; i < tokenIds.length; i++) {
+            emit WithdrawLandEvent(msg.sender, tokenIds[i]);
+        }
+    }
+
     modifier onlyOwner() {
         require(msg.sender == owner, "HLW: Sender is not the owner");
         _;
@@ -0,0 +1,6 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+interface IHighriseLandBatchMint {
+    function mintBatch(address user, uint256[] calldata tokenIds) external;
+}
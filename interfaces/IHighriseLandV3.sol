@@ -0,0 +1,9 @@
+// SPDX-License-Identifier: MIT
+pragma solidity =0.8.12;
+
+interface IHighriseLandV3 {
+    function estateTransferGrant(address owner) external view returns (uint256);
+
+    function transferToEstate(address owner, uint32[] calldata tokenIds)
+        external;
+}
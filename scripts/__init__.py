@@ -1,9 +1,15 @@
 LAND_NAME = "Highrise LAND"
 LAND_SYMBOL = "LAND"
 LAND_BASE_URI_TEMPLATE = "https://cdn-land-{environment}.joinhighrise.com/metadata/"
+LAND_IMAGE_URI_TEMPLATE = (
+    "https://cdn-land-{environment}.joinhighrise.com/images/{token_id}.png"
+)
 
 ESTATE_NAME = "Highrise ESTATE"
 ESTATE_SYMBOL = "ESTATE"
 ESTATE_BASE_URI_TEMPLATE = (
     "https://cdn-land-{environment}.joinhighrise.com/estates-metadata/"
 )
+ESTATE_IMAGE_URI_TEMPLATE = (
+    "https://cdn-land-{environment}.joinhighrise.com/estates-images/{token_id}.png"
+)
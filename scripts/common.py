@@ -1,12 +1,17 @@
 import os
-from typing import Any, NewType, Optional
+from typing import Any, NewType, Optional, Union
 
 import eth_utils
-from brownie import accounts, config, network, project
+from brownie import accounts, config, network, project, web3
 from brownie.network.contract import Contract, ContractTx
 from eth_account import Account
+from eth_account._utils.signing import sign_message_hash
+from eth_hash.auto import keccak
+from eth_keys import keys
 from web3 import Web3
 
+from .profiling import profiled
+
 FORKED_LOCAL_ENVIRONMENTS = ["mainnet-fork-dev"]
 LOCAL_BLOCKCHAIN_ENVIRONMENTS = ["development", "ganache-local"]
 
@@ -15,6 +20,33 @@ DEV_PRICE = 0.01  # in ETH
 PRODUCTION_PRICE = 0.02  # in ETH
 Project = NewType("Project", Any)
 
+# AccessControl roles of the Land and Estate contracts
+DEFAULT_ADMIN_ROLE = bytes(32)
+MINTER_ROLE = keccak(b"MINTER_ROLE")
+OWNER_ROLE = keccak(b"OWNER_ROLE")
+
+# Account state setters of the local nodes brownie can launch
+STATE_METHODS = {
+    "ganache": (
+        "evm_setAccountCode",
+        "evm_setAccountStorageAt",
+        "evm_setAccountBalance",
+        "evm_setAccountNonce",
+    ),
+    "hardhat": (
+        "hardhat_setCode",
+        "hardhat_setStorageAt",
+        "hardhat_setBalance",
+        "hardhat_setNonce",
+    ),
+    "anvil": (
+        "anvil_setCode",
+        "anvil_setStorageAt",
+        "anvil_setBalance",
+        "anvil_setNonce",
+    ),
+}
+
 
 def get_wei_land_price() -> int:
     if network.show_active() in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
@@ -23,11 +55,13 @@ def get_wei_land_price() -> int:
         return Web3.toWei(PRODUCTION_PRICE, "ether")
 
 
+@profiled
 def load_openzeppelin() -> Project:
     oz = project.load(config["dependencies"][0])
     return oz
 
 
+@profiled
 def get_account() -> Account:
     if (
         network.show_active()
@@ -38,6 +72,26 @@ def get_account() -> Account:
         return accounts.load(os.getenv("DEV_ACCOUNT_NAME"))
 
 
+def state_methods() -> tuple[str, str, str, str]:
+    client = web3.clientVersion.lower()
+    for node, methods in STATE_METHODS.items():
+        if node in client:
+            return methods
+    raise ValueError(f"Node {web3.clientVersion} can't set account state")
+
+
+def set_balance(address: str, balance: int):
+    web3.provider.make_request(state_methods()[2], [address, hex(balance)])
+
+
+def sign_payload(payload: bytes, key: Union[str, keys.PrivateKey]) -> bytes:
+    """Signature of `keccak(payload)`, as fund and withdrawal contracts verify it."""
+    if isinstance(key, str):
+        key = keys.PrivateKey(bytes.fromhex(key[2:]))
+    _, _, _, signature = sign_message_hash(key, keccak(payload))
+    return signature
+
+
 def encode_function_data(initializer: Optional[ContractTx] = None, *args) -> bytes:
     """Encodes the function call so we can work with an initializer.
     Args:
@@ -51,6 +105,7 @@ def encode_function_data(initializer: Optional[ContractTx] = None, *args) -> byt
     return initializer.encode_input(*args)
 
 
+@profiled
 def upgrade(
     account: Account,
     proxy: Contract,
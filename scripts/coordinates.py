@@ -0,0 +1,56 @@
+from struct import pack, unpack
+from typing import Iterator
+
+MIN_COORD = -250
+MAX_COORD = 250
+ESTATE_SIZES = (3, 6, 9, 12)
+
+
+def coordinates_to_token_id(coords: tuple[int, int]) -> int:
+    """X and Y are 2 bytes each."""
+    as_bytes = pack(">hh", coords[0], coords[1])
+    return int.from_bytes(as_bytes, "big")
+
+
+def token_id_to_coordinates(token_id: int) -> tuple[int, int]:
+    """Python counterpart of `HighriseEstate.parseToCoordinates`."""
+    return unpack(">hh", (token_id & 0xFFFFFFFF).to_bytes(4, "big"))
+
+
+def is_on_map(coords: tuple[int, int]) -> bool:
+    return all(MIN_COORD <= c <= MAX_COORD for c in coords)
+
+
+def map_token_ids() -> Iterator[int]:
+    """Every land parcel token ID, row by row from the bottom of the map."""
+    for y in range(MIN_COORD, MAX_COORD + 1):
+        for x in range(MIN_COORD, MAX_COORD + 1):
+            yield coordinates_to_token_id((x, y))
+
+
+def estate_parcels(coords: tuple[int, int], size: int) -> list[int]:
+    """Parcel token IDs of a `size`x`size` estate in `mintFromParcels` order.
+
+    `coords` is the bottom-left parcel. Rows go up, parcels in a row go right,
+    the estate token ID is the first parcel of the last row.
+    """
+    if size not in ESTATE_SIZES:
+        raise ValueError(f"Invalid estate size {size}")
+    x, y = coords
+    return [
+        coordinates_to_token_id((x + i, y + j))
+        for j in range(size)
+        for i in range(size)
+    ]
+
+
+def estate_token_id(parcel_ids: list[int]) -> int:
+    size = estate_size(parcel_ids)
+    return parcel_ids[(size - 1) * size]
+
+
+def estate_size(parcel_ids: list[int]) -> int:
+    size = int(len(parcel_ids) ** 0.5)
+    if size not in ESTATE_SIZES or size * size != len(parcel_ids):
+        raise ValueError(f"Invalid estate shape of {len(parcel_ids)} parcels")
+    return size
@@ -0,0 +1,257 @@
+import os
+from typing import NamedTuple, Optional
+
+from brownie import (
+    Contract,
+    HighriseCreate2Deployer,
+    HighriseEstate,
+    HighriseLand,
+    HighriseLandFund,
+    HighriseLandWithdrawal,
+    config,
+    network,
+    web3,
+)
+from eth_abi import encode_abi
+from eth_account import Account
+from eth_hash.auto import keccak
+from eth_utils import function_signature_to_4byte_selector, to_checksum_address
+from hexbytes import HexBytes
+
+from . import (
+    ESTATE_BASE_URI_TEMPLATE,
+    ESTATE_NAME,
+    ESTATE_SYMBOL,
+    LAND_BASE_URI_TEMPLATE,
+    LAND_NAME,
+    LAND_SYMBOL,
+)
+from .common import (
+    DEFAULT_ADMIN_ROLE,
+    MINTER_ROLE,
+    OWNER_ROLE,
+    encode_function_data,
+    get_account,
+)
+from .helpers import Project, load_openzeppelin, opensea_proxy_registry_address
+
+# Default royalty the Land and Estate initializers set for their creator
+ROYALTY_FEE = 500
+
+
+class Create2Deployment(NamedTuple):
+    name: str
+    salt: bytes
+    init_code: bytes
+    # Calls `HighriseCreate2Deployer` makes to the contract right after deploying it
+    calls: list[bytes]
+    address: str
+
+
+def deployment_salt(environment: str, name: str) -> bytes:
+    return keccak(f"highrise:{environment}:{name}".encode())
+
+
+def create2_address(factory: str, deployer: str, salt: bytes, init_code: bytes) -> str:
+    """Address `HighriseCreate2Deployer.deploy` creates for `deployer`."""
+    bound_salt = keccak(HexBytes(deployer) + salt)
+    return to_checksum_address(
+        keccak(b"\xff" + HexBytes(factory) + bound_salt + keccak(init_code))[12:]
+    )
+
+
+def encode_call(signature: str, types: list[str], *args) -> bytes:
+    return function_signature_to_4byte_selector(signature) + encode_abi(types, args)
+
+
+def handover_calls(
+    owner: str, factory: str, minter: bool, minters: tuple[str, ...] = ()
+) -> list[bytes]:
+    """Moves roles and royalty the Land or Estate initializer gave the factory
+    to `owner`, `minters` are granted `MINTER_ROLE` as well.
+
+    `OWNER_ROLE` can only have one member, the factory gives it up first.
+    """
+    grant = "grantRole(bytes32,address)"
+    renounce = "renounceRole(bytes32,address)"
+    role_types = ["bytes32", "address"]
+    calls = [encode_call(grant, role_types, DEFAULT_ADMIN_ROLE, owner)]
+    if minter:
+        calls.append(encode_call(grant, role_types, MINTER_ROLE, owner))
+        calls += [encode_call(grant, role_types, MINTER_ROLE, m) for m in minters]
+    calls += [
+        encode_call(renounce, role_types, OWNER_ROLE, factory),
+        encode_call(grant, role_types, OWNER_ROLE, owner),
+        encode_call(
+            "setDefaultRoyalty(address,uint96)",
+            ["address", "uint96"],
+            owner,
+            ROYALTY_FEE,
+        ),
+    ]
+    if minter:
+        calls.append(encode_call(renounce, role_types, MINTER_ROLE, factory))
+    calls.append(encode_call(renounce, role_types, DEFAULT_ADMIN_ROLE, factory))
+    return calls
+
+
+def create2_deployer_address(account: Optional[Account] = None) -> str:
+    if address := config["networks"][network.show_active()].get("create2Deployer"):
+        print(f"CREATE2 deployer at: {address}")
+        return address
+    else:
+        if not account:
+            account = get_account()
+        factory = HighriseCreate2Deployer.deploy({"from": account})
+        print(f"CREATE2 deployer deployed at: {factory.address}")
+        return factory.address
+
+
+def plan(
+    environment: str,
+    owner: str,
+    factory: str,
+    opensea_proxy_registry: str,
+    oz: Optional[Project] = None,
+) -> dict[str, Create2Deployment]:
+    """Deployments of `owner` in `environment` with their addresses, in order.
+
+    Nothing is sent, addresses of every environment can be computed up front.
+    """
+    if not oz:
+        oz = load_openzeppelin()
+    deployments: dict[str, Create2Deployment] = {}
+
+    def add(name: str, init_code: str, calls: Optional[list[bytes]] = None) -> str:
+        salt = deployment_salt(environment, name)
+        code = bytes(HexBytes(init_code))
+        address = create2_address(factory, owner, salt, code)
+        deployments[name] = Create2Deployment(name, salt, code, calls or [], address)
+        return address
+
+    transfer_ownership = encode_call("transferOwnership(address)", ["address"], owner)
+    proxy_admin = add(
+        "proxy_admin", oz.ProxyAdmin.deploy.encode_input(), [transfer_ownership]
+    )
+    land = add("land", HighriseLand.deploy.encode_input())
+    estate = add("estate", HighriseEstate.deploy.encode_input())
+    # Land proxy address is only needed for the fund and withdrawal init code,
+    # which do not depend on the minters granted by the land proxy
+    land_initializer = encode_function_data(
+        Contract.from_abi("HighriseLand", land, HighriseLand.abi).initialize,
+        LAND_NAME,
+        LAND_SYMBOL,
+        LAND_BASE_URI_TEMPLATE.format(environment=environment),
+        opensea_proxy_registry,
+    )
+    land_proxy_code = oz.TransparentUpgradeableProxy.deploy.encode_input(
+        land, proxy_admin, land_initializer
+    )
+    land_proxy = create2_address(
+        factory,
+        owner,
+        deployment_salt(environment, "land_proxy"),
+        bytes(HexBytes(land_proxy_code)),
+    )
+    land_fund = create2_address(
+        factory,
+        owner,
+        deployment_salt(environment, "land_fund"),
+        bytes(HexBytes(HighriseLandFund.deploy.encode_input(owner, land_proxy))),
+    )
+    land_withdrawal = create2_address(
+        factory,
+        owner,
+        deployment_salt(environment, "land_withdrawal"),
+        bytes(HexBytes(HighriseLandWithdrawal.deploy.encode_input(owner, land_proxy))),
+    )
+    add(
+        "land_proxy",
+        land_proxy_code,
+        handover_calls(owner, factory, True, (land_fund, land_withdrawal)),
+    )
+    estate_initializer = encode_function_data(
+        Contract.from_abi("HighriseEstate", estate, HighriseEstate.abi).initialize,
+        ESTATE_NAME,
+        ESTATE_SYMBOL,
+        ESTATE_BASE_URI_TEMPLATE.format(environment=environment),
+        land_proxy,
+        opensea_proxy_registry,
+    )
+    add(
+        "estate_proxy",
+        oz.TransparentUpgradeableProxy.deploy.encode_input(
+            estate, proxy_admin, estate_initializer
+        ),
+        handover_calls(owner, factory, False),
+    )
+    add("land_fund", HighriseLandFund.deploy.encode_input(owner, land_proxy))
+    add(
+        "land_withdrawal", HighriseLandWithdrawal.deploy.encode_input(owner, land_proxy)
+    )
+    return deployments
+
+
+def deploy_plan(
+    deployments: dict[str, Create2Deployment],
+    factory: str,
+    account: Optional[Account] = None,
+):
+    """Sends the deployments not on chain yet, reruns pick up where one stopped."""
+    if not account:
+        account = get_account()
+    deployer = Contract.from_abi(
+        "HighriseCreate2Deployer", factory, HighriseCreate2Deployer.abi
+    )
+    for deployment in deployments.values():
+        if web3.eth.get_code(deployment.address):
+            print(f"{deployment.name} already at {deployment.address}")
+            continue
+        tx = deployer.deploy(
+            deployment.salt,
+            deployment.init_code,
+            deployment.calls,
+            {"from": account},
+        )
+        tx.wait(1)
+        if tx.events["Deployed"]["addr"] != deployment.address:
+            raise ValueError(
+                f"{deployment.name} deployed at {tx.events['Deployed']['addr']}, "
+                f"expected {deployment.address}"
+            )
+        print(f"{deployment.name} deployed at {deployment.address}")
+
+
+def print_plan(deployments: dict[str, Create2Deployment]):
+    for deployment in deployments.values():
+        print(f"{deployment.name}: {deployment.address}")
+
+
+def precompute():
+    """Prints addresses of `ENVIRONMENT_NAME` without sending transactions,
+    needs `create2Deployer` and `openseaProxyRegistry` in the network config."""
+    environment = os.environ["ENVIRONMENT_NAME"]
+    network_config = config["networks"][network.show_active()]
+    print_plan(
+        plan(
+            environment,
+            get_account().address,
+            network_config["create2Deployer"],
+            network_config["openseaProxyRegistry"],
+        )
+    )
+
+
+def main():
+    environment = os.environ["ENVIRONMENT_NAME"]
+    account = get_account()
+    factory = create2_deployer_address(account)
+    deployments = plan(
+        environment,
+        account.address,
+        factory,
+        opensea_proxy_registry_address(account),
+    )
+    print(f"Deploying for Highrise {environment} environment")
+    print_plan(deployments)
+    deploy_plan(deployments, factory, account)
@@ -0,0 +1,286 @@
+import json
+import mmap
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+CREATURE_METADATA_DIR = Path("metadata") / "creature"
+CREATURE_STORE_PATH = Path("metadata") / "creature.hrcs"
+
+# Creature token IDs are offset by 2^128, i.e. creature #1 is 2^128 + 1
+CREATURE_TOKEN_ID_OFFSET = 1 << 128
+CREATURE_IMAGE_TEMPLATE = "https://cdn-production.joinhighrise.com/hccimgs/{number}.png"
+CREATURE_ANIMATED_IMAGE_TEMPLATE = (
+    "https://cdn-production.joinhighrise.com/hccimgs/{number}.gif"
+)
+CREATURE_ANIMATION_TEMPLATE = (
+    "https://cdn-production.joinhighrise.com/hccimgs/{number}.mp4"
+)
+CREATURE_ANIMATION_MIME_TYPE = "video/mp4"
+CREATURE_NAME_TEMPLATE = "Highrise Creature #{number}"
+
+STORE_MAGIC = b"HRCS"
+STORE_VERSION = 1
+# magic, version, column count, row count, meta length
+HEADER = struct.Struct("<4sHHII")
+MISSING = 0xFFFF
+
+# Row flags
+FLAG_CAMEL_CASE = 1  # attributes are repeated as camelCase top-level keys
+FLAG_ANIMATION = 2  # animated creature, `.gif` image and an `animation_url`
+FLAG_RAW = 4  # document is not reproducible from the row, stored verbatim
+
+
+def creature_number(token_id: int) -> int:
+    return token_id - CREATURE_TOKEN_ID_OFFSET
+
+
+def creature_token_id(number: int) -> int:
+    return number + CREATURE_TOKEN_ID_OFFSET
+
+
+def camel_case(trait_type: str) -> str:
+    """`Background Color` -> `backgroundColor`"""
+    words = trait_type.split()
+    return words[0].lower() + "".join(w[:1].upper() + w[1:] for w in words[1:])
+
+
+def row_struct(columns: int) -> struct.Struct:
+    """number, flags, description index and one value index per trait column"""
+    return struct.Struct(f"<IBB{columns}H")
+
+
+def read_creature_files(
+    metadata_dir: Union[str, Path] = CREATURE_METADATA_DIR
+) -> Iterator[tuple[int, bytes]]:
+    """Yields `(creature number, raw file bytes)` ordered by creature number."""
+    paths = sorted(
+        Path(metadata_dir).glob("*.json"), key=lambda p: int(p.name[: -len(".json")])
+    )
+    for path in paths:
+        yield creature_number(int(path.stem)), path.read_bytes()
+
+
+def encode_document(
+    number: int,
+    description: str,
+    trait_types: list[str],
+    values: list[Optional[str]],
+    flags: int,
+) -> bytes:
+    """Rebuilds creature JSON exactly as it is published in `metadata/creature/`"""
+    image_template = (
+        CREATURE_ANIMATED_IMAGE_TEMPLATE
+        if flags & FLAG_ANIMATION
+        else CREATURE_IMAGE_TEMPLATE
+    )
+    document = {
+        "image": image_template.format(number=number),
+        "name": CREATURE_NAME_TEMPLATE.format(number=number),
+        "description": description,
+        "attributes": [
+            {"trait_type": trait_type, "value": value}
+            for trait_type, value in zip(trait_types, values)
+            if value is not None
+        ],
+    }
+    if flags & FLAG_ANIMATION:
+        document["animation_url"] = CREATURE_ANIMATION_TEMPLATE.format(number=number)
+        document["animation_url_mime_type"] = CREATURE_ANIMATION_MIME_TYPE
+    if flags & FLAG_CAMEL_CASE:
+        for trait_type, value in zip(trait_types, values):
+            if value is not None:
+                document[camel_case(trait_type)] = value
+    return json.dumps(document).encode()
+
+
+class _Interner:
+    def __init__(self, limit: int):
+        self.values: list[str] = []
+        self._index: dict[str, int] = {}
+        self._limit = limit
+
+    def __call__(self, value: str) -> int:
+        if (index := self._index.get(value)) is None:
+            index = len(self.values)
+            if index >= self._limit:
+                raise ValueError(f"Too many distinct values, limit is {self._limit}")
+            self._index[value] = index
+            self.values.append(value)
+        return index
+
+
+def build_store(
+    metadata_dir: Union[str, Path] = CREATURE_METADATA_DIR,
+    store_path: Union[str, Path] = CREATURE_STORE_PATH,
+) -> Path:
+    """Packs every creature JSON file into a single store file.
+
+    Trait strings are interned per `trait_type` and every creature becomes a
+    fixed-width row of value indices. Documents which cannot be rebuilt
+    byte-for-byte from their row (hand-edited files) are kept verbatim.
+    """
+    documents = [
+        (number, raw, json.loads(raw))
+        for number, raw in read_creature_files(metadata_dir)
+    ]
+    trait_types: list[str] = []
+    for _, _, document in documents:
+        for attribute in document["attributes"]:
+            if attribute["trait_type"] not in trait_types:
+                trait_types.append(attribute["trait_type"])
+
+    descriptions = _Interner(0xFF)
+    columns = [_Interner(MISSING) for _ in trait_types]
+    row = row_struct(len(trait_types))
+    rows = bytearray()
+    raw_blob = bytearray()
+    raw_documents: dict[str, list[int]] = {}
+    for number, raw, document in documents:
+        values: list[Optional[str]] = [None] * len(trait_types)
+        for attribute in document["attributes"]:
+            values[trait_types.index(attribute["trait_type"])] = attribute["value"]
+        flags = 0
+        if "animation_url" in document:
+            flags |= FLAG_ANIMATION
+        if any(camel_case(t) in document for t in trait_types):
+            flags |= FLAG_CAMEL_CASE
+        description = document.get("description", "")
+        if (
+            not all(isinstance(v, str) for v in values if v is not None)
+            or encode_document(number, description, trait_types, values, flags) != raw
+        ):
+            flags |= FLAG_RAW
+            raw_documents[str(number)] = [len(raw_blob), len(raw)]
+            raw_blob += raw
+            indices = [MISSING] * len(trait_types)
+            description_index = 0
+        else:
+            indices = [
+                MISSING if value is None else columns[i](value)
+                for i, value in enumerate(values)
+            ]
+            description_index = descriptions(description)
+        rows += row.pack(number, flags, description_index, *indices)
+
+    meta = json.dumps(
+        {
+            "traitTypes": trait_types,
+            "values": [column.values for column in columns],
+            "descriptions": descriptions.values,
+            "raw": raw_documents,
+        },
+        separators=(",", ":"),
+    ).encode()
+    store_path = Path(store_path)
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(store_path, "wb") as f:
+        f.write(
+            HEADER.pack(
+                STORE_MAGIC, STORE_VERSION, len(trait_types), len(documents), len(meta)
+            )
+        )
+        f.write(meta)
+        f.write(rows)
+        f.write(raw_blob)
+    return store_path
+
+
+class CreatureStore:
+    """Read-only, memory-mapped view over a store written by `build_store`."""
+
+    def __init__(self, store_path: Union[str, Path] = CREATURE_STORE_PATH):
+        self._file = open(store_path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, columns, rows, meta_length = HEADER.unpack_from(self._data)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            self.close()
+            raise ValueError(f"{store_path} is not a creature store v{STORE_VERSION}")
+        meta = json.loads(self._data[HEADER.size : HEADER.size + meta_length])
+        self.trait_types: list[str] = meta["traitTypes"]
+        self.values: list[list[str]] = meta["values"]
+        self.descriptions: list[str] = meta["descriptions"]
+        self._raw = {int(k): v for k, v in meta["raw"].items()}
+        self._row = row_struct(columns)
+        self._rows_offset = HEADER.size + meta_length
+        self._raw_offset = self._rows_offset + rows * self._row.size
+        self._numbers = [
+            self._row.unpack_from(self._data, self._rows_offset + i * self._row.size)[0]
+            for i in range(rows)
+        ]
+
+    def __enter__(self) -> "CreatureStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if not self._data.closed:
+            self._data.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __contains__(self, number: int) -> bool:
+        return self._position(number) is not None
+
+    def numbers(self) -> list[int]:
+        return list(self._numbers)
+
+    def _position(self, number: int) -> Optional[int]:
+        position = bisect_left(self._numbers, number)
+        if position < len(self._numbers) and self._numbers[position] == number:
+            return position
+        return None
+
+    def row(self, number: int) -> tuple[int, int, tuple[int, ...]]:
+        """Returns `(flags, description index, value indices)` of a creature."""
+        if (position := self._position(number)) is None:
+            raise KeyError(number)
+        _, flags, description, *indices = self._row.unpack_from(
+            self._data, self._rows_offset + position * self._row.size
+        )
+        return flags, description, tuple(indices)
+
+    def traits(self, number: int) -> dict[str, str]:
+        flags, _, indices = self.row(number)
+        if flags & FLAG_RAW:
+            return {
+                a["trait_type"]: a["value"]
+                for a in json.loads(self.raw(number))["attributes"]
+            }
+        return {
+            trait_type: self.values[i][index]
+            for i, (trait_type, index) in enumerate(zip(self.trait_types, indices))
+            if index != MISSING
+        }
+
+    def raw(self, number: int) -> bytes:
+        """Returns the exact bytes of `metadata/creature/<token id>.json`."""
+        flags, description, indices = self.row(number)
+        if flags & FLAG_RAW:
+            offset, length = self._raw[number]
+            start = self._raw_offset + offset
+            return self._data[start : start + length]
+        values = [
+            None if index == MISSING else self.values[i][index]
+            for i, index in enumerate(indices)
+        ]
+        return encode_document(
+            number, self.descriptions[description], self.trait_types, values, flags
+        )
+
+    def document(self, number: int) -> dict:
+        return json.loads(self.raw(number))
+
+    def raw_by_token_id(self, token_id: int) -> bytes:
+        return self.raw(creature_number(token_id))
+
+
+def main():
+    store_path = build_store()
+    with CreatureStore(store_path) as store:
+        print(f"Packed {len(store)} creatures into {store_path}")
@@ -0,0 +1,142 @@
+import json
+from array import array
+from operator import add
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Union
+
+from .creature_store import CREATURE_METADATA_DIR, CreatureStore, read_creature_files
+
+# Column code of a creature that does not have the trait at all
+MISSING = 0xFFFF
+
+Conditions = Mapping[str, Union[str, Iterable[str]]]
+
+
+def _popcount(bitmap: int) -> int:
+    return bin(bitmap).count("1")
+
+
+def _positions(bitmap: int) -> Iterator[int]:
+    bits = bin(bitmap)[:1:-1]
+    position = bits.find("1")
+    while position != -1:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+class TraitIndex:
+    """Columnar index over creature traits.
+
+    Every `trait_type` is one `array` column of value codes, every value has
+    a bitmap (python int, bit `i` is the creature at position `i`) so that
+    conjunctive filters are a handful of big-int `&` operations.
+    """
+
+    def __init__(self, numbers: list[int], traits: Iterable[Mapping[str, str]]):
+        self.numbers = list(numbers)
+        self.trait_types: list[str] = []
+        self.values: list[list[str]] = []
+        self.columns: list[array] = []
+        self._codes: list[dict[str, int]] = []
+        for position, creature_traits in enumerate(traits):
+            for trait_type, value in creature_traits.items():
+                column = self._column(trait_type)
+                codes = self._codes[column]
+                if (code := codes.get(value)) is None:
+                    code = codes[value] = len(self.values[column])
+                    self.values[column].append(value)
+                self.columns[column][position] = code
+        self.bitmaps: list[list[int]] = []
+        for column, values in zip(self.columns, self.values):
+            bitmaps = [0] * len(values)
+            for position, code in enumerate(column):
+                if code != MISSING:
+                    bitmaps[code] |= 1 << position
+            self.bitmaps.append(bitmaps)
+        self.all = (1 << len(self.numbers)) - 1
+
+    @classmethod
+    def from_directory(
+        cls, metadata_dir: Union[str, Path] = CREATURE_METADATA_DIR
+    ) -> "TraitIndex":
+        numbers, traits = [], []
+        for number, raw in read_creature_files(metadata_dir):
+            numbers.append(number)
+            traits.append(
+                {a["trait_type"]: a["value"] for a in json.loads(raw)["attributes"]}
+            )
+        return cls(numbers, traits)
+
+    @classmethod
+    def from_store(cls, store: CreatureStore) -> "TraitIndex":
+        numbers = store.numbers()
+        return cls(numbers, (store.traits(number) for number in numbers))
+
+    def _column(self, trait_type: str) -> int:
+        if trait_type not in self.trait_types:
+            self.trait_types.append(trait_type)
+            self.values.append([])
+            self.columns.append(array("H", [MISSING]) * len(self.numbers))
+            self._codes.append({})
+        return self.trait_types.index(trait_type)
+
+    def bitmap(self, trait_type: str, value: str) -> int:
+        column = self.trait_types.index(trait_type)
+        if (code := self._codes[column].get(value)) is None:
+            return 0
+        return self.bitmaps[column][code]
+
+    def select(self, conditions: Conditions) -> int:
+        """Bitmap of creatures matching every `trait_type: value` condition.
+
+        A condition value can also be a collection of values, any of which
+        matches.
+        """
+        result = self.all
+        for trait_type, value in conditions.items():
+            if isinstance(value, str):
+                result &= self.bitmap(trait_type, value)
+            else:
+                union = 0
+                for v in value:
+                    union |= self.bitmap(trait_type, v)
+                result &= union
+        return result
+
+    def count(self, conditions: Conditions) -> int:
+        return _popcount(self.select(conditions))
+
+    def filter(self, conditions: Conditions) -> list[int]:
+        """Creature numbers matching all `conditions`."""
+        return [self.numbers[p] for p in _positions(self.select(conditions))]
+
+    def frequencies(self, trait_type: str) -> dict[str, int]:
+        column = self.trait_types.index(trait_type)
+        return {
+            value: _popcount(bitmap)
+            for value, bitmap in zip(self.values[column], self.bitmaps[column])
+        }
+
+    def rarity_scores(self) -> dict[int, float]:
+        """Statistical rarity score of every creature.
+
+        Score is the sum of `1 / frequency` of each of the creature's traits,
+        a missing trait is treated as a value of its own.
+        """
+        total = len(self.numbers)
+        scores = [0.0] * total
+        for column, values in enumerate(self.values):
+            counts = [_popcount(bitmap) for bitmap in self.bitmaps[column]]
+            weights = {code: total / count for code, count in enumerate(counts)}
+            if missing := total - sum(counts):
+                weights[MISSING] = total / missing
+            scores = list(
+                map(add, scores, map(weights.__getitem__, self.columns[column]))
+            )
+        return dict(zip(self.numbers, scores))
+
+    def rarity_ranks(self) -> dict[int, int]:
+        """Rank of every creature by rarity score, 1 is the rarest."""
+        scores = self.rarity_scores()
+        ordered = sorted(scores, key=lambda number: (-scores[number], number))
+        return {number: rank for rank, number in enumerate(ordered, start=1)}
@@ -1,12 +1,16 @@
 from time import sleep
 from typing import Optional
 
-from brownie import Contract, HighriseEstate
+from brownie import Contract, HighriseEstate, HighriseLand
 from eth_account import Account
 
 from . import ESTATE_BASE_URI_TEMPLATE, ESTATE_NAME, ESTATE_SYMBOL
 from .common import encode_function_data, get_account, load_openzeppelin
 from .helpers import Project
+from .land_v3 import grant_estate_transfer
+
+# `type(IHighriseLandV3).interfaceId`, land implementations with estate transfer grants
+LAND_V3_INTERFACE_ID = "0x9bbc90b1"
 
 
 def deploy_estate_implementation(account: Optional[Account] = None) -> Contract:
@@ -91,3 +95,48 @@ def deploy_estate(
         oz,
     )
     return estate_proxy, estate
+
+
+def supports_estate_transfer_grant(land_address: str) -> bool:
+    land = Contract.from_abi("HighriseLand", land_address, HighriseLand.abi)
+    return land.supportsInterface(LAND_V3_INTERFACE_ID)
+
+
+def authorize_parcels(
+    estate_address: str,
+    land_address: str,
+    parcel_ids: list[int],
+    account: Optional[Account] = None,
+):
+    """Lets the estate contract take `parcel_ids` of `account`, with a single
+    estate transfer grant when land supports it and per-parcel approvals
+    otherwise."""
+    if not account:
+        account = get_account()
+    if supports_estate_transfer_grant(land_address):
+        grant_estate_transfer(land_address, account=account)
+        return
+    land = Contract.from_abi("HighriseLand", land_address, HighriseLand.abi)
+    for token_id in parcel_ids:
+        land.approve(estate_address, token_id, {"from": account}).wait(1)
+
+
+def mint_estate(
+    estate_proxy_address: str,
+    land_proxy_address: str,
+    parcel_ids: list[int],
+    account: Optional[Account] = None,
+) -> int:
+    """Authorizes transfer of the parcels and mints the estate.
+
+    Returns estate token ID.
+    """
+    if not account:
+        account = get_account()
+    authorize_parcels(estate_proxy_address, land_proxy_address, parcel_ids, account)
+    estate = Contract.from_abi(
+        "HighriseEstate", estate_proxy_address, HighriseEstate.abi
+    )
+    transaction = estate.mintFromParcels(parcel_ids, {"from": account})
+    transaction.wait(1)
+    return transaction.events["EstateMinted"]["tokenId"]
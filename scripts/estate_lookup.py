@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Optional
+
+from .coordinates import coordinates_to_token_id
+from .metadata_diff import estate_parcels_on_chain
+
+LOOKUP_WORKERS = 8
+LOOKUP_CHUNK_SIZE = 256
+
+
+def region_token_ids(
+    bottom_left: tuple[int, int], top_right: tuple[int, int]
+) -> list[int]:
+    """Parcel token IDs of a rectangular map region, bounds included."""
+    (x0, y0), (x1, y1) = bottom_left, top_right
+    return [
+        coordinates_to_token_id((x, y))
+        for y in range(y0, y1 + 1)
+        for x in range(x0, x1 + 1)
+    ]
+
+
+class EstateLookup:
+    """Resolves parcels to estates with `HighriseEstateV2.parcelToEstate`.
+
+    Lookups of a chunk run concurrently. Once a parcel resolves to an estate,
+    the rest of the estate parcels are filled in from its geometry instead of
+    being looked up.
+    """
+
+    def __init__(
+        self,
+        estate_contract,
+        workers: int = LOOKUP_WORKERS,
+        chunk_size: int = LOOKUP_CHUNK_SIZE,
+    ):
+        self.estate_contract = estate_contract
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.estates: dict[int, list[int]] = {}
+
+    def parcel_to_estate(self, token_id: int) -> Optional[int]:
+        in_estate, estate_id = self.estate_contract.parcelToEstate(token_id)
+        return int(estate_id) if in_estate else None
+
+    def resolve(self, token_ids: Iterable[int]) -> dict[int, Optional[int]]:
+        """Maps every parcel to its estate ID, `None` for parcels outside estates."""
+        resolved: dict[int, Optional[int]] = {}
+        token_ids = iter(token_ids)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while chunk := list(islice(token_ids, self.chunk_size)):
+                pending = [t for t in chunk if t not in resolved]
+                for token_id, estate_id in zip(
+                    pending, executor.map(self.parcel_to_estate, pending)
+                ):
+                    if token_id in resolved:
+                        continue
+                    resolved[token_id] = estate_id
+                    if estate_id is not None:
+                        for parcel_id in self._estate_parcels(estate_id):
+                            resolved[parcel_id] = estate_id
+        return resolved
+
+    def resolve_region(
+        self, bottom_left: tuple[int, int], top_right: tuple[int, int]
+    ) -> dict[int, Optional[int]]:
+        token_ids = region_token_ids(bottom_left, top_right)
+        resolved = self.resolve(token_ids)
+        return {t: resolved[t] for t in token_ids}
+
+    def _estate_parcels(self, estate_id: int) -> list[int]:
+        if estate_id not in self.estates:
+            self.estates[estate_id] = estate_parcels_on_chain(
+                self.estate_contract, estate_id
+            )
+        return self.estates[estate_id]
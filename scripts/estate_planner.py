@@ -0,0 +1,210 @@
+from typing import Iterable, Mapping, NamedTuple, Sequence
+
+from .coordinates import (
+    ESTATE_SIZES,
+    coordinates_to_token_id,
+    estate_parcels,
+    estate_size,
+    token_id_to_coordinates,
+)
+
+# Contract an `Operation` is sent to, not to be confused with the document
+# kinds of `land_metadata`
+PLAN_LAND = "land"
+PLAN_ESTATE = "estate"
+
+
+class Square(NamedTuple):
+    """Estate geometry, bottom-left coordinates and size."""
+
+    x: int
+    y: int
+    size: int
+
+    @classmethod
+    def from_parcels(cls, parcel_ids: Sequence[int]) -> "Square":
+        size = estate_size(list(parcel_ids))
+        x, y = token_id_to_coordinates(parcel_ids[0])
+        return cls(x, y, size)
+
+    @property
+    def parcels(self) -> list[int]:
+        """Parcel IDs in `mintFromParcels` order."""
+        return estate_parcels((self.x, self.y), self.size)
+
+    @property
+    def token_id(self) -> int:
+        return coordinates_to_token_id((self.x, self.y + self.size - 1))
+
+    def overlaps(self, other: "Square") -> bool:
+        return (
+            self.x < other.x + other.size
+            and other.x < self.x + self.size
+            and self.y < other.y + other.size
+            and other.y < self.y + self.size
+        )
+
+
+class GasCosts(NamedTuple):
+    """Approximate gas of the steps estate operations are made of."""
+
+    transaction: int = 21_000
+    # Per parcel `approve` when the owner has no estate transfer grant
+    approve: int = 27_000
+    grant: int = 46_000
+    # Parcel moved into the estate contract
+    pull: int = 30_000
+    # Parcel returned to the owner
+    release: int = 32_000
+    # `estatesToParcels` slot written from zero
+    fresh_slot: int = 22_100
+    # `estatesToParcels` slot rewritten in place
+    rewritten_slot: int = 5_000
+    mint: int = 50_000
+    burn: int = 30_000
+
+
+class Operation(NamedTuple):
+    contract: str
+    method: str
+    args: tuple
+    gas: int
+
+
+class Plan(NamedTuple):
+    operations: list[Operation]
+    gas: int
+    # Gas of burning every affected estate and minting every target from scratch
+    naive_gas: int
+
+
+def _authorize(parcels: list[int], costs: GasCosts, granted: bool) -> list[Operation]:
+    """Operations which let the estate contract pull `parcels` of the owner."""
+    if not parcels:
+        return []
+    if granted:
+        return [Operation(PLAN_LAND, "grantEstateTransfer", (), costs.grant)]
+    gas = costs.transaction + costs.approve * len(parcels)
+    return [Operation(PLAN_LAND, "approveForTransfer", (parcels,), gas)]
+
+
+def _slots_gas(square: Square, costs: GasCosts, rewritten: bool) -> int:
+    # Array length and one slot per parcel
+    slots = square.size**2 + 1
+    return slots * (costs.rewritten_slot if rewritten else costs.fresh_slot)
+
+
+def _naive(
+    sources: dict[int, Square], targets: list[Square], costs: GasCosts, granted: bool
+) -> list[Operation]:
+    operations = [
+        Operation(
+            PLAN_ESTATE,
+            "burn",
+            (token_id,),
+            costs.transaction + costs.release * square.size**2 + costs.burn,
+        )
+        for token_id, square in sources.items()
+    ]
+    for square in targets:
+        parcels = square.parcels
+        operations += _authorize(parcels, costs, granted)
+        gas = (
+            costs.transaction
+            + costs.pull * len(parcels)
+            + _slots_gas(square, costs, rewritten=False)
+            + costs.mint
+        )
+        operations.append(Operation(PLAN_ESTATE, "mintFromParcels", (parcels,), gas))
+    return operations
+
+
+def _reshape(
+    sources: dict[int, Square], targets: list[Square], costs: GasCosts, granted: bool
+) -> list[Operation]:
+    source_parcels = {p for square in sources.values() for p in square.parcels}
+    target_parcels = {p for square in targets for p in square.parcels}
+    pulled = sorted(target_parcels - source_parcels)
+    returned = source_parcels - target_parcels
+    target_ids = {square.token_id for square in targets}
+    gas = (
+        costs.transaction
+        + costs.pull * len(pulled)
+        + costs.release * len(returned)
+        + costs.burn * len(sources.keys() - target_ids)
+        + costs.mint * len(target_ids - sources.keys())
+        + sum(
+            _slots_gas(square, costs, rewritten=square.token_id in sources)
+            for square in targets
+        )
+    )
+    args = (list(sources), [square.parcels for square in targets])
+    return _authorize(pulled, costs, granted) + [
+        Operation(PLAN_ESTATE, "reshape", args, gas)
+    ]
+
+
+def _components(
+    sources: dict[int, Square], targets: list[Square]
+) -> list[tuple[dict[int, Square], list[Square]]]:
+    """Groups estates and targets which overlap, directly or through each other."""
+    pending = set(range(len(targets)))
+    components = []
+    while pending:
+        target_indices, source_ids = {pending.pop()}, set()
+        frontier = list(target_indices)
+        while frontier:
+            square = targets[frontier.pop()]
+            for token_id, source in sources.items():
+                if token_id in source_ids or not source.overlaps(square):
+                    continue
+                source_ids.add(token_id)
+                for i in list(pending):
+                    if targets[i].overlaps(source):
+                        pending.remove(i)
+                        target_indices.add(i)
+                        frontier.append(i)
+        components.append(
+            (
+                {token_id: sources[token_id] for token_id in sorted(source_ids)},
+                [targets[i] for i in sorted(target_indices)],
+            )
+        )
+    return components
+
+
+def plan(
+    estates: Mapping[int, Sequence[int]],
+    targets: Iterable[tuple[tuple[int, int], int]],
+    costs: GasCosts = GasCosts(),
+    granted: bool = True,
+) -> Plan:
+    """Cheapest operations turning the owner's `estates` into `targets`.
+
+    `estates` maps estate IDs to parcels, `targets` are `(bottom-left
+    coordinates, size)` of the wanted estates. Estates overlapping a target
+    are merged, split or resized, the ones which don't are left alone. Parcels
+    of targets outside current estates must be owned by the sender. Every group
+    of overlapping estates and targets is done with a single `reshape` or by
+    burning and minting again, whichever costs less. With `granted` parcels are
+    pulled with an estate transfer grant, otherwise with per-parcel approvals.
+    """
+    target_squares = [Square(*coords, size) for coords, size in targets]
+    for i, square in enumerate(target_squares):
+        if square.size not in ESTATE_SIZES:
+            raise ValueError(f"Invalid estate size {square.size}")
+        if any(square.overlaps(other) for other in target_squares[:i]):
+            raise ValueError(f"Target estate {square} overlaps another target")
+    sources = {
+        token_id: Square.from_parcels(parcels) for token_id, parcels in estates.items()
+    }
+    operations: list[Operation] = []
+    naive_gas = 0
+    for component_sources, component_targets in _components(sources, target_squares):
+        if sorted(component_sources.values()) == sorted(component_targets):
+            continue
+        naive = _naive(component_sources, component_targets, costs, granted)
+        reshape = _reshape(component_sources, component_targets, costs, granted)
+        naive_gas += sum(o.gas for o in naive)
+        operations += min(naive, reshape, key=lambda ops: sum(o.gas for o in ops))
+    return Plan(operations, sum(o.gas for o in operations), naive_gas)
@@ -0,0 +1,66 @@
+from typing import Optional
+
+from brownie import Contract, HighriseEstateV2, HighriseLandV3
+from eth_account import Account
+
+from .common import get_account, upgrade
+from .estate_planner import PLAN_ESTATE, Plan
+from .helpers import Project, load_openzeppelin
+from .land_v3 import grant_estate_transfer
+
+
+def deploy_estate_v2_implementation(account: Optional[Account] = None) -> Contract:
+    if not account:
+        account = get_account()
+    estate = HighriseEstateV2.deploy(
+        {"from": account},
+    )
+    return estate
+
+
+def verify_estate_v2(estate_v2_address: str):
+    contract = HighriseEstateV2.at(estate_v2_address)
+    HighriseEstateV2.publish_source(contract)
+
+
+def upgrade_proxy(
+    estate_v2_impl_address: str,
+    estate_proxy_address: str,
+    proxy_admin_address: str,
+    account: Optional[Account] = None,
+    oz: Optional[Project] = None,
+):
+    if not account:
+        account = get_account()
+    if not oz:
+        oz = load_openzeppelin()
+    proxy = oz.TransparentUpgradeableProxy.at(estate_proxy_address)
+    proxy_admin = oz.ProxyAdmin.at(proxy_admin_address)
+    upgrade_transaction = upgrade(
+        account, proxy, estate_v2_impl_address, proxy_admin_contract=proxy_admin
+    )
+    upgrade_transaction.wait(1)
+
+
+def execute_plan(
+    plan: Plan,
+    estate_proxy_address: str,
+    land_proxy_address: str,
+    account: Optional[Account] = None,
+):
+    """Sends operations of `estate_planner.plan` in order."""
+    if not account:
+        account = get_account()
+    estate = Contract.from_abi(
+        "HighriseEstateV2", estate_proxy_address, HighriseEstateV2.abi
+    )
+    land = Contract.from_abi("HighriseLandV3", land_proxy_address, HighriseLandV3.abi)
+    for operation in plan.operations:
+        if operation.method == "grantEstateTransfer":
+            grant_estate_transfer(land_proxy_address, account=account)
+            continue
+        args = operation.args
+        if operation.method == "approveForTransfer":
+            args = (estate_proxy_address, *args)
+        contract = estate if operation.contract == PLAN_ESTATE else land
+        getattr(contract, operation.method)(*args, {"from": account}).wait(1)
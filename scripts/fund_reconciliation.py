@@ -0,0 +1,212 @@
+import json
+import os
+import random
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Optional, Union
+
+from brownie import Contract, HighriseLand, HighriseLandFund, chain
+
+from .land_metadata import ZERO_ADDRESS, log_position
+from .ownership_indexer import BLOCK_CHUNK_SIZE
+
+LEDGER_CHECKPOINT = "build/fund_ledger.json"
+CROSS_CHECK_SAMPLE = 50
+
+
+class Purchase(NamedTuple):
+    wallet: str
+    amount: int
+    # `None` when the mint `Transfer` of the funding transaction was not found
+    token_id: Optional[int]
+    block: int
+    timestamp: int
+
+    @property
+    def day(self) -> str:
+        return datetime.fromtimestamp(self.timestamp, timezone.utc).date().isoformat()
+
+
+class Mismatch(NamedTuple):
+    wallet: str
+    indexed: int
+    on_chain: int
+
+
+def purchases(logs: Iterable, timestamp: Callable[[int], int]) -> list[Purchase]:
+    """Pairs `FundLandEvent` logs with the land mint `Transfer` logs of the same
+    transaction.
+
+    `fund` mints before emitting `FundLandEvent`, so the land mint to the sender
+    preceding the event in the transaction is the purchased token.
+    """
+    result = []
+    mints: dict[tuple[bytes, str], list[int]] = defaultdict(list)
+    for log in sorted(logs, key=log_position):
+        transaction = bytes(log.transactionHash)
+        if log.event == "Transfer":
+            if log.args["from"] == ZERO_ADDRESS:
+                mints[transaction, log.args["to"]].append(int(log.args["tokenId"]))
+            continue
+        wallet = log.args["sender"]
+        pending = mints.get((transaction, wallet))
+        result.append(
+            Purchase(
+                wallet,
+                int(log.args["fundAmount"]),
+                pending.pop() if pending else None,
+                log.blockNumber,
+                timestamp(log.blockNumber),
+            )
+        )
+    return result
+
+
+class FundLedger:
+    """Funded totals of `HighriseLandFund` per wallet and per UTC day,
+    rebuilt from `FundLandEvent` and land `Transfer` logs.
+
+    `block` is the last indexed block.
+    """
+
+    def __init__(self, block: int = -1):
+        self.block = block
+        self.funded: dict[str, int] = defaultdict(int)
+        self.tokens: dict[str, list[int]] = defaultdict(list)
+        self.daily_funded: dict[str, int] = defaultdict(int)
+        self.daily_purchases: dict[str, int] = defaultdict(int)
+
+    def apply(self, purchases: Iterable[Purchase]):
+        for purchase in purchases:
+            self.funded[purchase.wallet] += purchase.amount
+            if purchase.token_id is not None:
+                self.tokens[purchase.wallet].append(purchase.token_id)
+            self.daily_funded[purchase.day] += purchase.amount
+            self.daily_purchases[purchase.day] += 1
+
+    def total_funded(self) -> int:
+        return sum(self.funded.values())
+
+    def sync(
+        self,
+        fund_contract,
+        land_contract,
+        to_block: Optional[int] = None,
+        chunk_size: int = BLOCK_CHUNK_SIZE,
+    ) -> int:
+        """Indexes purchases up to `to_block` in block chunks.
+
+        Returns number of purchases applied.
+        """
+        to_block = chain.height if to_block is None else to_block
+        timestamps: dict[int, int] = {}
+
+        def timestamp(block: int) -> int:
+            if block not in timestamps:
+                timestamps[block] = chain[block].timestamp
+            return timestamps[block]
+
+        applied = 0
+        while self.block < to_block:
+            from_block = self.block + 1
+            chunk_end = min(from_block + chunk_size - 1, to_block)
+            fund_logs = fund_contract.events.get_sequence(
+                from_block, chunk_end, event_type="FundLandEvent"
+            )
+            transactions = {bytes(log.transactionHash) for log in fund_logs}
+            # Only mints of funding transactions are needed, other land
+            # transfers are dropped before pairing
+            transfer_logs = [
+                log
+                for log in land_contract.events.get_sequence(
+                    from_block, chunk_end, event_type="Transfer"
+                )
+                if bytes(log.transactionHash) in transactions
+            ]
+            chunk = purchases([*fund_logs, *transfer_logs], timestamp)
+            self.apply(chunk)
+            applied += len(chunk)
+            self.block = chunk_end
+            timestamps.clear()
+        return applied
+
+    def cross_check(
+        self,
+        fund_contract,
+        sample_size: int = CROSS_CHECK_SAMPLE,
+        seed: Optional[int] = None,
+    ) -> list[Mismatch]:
+        """Compares indexed totals of sampled wallets with `addressToAmountFunded`
+        at the last indexed block."""
+        wallets = sorted(self.funded)
+        sample = random.Random(seed).sample(wallets, min(sample_size, len(wallets)))
+        mismatches = []
+        for wallet in sample:
+            on_chain = fund_contract.addressToAmountFunded.call(
+                wallet, block_identifier=self.block
+            )
+            if on_chain != self.funded[wallet]:
+                mismatches.append(Mismatch(wallet, self.funded[wallet], on_chain))
+        return mismatches
+
+    def save(self, path: Union[str, Path]):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(
+            json.dumps(
+                {
+                    "block": self.block,
+                    "funded": {w: str(a) for w, a in self.funded.items()},
+                    "tokens": self.tokens,
+                    "daily_funded": {d: str(a) for d, a in self.daily_funded.items()},
+                    "daily_purchases": self.daily_purchases,
+                }
+            )
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path], from_block: int = 0) -> "FundLedger":
+        """Loads a checkpoint written by `save`, empty ledger indexing from
+        `from_block`, the fund deployment block, if there is none."""
+        ledger = cls(from_block - 1)
+        if not Path(path).exists():
+            return ledger
+        data = json.loads(Path(path).read_text())
+        ledger.block = data["block"]
+        ledger.funded.update({w: int(a) for w, a in data["funded"].items()})
+        ledger.tokens.update(data["tokens"])
+        ledger.daily_funded.update({d: int(a) for d, a in data["daily_funded"].items()})
+        ledger.daily_purchases.update(data["daily_purchases"])
+        return ledger
+
+
+def print_ledger(ledger: FundLedger, mismatches: list[Mismatch]):
+    print(f"Indexed up to block {ledger.block}")
+    for day in sorted(ledger.daily_funded):
+        print(
+            f"{day}: {ledger.daily_purchases[day]} purchases, "
+            f"{ledger.daily_funded[day]} wei"
+        )
+    print(f"{len(ledger.funded)} wallets funded {ledger.total_funded()} wei")
+    for mismatch in mismatches:
+        print(
+            f"Mismatch {mismatch.wallet}: indexed {mismatch.indexed}, "
+            f"addressToAmountFunded {mismatch.on_chain}"
+        )
+
+
+def main():
+    """Reconciles the fund at `FUND_ADDRESS` from `LEDGER_FROM_BLOCK` (0 by
+    default), checkpointing to `LEDGER_CHECKPOINT` (`build/fund_ledger.json` by
+    default)."""
+    fund_contract = Contract.from_abi(
+        "HighriseLandFund", os.environ["FUND_ADDRESS"], HighriseLandFund.abi
+    )
+    land_contract = Contract.from_abi(
+        "HighriseLand", fund_contract.landContract(), HighriseLand.abi
+    )
+    checkpoint = os.environ.get("LEDGER_CHECKPOINT", LEDGER_CHECKPOINT)
+    ledger = FundLedger.load(checkpoint, int(os.environ.get("LEDGER_FROM_BLOCK", 0)))
+    ledger.sync(fund_contract, land_contract)
+    ledger.save(checkpoint)
+    print_ledger(ledger, ledger.cross_check(fund_contract))
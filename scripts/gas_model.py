@@ -0,0 +1,297 @@
+import json
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Sequence, Union
+
+from brownie import chain
+
+from .coordinates import estate_parcels
+from .estate_planner import PLAN_LAND, GasCosts, Operation, Plan
+
+DEVELOPMENT_BLOCK_GAS_LIMIT = 30_000_000
+# Share of the block gas limit a single transaction may use
+BLOCK_GAS_TARGET = 0.9
+# Estate sizes benchmarked by `calibrate`
+CALIBRATION_SIZES = (3, 6, 9)
+# `mintFromParcels` pulling parcels through an estate transfer grant, sampled
+# apart from mints of approved parcels
+GRANTED_MINT = "mintFromParcels granted"
+
+
+class Sample(NamedTuple):
+    """Gas used by one transaction of `operation` over `units` items."""
+
+    operation: str
+    units: int
+    gas: int
+
+
+class OperationGas(NamedTuple):
+    """Linear gas model of an operation, `base + per_unit * units`."""
+
+    base: int
+    per_unit: int = 0
+
+    def gas(self, units: int = 1) -> int:
+        return self.base + self.per_unit * units
+
+    def max_units(self, gas_limit: int) -> float:
+        """Most units a single transaction fits under `gas_limit`, unbounded
+        for fixed cost operations."""
+        if self.base > gas_limit:
+            return 0
+        if not self.per_unit:
+            return math.inf
+        return (gas_limit - self.base) // self.per_unit
+
+
+def _fit(samples: Sequence[Sample]) -> OperationGas:
+    """Least squares line through the samples, rounded up.
+
+    Operations sampled at a single size are modeled as a fixed cost.
+    """
+    n = len(samples)
+    mean_units = sum(s.units for s in samples) / n
+    mean_gas = sum(s.gas for s in samples) / n
+    variance = sum((s.units - mean_units) ** 2 for s in samples)
+    if not variance:
+        return OperationGas(math.ceil(mean_gas))
+    per_unit = (
+        sum((s.units - mean_units) * (s.gas - mean_gas) for s in samples) / variance
+    )
+    per_unit = max(per_unit, 0)
+    base = max(mean_gas - per_unit * mean_units, 0)
+    return OperationGas(math.ceil(base), math.ceil(per_unit))
+
+
+class GasModel:
+    """Gas of Land and Estate operations, fitted from benchmark transactions.
+
+    Operations are keyed by contract method name, as in `estate_planner.Operation`.
+    """
+
+    def __init__(self, operations: Optional[dict[str, OperationGas]] = None):
+        self.operations: dict[str, OperationGas] = dict(operations or {})
+
+    @classmethod
+    def fit(cls, samples: Iterable[Sample]) -> "GasModel":
+        by_operation = defaultdict(list)
+        for sample in samples:
+            by_operation[sample.operation].append(sample)
+        return cls({op: _fit(s) for op, s in by_operation.items()})
+
+    def __getitem__(self, operation: str) -> OperationGas:
+        if operation not in self.operations:
+            raise ValueError(f"No gas model for {operation}")
+        return self.operations[operation]
+
+    def estimate(self, operation: str, units: int = 1) -> int:
+        return self[operation].gas(units)
+
+    def estate_costs(
+        self, defaults: GasCosts = GasCosts(), granted: bool = False
+    ) -> GasCosts:
+        """Planner step costs derived from the fitted operations.
+
+        Parcel pulls are taken from mints of the `granted` path, as the planner
+        is run with. Storage slot costs are protocol constants and are kept from
+        `defaults`, steps of operations missing from the model as well.
+        """
+        costs = defaults._asdict()
+        if "approveForTransfer" in self.operations:
+            costs["approve"] = self["approveForTransfer"].per_unit
+        if "grantEstateTransfer" in self.operations:
+            costs["grant"] = self["grantEstateTransfer"].base
+        mint_operation = GRANTED_MINT if granted else "mintFromParcels"
+        if mint_operation in self.operations:
+            mint = self[mint_operation]
+            # Parcel transfer plus its `estatesToParcels` slot, array length slot
+            costs["pull"] = max(mint.per_unit - defaults.fresh_slot, 0)
+            costs["mint"] = max(
+                mint.base - defaults.transaction - defaults.fresh_slot, 0
+            )
+        if "burn" in self.operations:
+            burn = self["burn"]
+            costs["release"] = burn.per_unit
+            costs["burn"] = max(burn.base - defaults.transaction, 0)
+        return GasCosts(**costs)
+
+    def save(self, path: Union[str, Path]):
+        Path(path).write_text(
+            json.dumps({op: list(gas) for op, gas in sorted(self.operations.items())})
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "GasModel":
+        data = json.loads(Path(path).read_text())
+        return cls({op: OperationGas(*gas) for op, gas in data.items()})
+
+
+class Transaction(NamedTuple):
+    contract: str
+    method: str
+    args: tuple
+    gas: int
+
+
+def batch(
+    model: GasModel,
+    contract: str,
+    method: str,
+    items: Sequence,
+    gas_limit: int,
+    max_batch: Optional[int] = None,
+    args=lambda items: (items,),
+) -> list[Transaction]:
+    """Splits `method` over `items` into the fewest transactions under `gas_limit`.
+
+    Every transaction pays the base cost, so the fewest transactions use the
+    least gas. Items are spread evenly so that no transaction runs at the
+    limit. `args` builds call arguments of a batch, `max_batch` caps items per
+    call, 1 for methods taking a single item.
+    """
+    if not items:
+        return []
+    operation = model[method]
+    per_transaction = operation.max_units(gas_limit)
+    if max_batch is not None:
+        per_transaction = min(per_transaction, max_batch)
+    if per_transaction < 1:
+        raise ValueError(f"Single {method} does not fit under gas limit {gas_limit}")
+    count = max(math.ceil(len(items) / per_transaction), 1)
+    size, extra = divmod(len(items), count)
+    transactions, start = [], 0
+    for i in range(count):
+        chunk = list(items[start : start + size + (i < extra)])
+        start += len(chunk)
+        transactions.append(
+            Transaction(contract, method, args(chunk), operation.gas(len(chunk)))
+        )
+    return transactions
+
+
+def mint_transactions(
+    model: GasModel, token_ids: Sequence[int], receiver: str, gas_limit: int
+) -> list[Transaction]:
+    """Land `mint` takes a single token, one transaction per token."""
+    return batch(
+        model,
+        PLAN_LAND,
+        "mint",
+        token_ids,
+        gas_limit,
+        max_batch=1,
+        args=lambda chunk: (receiver, chunk[0]),
+    )
+
+
+def approval_transactions(
+    model: GasModel, token_ids: Sequence[int], operator: str, gas_limit: int
+) -> list[Transaction]:
+    return batch(
+        model,
+        PLAN_LAND,
+        "approveForTransfer",
+        token_ids,
+        gas_limit,
+        args=lambda chunk: (operator, chunk),
+    )
+
+
+def plan_transactions(
+    plan: Plan, model: GasModel, operator: str, gas_limit: int
+) -> list[Transaction]:
+    """Operations of an estate plan as transactions under `gas_limit`.
+
+    Per-parcel approvals of `operator`, the estate contract, are split as by
+    `approval_transactions`, other operations are sent as planned and must fit
+    on their own.
+    """
+    transactions = []
+    for operation in plan.operations:
+        if operation.method == "approveForTransfer":
+            (parcels,) = operation.args
+            transactions += approval_transactions(model, parcels, operator, gas_limit)
+            continue
+        if operation.gas > gas_limit:
+            raise ValueError(
+                f"{operation.method} needs {operation.gas} gas, over limit {gas_limit}"
+            )
+        transactions.append(Transaction(*operation))
+    return transactions
+
+
+def schedule(
+    transactions: Iterable[Union[Transaction, Operation]],
+    block_gas_limit: int = DEVELOPMENT_BLOCK_GAS_LIMIT,
+    target: float = BLOCK_GAS_TARGET,
+) -> list[list[Transaction]]:
+    """Packs transactions into blocks, keeping their order.
+
+    Transactions of one sender are mined in nonce order, so blocks take
+    consecutive runs of transactions and filling every block greedily gives
+    the fewest blocks.
+    """
+    gas_limit = int(block_gas_limit * target)
+    blocks: list[list[Transaction]] = []
+    block_gas = 0
+    for transaction in transactions:
+        if transaction.gas > gas_limit:
+            raise ValueError(
+                f"{transaction.method} needs {transaction.gas} gas, "
+                f"over block target {gas_limit}"
+            )
+        if not blocks or block_gas + transaction.gas > gas_limit:
+            blocks.append([])
+            block_gas = 0
+        blocks[-1].append(Transaction(*transaction))
+        block_gas += transaction.gas
+    return blocks
+
+
+def calibrate(
+    estate_contract,
+    land_contract,
+    minter,
+    owner,
+    sizes: Sequence[int] = CALIBRATION_SIZES,
+    origin: tuple[int, int] = (0, 0),
+) -> list[Sample]:
+    """Benchmarks Land and Estate operations on the connected chain.
+
+    Mints a fresh estate of every size starting at `origin` and going right,
+    merges its parcels once after approving them and once through an estate
+    transfer grant, burning the estate after each merge. `minter` must hold the
+    Land `MINTER_ROLE` and `estate_contract` be registered on Land.
+    """
+    samples = []
+    x, y = origin
+    for size in sizes:
+        parcels = estate_parcels((x, y), size)
+        x += size
+        for token_id in parcels:
+            tx = land_contract.mint(owner, token_id, {"from": minter})
+            samples.append(Sample("mint", 1, tx.gas_used))
+
+        tx = land_contract.approveForTransfer(estate_contract, parcels, {"from": owner})
+        samples.append(Sample("approveForTransfer", len(parcels), tx.gas_used))
+        samples += _merge(estate_contract, parcels, owner, "mintFromParcels")
+
+        # Burning returned the parcels, the grant path merges them again
+        tx = land_contract.grantEstateTransfer(chain.time() + 600, {"from": owner})
+        samples.append(Sample("grantEstateTransfer", 1, tx.gas_used))
+        samples += _merge(estate_contract, parcels, owner, GRANTED_MINT)
+    return samples
+
+
+def _merge(
+    estate_contract, parcels: list[int], owner, mint_operation: str
+) -> list[Sample]:
+    """Mints an estate from authorized `parcels` and burns it, consuming the
+    approvals or the grant."""
+    tx = estate_contract.mintFromParcels(parcels, {"from": owner})
+    estate_id = tx.events["EstateMinted"]["tokenId"]
+    mint = Sample(mint_operation, len(parcels), tx.gas_used)
+    tx = estate_contract.burn(estate_id, {"from": owner})
+    return [mint, Sample("burn", len(parcels), tx.gas_used)]
@@ -1,11 +1,9 @@
-from typing import Any, NewType, Optional
+from typing import Optional
 
 from brownie import Contract, MockProxyRegistry, config, network
 from eth_account import Account
 
-from .common import get_account, load_openzeppelin
-
-
+from .common import Project, get_account, load_openzeppelin
 
 
 def deploy_proxy_admin(
@@ -1,4 +1,14 @@
-from brownie import Contract, HighriseLand, HighriseLandFund, accounts, config, network
+from brownie import (
+    Contract,
+    HighriseLand,
+    HighriseLandFund,
+    HighriseLandFundFactory,
+    HighriseLandFundInitializable,
+    HighriseLandSplitFund,
+    accounts,
+    config,
+    network,
+)
 
 from .common import FORKED_LOCAL_ENVIRONMENTS, LOCAL_BLOCKCHAIN_ENVIRONMENTS
 
@@ -7,6 +17,7 @@ def deploy_land_fund(land_address: str):
     """Land fund must be deployed after `deploy_with_proxy` script is executed"""
     account = accounts.load("one")
     land_fund = HighriseLandFund.deploy(
+        account,
         land_address,
         {"from": account},
         publish_source=config["networks"][network.show_active()].get("verify"),
@@ -14,6 +25,51 @@ def deploy_land_fund(land_address: str):
     grant_roles(land_fund.address, land_address)
 
 
+def deploy_land_split_fund(land_address: str, payees: list[str], shares: list[int]):
+    """Fund variant splitting revenue between `payees`, each payee pulls its part
+    with `release` without disabling the sale"""
+    account = accounts.load("one")
+    land_fund = HighriseLandSplitFund.deploy(
+        account,
+        land_address,
+        payees,
+        shares,
+        {"from": account},
+        publish_source=config["networks"][network.show_active()].get("verify"),
+    )
+    grant_roles(land_fund.address, land_address)
+
+
+def deploy_land_fund_factory(land_address: str):
+    """Fund implementation and the factory cloning it per sale, the factory is made
+    admin of `MINTER_ROLE` on land so that it grants the role to every clone"""
+    account = accounts.load("one")
+    verify = config["networks"][network.show_active()].get("verify")
+    implementation = HighriseLandFundInitializable.deploy(
+        {"from": account}, publish_source=verify
+    )
+    factory = HighriseLandFundFactory.deploy(
+        implementation.address, land_address, {"from": account}, publish_source=verify
+    )
+    land_proxy = Contract.from_abi("HighriseLand", land_address, HighriseLand.abi)
+    land_proxy.grantRole(
+        land_proxy.getRoleAdmin(land_proxy.MINTER_ROLE()),
+        factory.address,
+        {"from": account},
+    ).wait(1)
+
+
+def create_land_fund(factory_address: str, enabled: bool = False) -> str:
+    """New sale fund, able to mint land, in a single transaction"""
+    account = accounts.load("one")
+    factory = Contract.from_abi(
+        "HighriseLandFundFactory", factory_address, HighriseLandFundFactory.abi
+    )
+    tx = factory.createFund(enabled, {"from": account})
+    tx.wait(1)
+    return tx.events["FundCreated"]["fund"]
+
+
 def grant_roles(fund_address: str, land_address: str):
     account = accounts.load("one")
     # Grant roles
@@ -41,6 +97,14 @@ def withdraw(fund_address: str):
     land_fund.withdraw({"from": account}).wait(1)
 
 
+def release(fund_address: str, payee: str):
+    account = accounts.load("one")
+    land_fund = Contract.from_abi(
+        "HighriseLandSplitFund", fund_address, HighriseLandSplitFund.abi
+    )
+    land_fund.release["address"](payee, {"from": account}).wait(1)
+
+
 def enable_fund(land_fund_address: str):
     if (
         network.show_active()
@@ -0,0 +1,330 @@
+import json
+import tarfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import BytesIO
+from itertools import islice
+from os import cpu_count
+from pathlib import Path
+from random import Random
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, Union
+
+from . import (
+    ESTATE_BASE_URI_TEMPLATE,
+    ESTATE_IMAGE_URI_TEMPLATE,
+    LAND_BASE_URI_TEMPLATE,
+    LAND_IMAGE_URI_TEMPLATE,
+)
+from .coordinates import (
+    estate_size,
+    estate_token_id,
+    map_token_ids,
+    token_id_to_coordinates,
+)
+
+LAND = "land"
+ESTATE = "estates"
+SHARDS = 256
+CHUNK_SIZE = 2000
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+LAND_DESCRIPTION = "A parcel of land in the Highrise world."
+ESTATE_DESCRIPTION = "An estate made of adjacent Highrise land parcels."
+
+# (kind, [(token_id, data)]) where data is estate ID for land and parcels for estates
+Task = tuple[str, list[tuple[int, Any]]]
+
+
+def land_document(
+    token_id: int, environment: str = "dev", estate_id: Optional[int] = None
+) -> dict:
+    x, y = token_id_to_coordinates(token_id)
+    attributes = [{"trait_type": "X", "value": x}, {"trait_type": "Y", "value": y}]
+    if estate_id is not None:
+        attributes.append({"trait_type": "Estate", "value": estate_id})
+    return {
+        "name": f"Highrise Land ({x}, {y})",
+        "description": LAND_DESCRIPTION,
+        "image": LAND_IMAGE_URI_TEMPLATE.format(
+            environment=environment, token_id=token_id
+        ),
+        "attributes": attributes,
+    }
+
+
+def estate_document(
+    token_id: int, parcel_ids: Sequence[int], environment: str = "dev"
+) -> dict:
+    size = estate_size(list(parcel_ids))
+    x, y = token_id_to_coordinates(token_id)
+    return {
+        "name": f"Highrise Estate {size}x{size} ({x}, {y})",
+        "description": ESTATE_DESCRIPTION,
+        "image": ESTATE_IMAGE_URI_TEMPLATE.format(
+            environment=environment, token_id=token_id
+        ),
+        "attributes": [
+            {"trait_type": "Size", "value": f"{size}x{size}"},
+            {"trait_type": "X", "value": x},
+            {"trait_type": "Y", "value": y},
+        ],
+        "parcels": list(parcel_ids),
+    }
+
+
+def encode(document: dict) -> bytes:
+    return json.dumps(document, separators=(",", ":")).encode()
+
+
+def document_path(kind: str, token_id: int) -> str:
+    """Relative path of a document, `<kind>/<shard>/<token id>`"""
+    return f"{kind}/{token_id % SHARDS:02x}/{token_id}"
+
+
+def render(kind: str, token_id: int, data: Any, environment: str = "dev") -> bytes:
+    if kind == LAND:
+        return encode(land_document(token_id, environment, data))
+    return encode(estate_document(token_id, data, environment))
+
+
+def estates_from_events(
+    minted_events: Iterable[Mapping], transfer_events: Iterable[Mapping] = ()
+) -> dict[int, list[int]]:
+    """Live estates from `EstateMinted` events, minus the ones burned since.
+
+    Events only need item access, e.g. brownie `tx.events` items or log `args`.
+    """
+    estates = {
+        int(event["tokenId"]): [int(p) for p in event["parcelIds"]]
+        for event in minted_events
+    }
+    for event in transfer_events:
+        if event["to"] == ZERO_ADDRESS:
+            estates.pop(int(event["tokenId"]), None)
+    return estates
+
+
+def log_position(log) -> tuple[int, int, int]:
+    return log.blockNumber, log.transactionIndex, log.logIndex
+
+
+def fetch_estates(
+    estate_contract, from_block: int = 0, to_block: Optional[int] = None
+) -> dict[int, list[int]]:
+    """Reads estates of a deployed `HighriseEstate` from its logs.
+
+    A burned and re-minted estate is handled by replaying logs in order.
+    """
+    logs = estate_contract.events.get_sequence(from_block, to_block)
+    ordered = sorted(
+        [*logs.get("EstateMinted", []), *logs.get("Transfer", [])], key=log_position
+    )
+    estates: dict[int, list[int]] = {}
+    for log in ordered:
+        if log.event == "EstateMinted":
+            estates.update(estates_from_events([log.args]))
+        elif log.args["to"] == ZERO_ADDRESS:
+            estates.pop(int(log.args["tokenId"]), None)
+    return estates
+
+
+def parcels_to_estates(estates: Mapping[int, Sequence[int]]) -> dict[int, int]:
+    return {
+        parcel_id: estate_id
+        for estate_id, parcel_ids in estates.items()
+        for parcel_id in parcel_ids
+    }
+
+
+def tasks(
+    estates: Mapping[int, Sequence[int]],
+    land_token_ids: Optional[Iterable[int]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Task]:
+    """Lazily splits the whole map and all `estates` into rendering tasks."""
+    parcel_estates = parcels_to_estates(estates)
+    if land_token_ids is None:
+        land_token_ids = map_token_ids()
+    land_token_ids = iter(land_token_ids)
+    while chunk := list(islice(land_token_ids, chunk_size)):
+        yield LAND, [(t, parcel_estates.get(t)) for t in chunk]
+    estate_items = iter(estates.items())
+    while chunk := list(islice(estate_items, chunk_size)):
+        yield ESTATE, chunk
+
+
+def _render_task(task: Task, environment: str) -> list[tuple[str, bytes]]:
+    kind, items = task
+    return [
+        (document_path(kind, token_id), render(kind, token_id, data, environment))
+        for token_id, data in items
+    ]
+
+
+def _write_task(task: Task, environment: str, out: str) -> int:
+    documents = _render_task(task, environment)
+    for path, payload in documents:
+        target = Path(out) / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(payload)
+    return len(documents)
+
+
+def is_tarball(out: Union[str, Path]) -> bool:
+    return str(out).endswith((".tar", ".tar.gz", ".tgz"))
+
+
+def _add_to_tarball(tar: tarfile.TarFile, path: str, payload: bytes):
+    info = tarfile.TarInfo(path)
+    info.size = len(payload)
+    tar.addfile(info, BytesIO(payload))
+
+
+def publish(
+    out: Union[str, Path],
+    estates: Mapping[int, Sequence[int]],
+    environment: str = "dev",
+    land_token_ids: Optional[Iterable[int]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """Renders land and estate metadata into a sharded directory or a tarball.
+
+    Tasks are rendered by a process pool with at most `2 * workers` tasks in
+    flight, so memory stays bounded regardless of map size.
+    Returns number of documents written.
+    """
+    workers = workers or cpu_count() or 1
+    pending_tasks = tasks(estates, land_token_ids, chunk_size)
+    tar = None
+    if is_tarball(out):
+        tar = tarfile.open(out, "w:gz" if str(out).endswith("gz") else "w")
+    written = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+
+            def submit(task: Task):
+                if tar:
+                    return executor.submit(_render_task, task, environment)
+                return executor.submit(_write_task, task, environment, str(out))
+
+            in_flight = {submit(t) for t in islice(pending_tasks, 2 * workers)}
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if tar:
+                        for path, payload in future.result():
+                            _add_to_tarball(tar, path, payload)
+                            written += 1
+                    else:
+                        written += future.result()
+                    in_flight |= {submit(t) for t in islice(pending_tasks, 1)}
+    finally:
+        if tar:
+            tar.close()
+    return written
+
+
+class MetadataReader:
+    """Reads published documents back from a directory or a tarball."""
+
+    def __init__(self, out: Union[str, Path]):
+        self._out = Path(out)
+        self._tar = tarfile.open(out) if is_tarball(out) else None
+
+    def __enter__(self) -> "MetadataReader":
+        return self
+
+    def __exit__(self, *exc):
+        if self._tar:
+            self._tar.close()
+
+    def read(self, kind: str, token_id: int) -> Optional[bytes]:
+        path = document_path(kind, token_id)
+        if self._tar:
+            try:
+                return self._tar.extractfile(path).read()
+            except KeyError:
+                return None
+        target = self._out / path
+        return target.read_bytes() if target.exists() else None
+
+    def document(self, kind: str, token_id: int) -> Optional[dict]:
+        payload = self.read(kind, token_id)
+        return None if payload is None else json.loads(payload)
+
+
+def _sample_token_ids(
+    contract,
+    sample_size: int,
+    rng: Random,
+    token_ids: Optional[Iterable[int]] = None,
+) -> list[int]:
+    if token_ids is not None:
+        token_ids = sorted(token_ids)
+        return rng.sample(token_ids, min(sample_size, len(token_ids)))
+    total = contract.totalSupply()
+    indices = rng.sample(range(total), min(sample_size, total))
+    return [int(contract.tokenByIndex(i)) for i in indices]
+
+
+def validate(
+    out: Union[str, Path],
+    land_contract,
+    estate_contract=None,
+    environment: str = "dev",
+    sample_size: int = 100,
+    seed: Optional[int] = None,
+    land_base_uri: Optional[str] = None,
+    estate_base_uri: Optional[str] = None,
+    land_token_ids: Optional[Iterable[int]] = None,
+    estate_token_ids: Optional[Iterable[int]] = None,
+) -> list[str]:
+    """Checks published documents against on-chain `tokenURI` of sampled tokens.
+
+    Every sampled token must resolve to `<base uri><token id>` on-chain and the
+    published document must describe the same parcel (or estate parcels).
+    Base URIs default to the `environment` CDN templates. Tokens are sampled
+    from `land_token_ids` / `estate_token_ids` when given, e.g. from an
+    `OwnershipIndex` for implementations without token enumeration.
+    Returns a list of errors, empty if everything matches.
+    """
+    rng = Random(seed)
+    errors = []
+    with MetadataReader(out) as reader:
+        land_uri = land_base_uri or LAND_BASE_URI_TEMPLATE.format(
+            environment=environment
+        )
+        for token_id in _sample_token_ids(
+            land_contract, sample_size, rng, land_token_ids
+        ):
+            if (uri := land_contract.tokenURI(token_id)) != f"{land_uri}{token_id}":
+                errors.append(f"Land {token_id}: unexpected tokenURI {uri}")
+            document = reader.document(LAND, token_id)
+            if document is None:
+                errors.append(f"Land {token_id}: document missing")
+                continue
+            coords = [a["value"] for a in document["attributes"][:2]]
+            if coords != list(token_id_to_coordinates(token_id)):
+                errors.append(f"Land {token_id}: wrong coordinates {coords}")
+        if estate_contract is None:
+            return errors
+        estate_uri = estate_base_uri or ESTATE_BASE_URI_TEMPLATE.format(
+            environment=environment
+        )
+        for token_id in _sample_token_ids(
+            estate_contract, sample_size, rng, estate_token_ids
+        ):
+            if (uri := estate_contract.tokenURI(token_id)) != f"{estate_uri}{token_id}":
+                errors.append(f"Estate {token_id}: unexpected tokenURI {uri}")
+            document = reader.document(ESTATE, token_id)
+            if document is None:
+                errors.append(f"Estate {token_id}: document missing")
+                continue
+            parcels = document["parcels"]
+            on_chain = [
+                int(estate_contract.estatesToParcels(token_id, i))
+                for i in range(len(parcels))
+            ]
+            if parcels != on_chain or estate_token_id(parcels) != token_id:
+                errors.append(f"Estate {token_id}: parcels do not match")
+    return errors
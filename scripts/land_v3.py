@@ -0,0 +1,64 @@
+from typing import Optional
+
+from brownie import Contract, HighriseLandV3, chain
+from eth_account import Account
+
+from .common import get_account, upgrade
+from .helpers import Project, load_openzeppelin
+
+# Seconds an estate transfer grant stays valid
+ESTATE_TRANSFER_GRANT_TTL = 600
+
+
+def deploy_land_v3_implementation(account: Optional[Account] = None) -> Contract:
+    if not account:
+        account = get_account()
+    land = HighriseLandV3.deploy(
+        {"from": account},
+    )
+    return land
+
+
+def verify_land_v3(land_v3_address: str):
+    contract = HighriseLandV3.at(land_v3_address)
+    HighriseLandV3.publish_source(contract)
+
+
+def upgrade_proxy(
+    land_v3_impl_address: str,
+    land_proxy_address: str,
+    proxy_admin_address: str,
+    account: Optional[Account] = None,
+    oz: Optional[Project] = None,
+):
+    if not account:
+        account = get_account()
+    if not oz:
+        oz = load_openzeppelin()
+    proxy = oz.TransparentUpgradeableProxy.at(land_proxy_address)
+    proxy_admin = oz.ProxyAdmin.at(proxy_admin_address)
+    upgrade_transaction = upgrade(
+        account, proxy, land_v3_impl_address, proxy_admin_contract=proxy_admin
+    )
+    upgrade_transaction.wait(1)
+
+
+def set_estate_contract(
+    land_proxy_address: str, estate_address: str, account: Optional[Account] = None
+):
+    if not account:
+        account = get_account()
+    land = Contract.from_abi("HighriseLandV3", land_proxy_address, HighriseLandV3.abi)
+    land.setEstateContract(estate_address, {"from": account}).wait(1)
+
+
+def grant_estate_transfer(
+    land_proxy_address: str,
+    ttl: int = ESTATE_TRANSFER_GRANT_TTL,
+    account: Optional[Account] = None,
+):
+    """Replaces `approveForTransfer` of all parcels with a single one-shot grant."""
+    if not account:
+        account = get_account()
+    land = Contract.from_abi("HighriseLandV3", land_proxy_address, HighriseLandV3.abi)
+    land.grantEstateTransfer(chain.time() + ttl, {"from": account}).wait(1)
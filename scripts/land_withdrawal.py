@@ -6,17 +6,50 @@ from brownie import (
     config,
     network,
 )
+from eth_abi import encode_abi
 
-from .common import FORKED_LOCAL_ENVIRONMENTS, LOCAL_BLOCKCHAIN_ENVIRONMENTS
+from .common import (
+    FORKED_LOCAL_ENVIRONMENTS,
+    LOCAL_BLOCKCHAIN_ENVIRONMENTS,
+    sign_payload,
+)
 
 ACCOUNT_NAME = "one"
 ADMIN_ACCOUNT = "dev-account"
+# Parcels per `withdrawBatch` call, keeps mints of the V1 land well under
+# the block gas limit
+WITHDRAWAL_BATCH_SIZE = 50
+
+
+def generate_withdrawal_request(
+    token_id: int, wallet: str, key: str
+) -> tuple[bytes, bytes]:
+    """Payload and signature of `withdraw`, a list of them goes to `withdrawMany`"""
+    payload = encode_abi(["uint256", "address"], [token_id, wallet])
+    return payload, sign_payload(payload, key)
+
+
+def generate_batch_withdrawal_requests(
+    token_ids: list[int],
+    wallet: str,
+    key: str,
+    batch_size: int = WITHDRAWAL_BATCH_SIZE,
+) -> list[tuple[bytes, bytes]]:
+    """Payloads and signatures of `withdrawBatch`, one per `batch_size` tokens"""
+    requests = []
+    for i in range(0, len(token_ids), batch_size):
+        payload = encode_abi(
+            ["address", "uint256[]"], [wallet, token_ids[i : i + batch_size]]
+        )
+        requests.append((payload, sign_payload(payload, key)))
+    return requests
 
 
 def deploy_land_withdrawal(land_address: str):
     """Land withdrawal must be deployed after land contract is deployed"""
     account = accounts.load(ACCOUNT_NAME)
     withdrawal_contract = HighriseLandWithdrawal.deploy(
+        account,
         land_address,
         {"from": account},
         publish_source=config["networks"][network.show_active()].get("verify"),
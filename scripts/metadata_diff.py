@@ -0,0 +1,154 @@
+import json
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+from .coordinates import estate_parcels, token_id_to_coordinates
+from .land_metadata import (
+    ESTATE,
+    LAND,
+    ZERO_ADDRESS,
+    document_path,
+    log_position,
+    render,
+)
+
+MANIFEST = ".manifest.json"
+# Marks a document which has to be removed, i.e. a burned estate
+DELETED = object()
+
+Changes = dict[tuple[str, int], Any]
+
+
+class RepublishResult(NamedTuple):
+    written: list[str]
+    skipped: list[str]
+    deleted: list[str]
+
+
+def content_hash(payload: bytes) -> str:
+    return sha256(payload).hexdigest()
+
+
+def estate_parcels_on_chain(
+    estate_contract, token_id: int, block_identifier: Optional[int] = None
+) -> list[int]:
+    """Parcels of an estate from a single `estatesToParcels` read at
+    `block_identifier`.
+
+    Estates are squares and the estate ID is the first parcel of the last row,
+    so the first parcel alone gives the full geometry. `burn` keeps
+    `estatesToParcels`, this works for burned estates as well.
+    """
+    # Latest state unless a block is given
+    kwargs = {} if block_identifier is None else {"block_identifier": block_identifier}
+    first = int(estate_contract.estatesToParcels(token_id, 0, **kwargs))
+    x, y = token_id_to_coordinates(first)
+    _, top = token_id_to_coordinates(token_id)
+    return estate_parcels((x, y), top - y + 1)
+
+
+def changes(
+    estate_contract, from_block: int, to_block: Optional[int] = None
+) -> Changes:
+    """Documents affected by estate activity in `[from_block, to_block]`.
+
+    Returns `(kind, token id)` mapped to the data `render` needs: parcels of a
+    minted estate, estate ID (or `None`) of a parcel, `DELETED` for burned
+    estates. Later logs override earlier ones, reshaped estates are covered by
+    their burns, `EstateMinted` logs and parcels returned by `EstateReshaped`.
+    """
+    logs = estate_contract.events.get_sequence(from_block, to_block)
+    ordered = sorted(
+        [
+            *logs.get("EstateMinted", []),
+            *logs.get("Transfer", []),
+            *logs.get("EstateReshaped", []),
+        ],
+        key=log_position,
+    )
+    minted: dict[int, list[int]] = {}
+    changed: Changes = {}
+    for log in ordered:
+        if log.event == "EstateReshaped":
+            for parcel_id in log.args["returnedParcelIds"]:
+                changed[(LAND, int(parcel_id))] = None
+            continue
+        token_id = int(log.args["tokenId"])
+        if log.event == "EstateMinted":
+            parcels = minted[token_id] = [int(p) for p in log.args["parcelIds"]]
+            changed[(ESTATE, token_id)] = parcels
+            for parcel_id in parcels:
+                changed[(LAND, parcel_id)] = token_id
+        elif log.args["to"] == ZERO_ADDRESS:
+            # Estate IDs can be minted again after a burn, with another size,
+            # parcels are read as they were right before the burn
+            parcels = minted.pop(token_id, None) or estate_parcels_on_chain(
+                estate_contract, token_id, log.blockNumber - 1
+            )
+            changed[(ESTATE, token_id)] = DELETED
+            for parcel_id in parcels:
+                changed[(LAND, parcel_id)] = None
+    return changed
+
+
+def load_manifest(out: Union[str, Path]) -> dict[str, str]:
+    manifest_path = Path(out) / MANIFEST
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text())
+
+
+def save_manifest(out: Union[str, Path], manifest: dict[str, str]):
+    (Path(out) / MANIFEST).write_text(json.dumps(manifest, sort_keys=True))
+
+
+def build_manifest(out: Union[str, Path]) -> dict[str, str]:
+    """Hashes every document of a directory written by `publish`."""
+    out = Path(out)
+    manifest = {
+        path.relative_to(out).as_posix(): content_hash(path.read_bytes())
+        for kind in (LAND, ESTATE)
+        for path in (out / kind).glob("*/*")
+    }
+    save_manifest(out, manifest)
+    return manifest
+
+
+def apply(
+    out: Union[str, Path], changed: Changes, environment: str = "dev"
+) -> RepublishResult:
+    """Writes changed documents, skipping the ones whose content hash matches."""
+    out = Path(out)
+    manifest = load_manifest(out)
+    result = RepublishResult([], [], [])
+    for (kind, token_id), data in sorted(changed.items()):
+        path = document_path(kind, token_id)
+        target = out / path
+        if data is DELETED:
+            target.unlink(missing_ok=True)
+            if manifest.pop(path, None) is not None:
+                result.deleted.append(path)
+            continue
+        payload = render(kind, token_id, data, environment)
+        digest = content_hash(payload)
+        if manifest.get(path) == digest and target.exists():
+            result.skipped.append(path)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(payload)
+        manifest[path] = digest
+        result.written.append(path)
+    save_manifest(out, manifest)
+    return result
+
+
+def republish(
+    out: Union[str, Path],
+    estate_contract,
+    from_block: int,
+    to_block: Optional[int] = None,
+    environment: str = "dev",
+) -> RepublishResult:
+    """Re-renders only documents touched by estates minted or burned in range."""
+    return apply(out, changes(estate_contract, from_block, to_block), environment)
@@ -0,0 +1,267 @@
+import gzip
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+from itertools import islice
+from os import cpu_count
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple, Optional, Union
+
+from .creature_store import CREATURE_METADATA_DIR
+from .land_metadata import ESTATE, LAND
+
+MANIFEST = "manifest.json"
+OBJECTS = "objects.json"
+# Hex digits of sha256 used as object address, collisions are checked on pack
+ADDRESS_LENGTH = 16
+# Strings shorter than this are never worth a reference
+MIN_SHARED_STRING = 32
+REF = "$"
+# Serialization styles a document can be rebuilt with, anything else is raw
+STYLES = {"default": (", ", ": "), "compact": (",", ":")}
+# Directories the CDN serves `tokenURI`s from, see `scripts/__init__.py`
+CDN_DIRECTORIES = {LAND: "metadata", ESTATE: "estates-metadata"}
+EXPORT_CHUNK_SIZE = 500
+
+
+class PackReport(NamedTuple):
+    files: int
+    objects: int
+    raw_bytes: int
+    packed_bytes: int
+    raw_transfer_bytes: int
+    packed_transfer_bytes: int
+
+    @property
+    def storage_savings(self) -> float:
+        return 1 - self.packed_bytes / self.raw_bytes
+
+    @property
+    def transfer_savings(self) -> float:
+        return 1 - self.packed_transfer_bytes / self.raw_transfer_bytes
+
+
+def compress(payload: bytes) -> bytes:
+    # `mtime=0` keeps compressed output reproducible
+    return gzip.compress(payload, mtime=0)
+
+
+def _canonical(node: Any) -> str:
+    return json.dumps(node, separators=(",", ":"))
+
+
+def _is_ref(node: Any) -> bool:
+    return isinstance(node, dict) and list(node) == [REF]
+
+
+def _children(node: Any) -> list:
+    if isinstance(node, dict):
+        return list(node.values())
+    if isinstance(node, list):
+        return node
+    return []
+
+
+def _has_ref_marker(node: Any) -> bool:
+    return _is_ref(node) or any(_has_ref_marker(c) for c in _children(node))
+
+
+def _is_candidate(node: Any) -> bool:
+    return isinstance(node, (dict, list)) or (
+        isinstance(node, str) and len(node) >= MIN_SHARED_STRING
+    )
+
+
+def _count(node: Any, counts: Counter):
+    for child in _children(node):
+        _count(child, counts)
+        if _is_candidate(child):
+            counts[_canonical(child)] += 1
+
+
+class _Encoder:
+    def __init__(self, counts: Counter):
+        self.counts = counts
+        self.objects: dict[str, str] = {}
+        self._ref_size = len(_canonical({REF: "0" * ADDRESS_LENGTH}))
+
+    def _is_shared(self, node: Any) -> bool:
+        if not _is_candidate(node):
+            return False
+        text = _canonical(node)
+        return self.counts[text] > 1 and len(text) > self._ref_size
+
+    def encode(self, node: Any, root: bool = False) -> Any:
+        if isinstance(node, dict):
+            encoded = {k: self.encode(v) for k, v in node.items()}
+        elif isinstance(node, list):
+            encoded = [self.encode(v) for v in node]
+        else:
+            encoded = node
+        if root or not self._is_shared(node):
+            return encoded
+        text = _canonical(encoded)
+        address = sha256(text.encode()).hexdigest()[:ADDRESS_LENGTH]
+        if self.objects.setdefault(address, text) != text:
+            raise ValueError(f"Object address collision on {address}")
+        return {REF: address}
+
+
+def _read_sources(src_dir: Path) -> Iterator[tuple[str, bytes]]:
+    for path in sorted(src_dir.rglob("*")):
+        relative = path.relative_to(src_dir).as_posix()
+        if path.is_file() and not any(p.startswith(".") for p in relative.split("/")):
+            yield relative, path.read_bytes()
+
+
+def _style(document: Any, raw: bytes) -> Optional[str]:
+    for style, separators in STYLES.items():
+        if json.dumps(document, separators=separators).encode() == raw:
+            return style
+    return None
+
+
+def pack(src_dir: Union[str, Path], pack_dir: Union[str, Path]) -> PackReport:
+    """Deduplicates JSON documents of `src_dir` into a manifest and an object table.
+
+    Every JSON object, array or long string which occurs more than once and is
+    longer than a reference is stored once in `objects.json`, addressed by its
+    content hash. `manifest.json` maps every file path to `[style, document]`
+    with shared parts of the document replaced by `{"$": <address>}`. Files
+    which do not serialize back byte-for-byte are kept verbatim.
+    """
+    src_dir, pack_dir = Path(src_dir), Path(pack_dir)
+    sources = []
+    counts: Counter = Counter()
+    raw_bytes = raw_transfer_bytes = 0
+    for path, raw in _read_sources(src_dir):
+        raw_bytes += len(raw)
+        raw_transfer_bytes += len(compress(raw))
+        try:
+            document = json.loads(raw)
+        except ValueError:
+            document = None
+        style = None
+        if document is not None and not _has_ref_marker(document):
+            style = _style(document, raw)
+        if style:
+            _count(document, counts)
+            sources.append((path, style, document))
+        else:
+            sources.append((path, "raw", raw.decode("latin-1")))
+
+    encoder = _Encoder(counts)
+    manifest = {}
+    for path, style, document in sources:
+        if style != "raw":
+            document = encoder.encode(document, root=True)
+        manifest[path] = [style, document]
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    packed_bytes = packed_transfer_bytes = 0
+    for name, content in [(MANIFEST, manifest), (OBJECTS, encoder.objects)]:
+        payload = _canonical(content).encode()
+        (pack_dir / name).write_bytes(payload)
+        packed_bytes += len(payload)
+        packed_transfer_bytes += len(compress(payload))
+    return PackReport(
+        files=len(manifest),
+        objects=len(encoder.objects),
+        raw_bytes=raw_bytes,
+        packed_bytes=packed_bytes,
+        raw_transfer_bytes=raw_transfer_bytes,
+        packed_transfer_bytes=packed_transfer_bytes,
+    )
+
+
+class Pack:
+    """Reads documents back from a directory written by `pack`."""
+
+    def __init__(self, pack_dir: Union[str, Path]):
+        pack_dir = Path(pack_dir)
+        self.manifest: dict[str, list] = json.loads((pack_dir / MANIFEST).read_bytes())
+        self.objects: dict[str, str] = json.loads((pack_dir / OBJECTS).read_bytes())
+        self._decoded: dict[str, Any] = {}
+
+    def paths(self) -> list[str]:
+        return list(self.manifest)
+
+    def _decode(self, node: Any) -> Any:
+        if _is_ref(node):
+            address = node[REF]
+            if address not in self._decoded:
+                self._decoded[address] = self._decode(json.loads(self.objects[address]))
+            return self._decoded[address]
+        if isinstance(node, dict):
+            return {k: self._decode(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [self._decode(v) for v in node]
+        return node
+
+    def read(self, path: str) -> bytes:
+        style, document = self.manifest[path]
+        if style == "raw":
+            return document.encode("latin-1")
+        document = self._decode(document)
+        return json.dumps(document, separators=STYLES[style]).encode()
+
+
+def cdn_path(path: str) -> str:
+    """Drops shard directories of `land_metadata.publish` output, i.e.
+    `land/<shard>/<token id>` is served from `metadata/<token id>`.
+    """
+    parts = path.split("/")
+    if len(parts) == 3 and parts[0] in CDN_DIRECTORIES:
+        return f"{CDN_DIRECTORIES[parts[0]]}/{parts[2]}"
+    return path
+
+
+_worker_pack: Optional[Pack] = None
+
+
+def _load_worker_pack(pack_dir: str):
+    global _worker_pack
+    _worker_pack = Pack(pack_dir)
+
+
+def _export_chunk(paths: list[str], out: str, gzipped: bool) -> int:
+    for path in paths:
+        payload = _worker_pack.read(path)
+        target = Path(out) / cdn_path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(payload)
+        if gzipped:
+            target.with_name(f"{target.name}.gz").write_bytes(compress(payload))
+    return len(paths)
+
+
+def export(
+    pack_dir: Union[str, Path],
+    out: Union[str, Path],
+    gzipped: bool = True,
+    workers: Optional[int] = None,
+) -> int:
+    """Writes every packed document to the plain per-token layout of the CDN.
+
+    With `gzipped` a precompressed `<name>.gz` is written next to every file.
+    Documents are rebuilt and compressed by a process pool.
+    Returns number of documents exported.
+    """
+    paths = iter(Pack(pack_dir).paths())
+    chunks = iter(lambda: list(islice(paths, EXPORT_CHUNK_SIZE)), [])
+    with ProcessPoolExecutor(
+        max_workers=workers or cpu_count() or 1,
+        initializer=_load_worker_pack,
+        initargs=(str(pack_dir),),
+    ) as executor:
+        futures = [
+            executor.submit(_export_chunk, chunk, str(out), gzipped) for chunk in chunks
+        ]
+        return sum(future.result() for future in futures)
+
+
+def main():
+    report = pack(CREATURE_METADATA_DIR, Path("build") / "creature-pack")
+    print(f"Packed {report.files} files into {report.objects} shared objects")
+    print(f"Storage: {report.raw_bytes} -> {report.packed_bytes} bytes")
+    print(f"Transfer: {report.raw_transfer_bytes} -> {report.packed_transfer_bytes}")
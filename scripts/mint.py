@@ -1,27 +1,23 @@
 from brownie import HighriseLandFund, network
 from eth_abi import encode_abi
-from eth_account._utils.signing import sign_message_hash
-from eth_hash.auto import keccak
-from eth_keys import keys
 
 from .common import (
     FORKED_LOCAL_ENVIRONMENTS,
     LOCAL_BLOCKCHAIN_ENVIRONMENTS,
     get_account,
+    sign_payload,
 )
 
 TOKEN_ID = 2013288447
 
 
 def generate_fund_request(
-    token_id: int, expiry: int, cost: int, key: str
+    token_id: int, expiry: int, cost: int, key: str, wallet: str
 ) -> tuple[bytes, bytes]:
-    payload = encode_abi(["uint256", "uint256", "uint256"], [token_id, expiry, cost])
-    hash = keccak(payload)
-    _, _, _, signature = sign_message_hash(
-        keys.PrivateKey(bytes.fromhex(key[2:])), hash
+    payload = encode_abi(
+        ["uint256", "uint256", "uint256", "address"], [token_id, expiry, cost, wallet]
     )
-    return payload, signature
+    return payload, sign_payload(payload, key)
 
 
 def mint():
@@ -34,7 +30,11 @@ def mint():
     land_fund = HighriseLandFund[-1]
     account = get_account()
     payload, sig = generate_fund_request(
-        TOKEN_ID, 10000000000000000, 2000000000000000, account.private_key
+        TOKEN_ID,
+        10000000000000000,
+        2000000000000000,
+        account.private_key,
+        account.address,
     )
     land_fund.fund(payload, sig, {"from": account, "value": 2000000000000000}).wait(1)
 
@@ -0,0 +1,88 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from brownie import chain
+
+from .land_metadata import ZERO_ADDRESS, log_position
+
+BLOCK_CHUNK_SIZE = 5000
+
+
+class OwnershipIndex:
+    """Token ownership rebuilt from ERC721 `Transfer` logs.
+
+    Serves the owner queries of implementations without token enumeration
+    (`ownerTokens`, `totalSupply`). `block` is the last indexed block.
+    """
+
+    def __init__(self, owners: Optional[dict[int, str]] = None, block: int = -1):
+        self.owners: dict[int, str] = {}
+        self._tokens: dict[str, set[int]] = defaultdict(set)
+        self.block = block
+        for token_id, owner in (owners or {}).items():
+            self._set_owner(token_id, owner)
+
+    def _set_owner(self, token_id: int, owner: str):
+        if (previous := self.owners.pop(token_id, None)) is not None:
+            self._tokens[previous].discard(token_id)
+        if owner != ZERO_ADDRESS:
+            self.owners[token_id] = owner
+            self._tokens[owner].add(token_id)
+
+    def apply(self, transfers: Iterable[dict]):
+        """Applies `Transfer` event arguments in chain order."""
+        for transfer in transfers:
+            self._set_owner(int(transfer["tokenId"]), transfer["to"])
+
+    def owner_of(self, token_id: int) -> Optional[str]:
+        return self.owners.get(token_id)
+
+    def owner_tokens(self, owner: str) -> list[int]:
+        return sorted(self._tokens.get(owner, ()))
+
+    def total_supply(self) -> int:
+        return len(self.owners)
+
+    def sync(
+        self,
+        contract,
+        to_block: Optional[int] = None,
+        chunk_size: int = BLOCK_CHUNK_SIZE,
+    ) -> int:
+        """Indexes `Transfer` logs of `contract` up to `to_block` in block chunks.
+
+        Returns number of transfers applied.
+        """
+        to_block = chain.height if to_block is None else to_block
+        applied = 0
+        while self.block < to_block:
+            from_block = self.block + 1
+            chunk_end = min(from_block + chunk_size - 1, to_block)
+            logs = contract.events.get_sequence(
+                from_block, chunk_end, event_type="Transfer"
+            )
+            self.apply(log.args for log in sorted(logs, key=log_position))
+            applied += len(logs)
+            self.block = chunk_end
+        return applied
+
+    def save(self, path: Union[str, Path]):
+        Path(path).write_text(
+            json.dumps(
+                {
+                    "block": self.block,
+                    "owners": {str(t): o for t, o in self.owners.items()},
+                }
+            )
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "OwnershipIndex":
+        """Loads a checkpoint written by `save`, empty index if there is none."""
+        if not Path(path).exists():
+            return cls()
+        data = json.loads(Path(path).read_text())
+        owners = {int(t): o for t, o in data["owners"].items()}
+        return cls(owners, data["block"])
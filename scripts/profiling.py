@@ -0,0 +1,322 @@
+import atexit
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, Optional, Union
+
+from brownie import web3
+from brownie.network import history
+from hexbytes import HexBytes
+
+# Profiling is off unless `PROFILE_TRACE` names the file the trace is written to
+PROFILE_TRACE = "PROFILE_TRACE"
+SEND_METHODS = {"eth_sendTransaction", "eth_sendRawTransaction"}
+RECEIPT_METHOD = "eth_getTransactionReceipt"
+
+
+class TransactionProfile(NamedTuple):
+    # Profiled frames the transaction was sent in, outermost first
+    stack: tuple[str, ...]
+    label: str
+    txid: str
+    # Seconds from sending the transaction to its receipt
+    wall_time: float
+    # Seconds from the node accepting the transaction to its receipt
+    confirmation_wait: float
+    gas_used: int
+    calldata_size: int
+
+
+class SummaryRow(NamedTuple):
+    label: str
+    count: int
+    wall_time: float
+    confirmation_wait: float
+    gas_used: int
+    calldata_size: int
+
+
+class _Frame:
+    def __init__(self, stack: tuple[str, ...]):
+        self.stack = stack
+        self.start = time.perf_counter()
+        # Seconds accounted to nested frames, transactions and RPC calls
+        self.children = 0.0
+        self.transactions: list[dict] = []
+
+
+def _txid(value) -> str:
+    return "0x" + bytes(HexBytes(value)).hex()
+
+
+def _label(receipt) -> str:
+    if receipt.contract_name and receipt.fn_name:
+        return f"{receipt.contract_name}.{receipt.fn_name}"
+    return receipt.fn_name or "transfer"
+
+
+def _frame_name(name: str) -> str:
+    """Frame names of folded stacks cannot contain separators."""
+    return name.replace(";", ":").replace("\n", " ")
+
+
+class Profiler:
+    """Wall time of profiled frames split into transactions, RPC calls and
+    the rest, with gas and calldata size of every transaction.
+
+    RPC calls are timed by a web3 middleware installed on the first frame.
+    Calls made while a transaction of the same thread awaits its receipt count
+    towards the transaction. Transactions are matched with their brownie
+    receipts when the frame that sent them exits.
+    """
+
+    def __init__(self, trace_path: Optional[Union[str, Path]] = None):
+        self.trace_path = Path(trace_path) if trace_path else None
+        self.transactions: list[TransactionProfile] = []
+        # Self seconds per folded stack
+        self.samples: dict[tuple[str, ...], float] = defaultdict(float)
+        self._pending: dict[str, dict] = {}
+        self._unresolved: list[dict] = []
+        # Transactions awaiting their receipt per sending thread
+        self._sending: dict[int, int] = defaultdict(int)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._installed = False
+        self._finished = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.trace_path is not None
+
+    @property
+    def _stack(self) -> list[_Frame]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _current(self) -> tuple[Optional[_Frame], tuple[str, ...]]:
+        stack = self._stack
+        return (stack[-1], stack[-1].stack) if stack else (None, ())
+
+    @property
+    def _middleware_name(self) -> str:
+        return f"highrise_profiler_{id(self)}"
+
+    def _install(self):
+        if not self._installed and web3.isConnected():
+            web3.middleware_onion.add(self._middleware, name=self._middleware_name)
+            self._installed = True
+
+    def _uninstall(self):
+        if self._installed:
+            web3.middleware_onion.remove(self._middleware_name)
+            self._installed = False
+
+    def _middleware(self, make_request: Callable, _web3) -> Callable:
+        def middleware(method: str, params):
+            thread = threading.get_ident()
+            sending = self._sending[thread] > 0
+            start = time.perf_counter()
+            response = make_request(method, params)
+            end = time.perf_counter()
+            if method in SEND_METHODS:
+                if response.get("result"):
+                    self._sent(params, response["result"], start, end)
+                else:
+                    self._rpc(method, end - start)
+            elif method == RECEIPT_METHOD and response.get("result"):
+                if not self._confirmed(_txid(params[0]), response["result"], end):
+                    self._rpc(method, end - start)
+            elif not sending:
+                self._rpc(method, end - start)
+            return response
+
+        return middleware
+
+    def _sent(self, params, txid, start: float, end: float):
+        frame, stack = self._current()
+        data = params[0].get("data") if isinstance(params[0], dict) else None
+        transaction = {
+            "frame": frame,
+            "thread": threading.get_ident(),
+            "stack": stack,
+            "txid": _txid(txid),
+            "sent_at": start,
+            "accepted_at": end,
+            "calldata_size": len(HexBytes(data)) if data else None,
+        }
+        with self._lock:
+            self._pending[transaction["txid"]] = transaction
+            self._sending[transaction["thread"]] += 1
+        (frame.transactions if frame else self._unresolved).append(transaction)
+
+    def _confirmed(self, txid: str, receipt: dict, end: float) -> bool:
+        with self._lock:
+            transaction = self._pending.pop(txid, None)
+            if transaction is None:
+                return False
+            self._sending[transaction["thread"]] -= 1
+        transaction["confirmed_at"] = end
+        gas_used = receipt["gasUsed"]
+        transaction["gas_used"] = (
+            int(gas_used, 16) if isinstance(gas_used, str) else int(gas_used)
+        )
+        if transaction["frame"]:
+            transaction["frame"].children += end - transaction["sent_at"]
+        return True
+
+    def _rpc(self, method: str, elapsed: float):
+        frame, stack = self._current()
+        if frame:
+            frame.children += elapsed
+        with self._lock:
+            self.samples[(*stack, f"rpc {method}")] += elapsed
+
+    def _resolve(self, transactions: list[dict]):
+        """Records confirmed transactions, labelled from their receipts.
+
+        Transactions still awaiting their receipt are resolved by `finish`.
+        """
+        confirmed = {t["txid"]: t for t in transactions if "confirmed_at" in t}
+        if transactions is not self._unresolved:
+            self._unresolved += [t for t in transactions if "confirmed_at" not in t]
+        receipts = {}
+        for receipt in reversed(history):
+            if len(receipts) == len(confirmed):
+                break
+            if receipt.txid in confirmed:
+                receipts[receipt.txid] = receipt
+        for txid, transaction in confirmed.items():
+            receipt = receipts.get(txid)
+            calldata_size = transaction["calldata_size"]
+            if receipt is not None:
+                calldata_size = len(HexBytes(receipt.input))
+            profile = TransactionProfile(
+                stack=transaction["stack"],
+                label=_label(receipt) if receipt is not None else "unknown",
+                txid=txid,
+                wall_time=transaction["confirmed_at"] - transaction["sent_at"],
+                confirmation_wait=(
+                    transaction["confirmed_at"] - transaction["accepted_at"]
+                ),
+                gas_used=transaction["gas_used"],
+                calldata_size=calldata_size or 0,
+            )
+            with self._lock:
+                self.transactions.append(profile)
+                self.samples[
+                    (*profile.stack, _frame_name(f"tx {profile.label}"))
+                ] += profile.wall_time
+
+    @contextmanager
+    def frame(self, name: str) -> Iterator[None]:
+        """Profiles the enclosed block as a frame nested in the current one."""
+        self._install()
+        parent, stack = self._current()
+        frame = _Frame((*stack, _frame_name(name)))
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            wall_time = time.perf_counter() - frame.start
+            self._resolve(frame.transactions)
+            with self._lock:
+                self.samples[frame.stack] += max(wall_time - frame.children, 0)
+            if parent:
+                parent.children += wall_time
+
+    def summary(self) -> list[SummaryRow]:
+        """Transactions per label, most time consuming first. Times, gas and
+        calldata size are averages."""
+        groups: dict[str, list[TransactionProfile]] = defaultdict(list)
+        for transaction in self.transactions:
+            groups[transaction.label].append(transaction)
+        rows = [
+            SummaryRow(
+                label,
+                len(group),
+                sum(t.wall_time for t in group) / len(group),
+                sum(t.confirmation_wait for t in group) / len(group),
+                sum(t.gas_used for t in group) // len(group),
+                sum(t.calldata_size for t in group) // len(group),
+            )
+            for label, group in groups.items()
+        ]
+        return sorted(rows, key=lambda r: r.count * r.wall_time, reverse=True)
+
+    def breakdown(self) -> dict[str, float]:
+        """Profiled seconds in transactions, RPC calls and everything else."""
+        totals = {"transactions": 0.0, "rpc": 0.0, "other": 0.0}
+        for stack, seconds in self.samples.items():
+            if stack[-1].startswith("tx "):
+                totals["transactions"] += seconds
+            elif stack[-1].startswith("rpc "):
+                totals["rpc"] += seconds
+            else:
+                totals["other"] += seconds
+        return totals
+
+    def export(self, path: Union[str, Path]):
+        """Writes folded stacks with microseconds, the input of `flamegraph.pl`
+        and speedscope."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        lines = [
+            f"{';'.join(stack)} {round(seconds * 1e6)}"
+            for stack, seconds in sorted(self.samples.items())
+            if round(seconds * 1e6)
+        ]
+        Path(path).write_text("\n".join(lines) + "\n")
+
+    def print_summary(self, write: Callable[[str], None] = print):
+        breakdown = self.breakdown()
+        write(
+            "Profiled "
+            + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in breakdown.items())
+        )
+        write(
+            f"{'transaction':<48} {'count':>6} {'wall ms':>9} {'confirm ms':>10} "
+            f"{'gas':>9} {'calldata':>8}"
+        )
+        for row in self.summary():
+            write(
+                f"{row.label[:48]:<48} {row.count:>6} {row.wall_time * 1000:>9.1f} "
+                f"{row.confirmation_wait * 1000:>10.1f} {row.gas_used:>9} "
+                f"{row.calldata_size:>8}"
+            )
+
+    def finish(self, write: Callable[[str], None] = print):
+        """Exports the trace and prints the summary, once."""
+        if not self.enabled or self._finished:
+            return
+        self._finished = True
+        self._uninstall()
+        self._resolve(self._unresolved)
+        self.export(self.trace_path)
+        self.print_summary(write)
+        write(f"Profile trace written to {self.trace_path}")
+
+
+profiler = Profiler(os.environ.get(PROFILE_TRACE))
+if profiler.enabled:
+    atexit.register(profiler.finish)
+
+
+def profile(name: str):
+    """Profiles the enclosed block when profiling is enabled."""
+    return profiler.frame(name) if profiler.enabled else nullcontext()
+
+
+def profiled(function: Callable) -> Callable:
+    """Profiles every call of `function` when profiling is enabled."""
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        with profile(function.__name__):
+            return function(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,243 @@
+import heapq
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from eth_keys import keys
+
+from .common import sign_payload
+from .estate_lookup import region_token_ids
+from .ownership_indexer import OwnershipIndex
+
+# Seconds a reservation can be funded
+RESERVATION_TTL = 300
+# Seconds a token stays locked after its reservation expired. Blocks with a
+# timestamp before the expiry can still be mined after it.
+RELEASE_GRACE = 30
+# Tokens picked from the inventory and encoded ahead of requests
+WARM_QUEUE_SIZE = 1024
+SIGNER_WORKERS = os.cpu_count() or 1
+SIGN_CHUNK_SIZE = 64
+
+_signer_key: Optional[keys.PrivateKey] = None
+
+
+def _init_signer(key: str):
+    global _signer_key
+    _signer_key = keys.PrivateKey(bytes.fromhex(key[2:]))
+
+
+def _sign(payload: bytes) -> bytes:
+    return sign_payload(payload, _signer_key)
+
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, "big")
+
+
+class Reservation(NamedTuple):
+    token_id: int
+    wallet: str
+    expiry: int
+    cost: int
+    payload: bytes
+    signature: bytes
+
+
+class ReservationService:
+    """In-memory sale inventory handing out signed `fund` reservations.
+
+    Every token is reserved by at most one wallet at a time and stays locked
+    until its reservation can no longer be funded, `expiry` plus a grace
+    period. A wallet holds a single reservation, asking again returns it.
+    Tokens are picked ahead into a warm queue with their ID and cost words
+    encoded, signatures cover the buyer wallet so they are made on request,
+    in a pool of signer processes.
+    """
+
+    def __init__(
+        self,
+        token_ids: Iterable[int],
+        cost: int,
+        key: str,
+        ttl: int = RESERVATION_TTL,
+        workers: int = SIGNER_WORKERS,
+        warm_size: int = WARM_QUEUE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.cost = cost
+        self.ttl = ttl
+        self.clock = clock
+        self.warm_size = warm_size
+        self._inventory = deque(token_ids)
+        self._warm: deque[tuple[int, bytes]] = deque()
+        self._reservations: dict[int, Reservation] = {}
+        self._by_wallet: dict[str, Reservation] = {}
+        self._expiries: list[tuple[int, int]] = []
+        self._sold: set[int] = set()
+        self._lock = threading.Lock()
+        self._cost_word = _word(cost)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_signer, initargs=(key,)
+        )
+        self._fill()
+
+    @classmethod
+    def from_chain(
+        cls,
+        land_contract,
+        bottom_left: tuple[int, int],
+        top_right: tuple[int, int],
+        cost: int,
+        key: str,
+        index: Optional[OwnershipIndex] = None,
+        **kwargs,
+    ) -> "ReservationService":
+        """Inventory of a map region without the parcels minted on chain."""
+        index = index or OwnershipIndex()
+        index.sync(land_contract)
+        token_ids = [
+            t
+            for t in region_token_ids(bottom_left, top_right)
+            if index.owner_of(t) is None
+        ]
+        return cls(token_ids, cost, key, **kwargs)
+
+    def _fill(self):
+        while len(self._warm) < self.warm_size and self._inventory:
+            token_id = self._inventory.popleft()
+            if token_id not in self._sold:
+                self._warm.append((token_id, _word(token_id)))
+
+    def _release_expired(self, now: float):
+        while self._expiries and self._expiries[0][0] + RELEASE_GRACE <= now:
+            expiry, token_id = heapq.heappop(self._expiries)
+            reservation = self._reservations.get(token_id)
+            if reservation is None or reservation.expiry != expiry:
+                continue
+            del self._reservations[token_id]
+            if self._by_wallet.get(reservation.wallet) is reservation:
+                del self._by_wallet[reservation.wallet]
+            if token_id not in self._sold:
+                self._inventory.append(token_id)
+
+    def _take(self, wallets: list[str]) -> list[Optional[Reservation]]:
+        """Locks tokens for `wallets`, new reservations are not signed yet."""
+        now = self.clock()
+        with self._lock:
+            self._release_expired(now)
+            taken = []
+            for wallet in wallets:
+                reservation = self._by_wallet.get(wallet)
+                # Same check as `fund`, `expiry > block.timestamp`
+                if reservation and reservation.expiry > now:
+                    taken.append(reservation)
+                    continue
+                if not self._warm:
+                    self._fill()
+                if not self._warm:
+                    taken.append(None)
+                    continue
+                token_id, token_word = self._warm.popleft()
+                expiry = int(now) + self.ttl
+                payload = (
+                    token_word
+                    + _word(expiry)
+                    + self._cost_word
+                    + _word(int(wallet, 16))
+                )
+                reservation = Reservation(
+                    token_id, wallet, expiry, self.cost, payload, b""
+                )
+                self._by_wallet[wallet] = reservation
+                self._reservations[token_id] = reservation
+                heapq.heappush(self._expiries, (expiry, token_id))
+                taken.append(reservation)
+            self._fill()
+        return taken
+
+    def reserve(self, wallet: str) -> Optional[Reservation]:
+        return self.reserve_many([wallet])[0]
+
+    def reserve_many(self, wallets: list[str]) -> list[Optional[Reservation]]:
+        """Signed reservations of `wallets`, `None` once the inventory is sold out."""
+        taken = self._take(wallets)
+        # Includes reservations still being signed by another request,
+        # signatures are deterministic
+        unsigned = [r for r in taken if r is not None and not r.signature]
+        signatures = self._executor.map(
+            _sign, [r.payload for r in unsigned], chunksize=SIGN_CHUNK_SIZE
+        )
+        signed = {r: r._replace(signature=s) for r, s in zip(unsigned, signatures)}
+        with self._lock:
+            for unsigned_reservation, reservation in signed.items():
+                if self._reservations.get(reservation.token_id) is unsigned_reservation:
+                    self._reservations[reservation.token_id] = reservation
+                if self._by_wallet.get(reservation.wallet) is unsigned_reservation:
+                    self._by_wallet[reservation.wallet] = reservation
+        return [signed.get(r, r) if r else None for r in taken]
+
+    def mark_sold(self, token_ids: Iterable[int]):
+        """Drops funded tokens, from `FundLandEvent`/`Transfer` logs.
+
+        Tokens sold without a reservation of this service, e.g. minted by the
+        owner, are removed from the queues.
+        """
+        with self._lock:
+            unreserved = set()
+            for token_id in token_ids:
+                self._sold.add(token_id)
+                reservation = self._reservations.pop(token_id, None)
+                if reservation is None:
+                    unreserved.add(token_id)
+                elif self._by_wallet.get(reservation.wallet) == reservation:
+                    del self._by_wallet[reservation.wallet]
+            if unreserved:
+                self._warm = deque(w for w in self._warm if w[0] not in unreserved)
+                self._inventory = deque(
+                    t for t in self._inventory if t not in unreserved
+                )
+                self._fill()
+
+    def available(self) -> int:
+        with self._lock:
+            return len(self._inventory) + len(self._warm)
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ReservationService":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def benchmark(
+    requests: int = 10_000,
+    workers: int = SIGNER_WORKERS,
+    batch_size: int = 256,
+) -> float:
+    """Signed reservations per second of a service with enough inventory."""
+    side = int(requests**0.5) + 1
+    token_ids = region_token_ids((0, 0), (side - 1, side - 1))
+    key = "0x" + secrets.token_hex(32)
+    wallets = ["0x" + secrets.token_hex(20) for _ in range(requests)]
+    with ReservationService(token_ids, 10**16, key, workers=workers) as service:
+        # Signer processes start lazily, warm them up outside the measurement
+        service.reserve("0x" + secrets.token_hex(20))
+        started = time.perf_counter()
+        for i in range(0, requests, batch_size):
+            service.reserve_many(wallets[i : i + batch_size])
+        elapsed = time.perf_counter() - started
+    return requests / elapsed
+
+
+def main():
+    for workers in sorted({1, 2, 4, SIGNER_WORKERS}):
+        rate = benchmark(workers=workers)
+        print(f"Reservations per second, {workers} signers: {rate:.0f}")
@@ -0,0 +1,217 @@
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from brownie import (
+    Contract,
+    HighriseLand,
+    HighriseLandFund,
+    accounts,
+    chain,
+    config,
+    exceptions,
+    network,
+)
+from eth_account import Account
+
+from .common import get_account, get_wei_land_price, set_balance
+from .coordinates import coordinates_to_token_id
+from .helpers import deploy_proxy_admin, opensea_proxy_registry_address
+from .land import deploy_land
+from .mint import generate_fund_request
+
+SALE_NETWORK = "development"
+BLOCK_TIME = 2  # in seconds, 0 mines every transaction on arrival
+BLOCK_GAS_LIMIT = 30_000_000
+# Land mint through the fund, with margin
+FUND_GAS_LIMIT = 400_000
+WALLET_BALANCE = 10**20
+PERCENTILES = (50, 90, 99)
+
+
+class SaleConfig(NamedTuple):
+    wallets: int = 1000
+    # Concurrent `fund` submissions
+    concurrency: int = 64
+    # Reservation expiry is drawn from this range of seconds after signing
+    expiry: tuple[int, int] = (30, 900)
+    # Shares of buyers sending an expired reservation, a wrong amount
+    # or a reservation of a token reserved by another buyer as well
+    expired: float = 0.02
+    wrong_amount: float = 0.02
+    duplicate: float = 0.02
+    seed: int = 0
+
+
+class Reservation(NamedTuple):
+    wallet: Account
+    token_id: int
+    expiry: int
+    cost: int
+    value: int
+    payload: bytes
+    signature: bytes
+
+
+class FundResult(NamedTuple):
+    token_id: int
+    success: bool
+    revert_msg: Optional[str]
+    # Seconds from submission to confirmation
+    latency: float
+    block: Optional[int]
+    gas_used: Optional[int]
+
+
+class SaleReport(NamedTuple):
+    submitted: int
+    succeeded: int
+    latency: dict[int, float]
+    reverts: dict[str, int]
+    # Successful purchases per block
+    per_block: dict[int, int]
+
+    @property
+    def success_rate(self) -> float:
+        return self.succeeded / self.submitted if self.submitted else 0.0
+
+
+def percentile(values: list[float], p: int) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(round(p / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(results: list[FundResult]) -> SaleReport:
+    latencies = [r.latency for r in results if r.success]
+    per_block = Counter(r.block for r in results if r.success)
+    return SaleReport(
+        len(results),
+        sum(r.success for r in results),
+        {p: percentile(latencies, p) for p in PERCENTILES},
+        dict(Counter(r.revert_msg or "unknown" for r in results if not r.success)),
+        dict(sorted(per_block.items())),
+    )
+
+
+def sale_token_ids(count: int) -> list[int]:
+    side = int(count**0.5) + 1
+    coordinates = [(x, y) for x in range(side) for y in range(side)]
+    return [coordinates_to_token_id(c) for c in coordinates[:count]]
+
+
+def reservations(
+    signer: Account, price: int, sale: SaleConfig = SaleConfig()
+) -> list[Reservation]:
+    """Signed reservations of fresh buyer wallets, one per wallet."""
+    rng = random.Random(sale.seed)
+    token_ids = sale_token_ids(sale.wallets)
+    now = chain.time()
+    result = []
+    for i, token_id in enumerate(token_ids):
+        wallet = accounts.add()
+        set_balance(wallet.address, WALLET_BALANCE)
+        expiry = now + rng.randint(*sale.expiry)
+        value = price
+        roll = rng.random()
+        if roll < sale.expired:
+            expiry = now - 1
+        elif roll < sale.expired + sale.wrong_amount:
+            value = price // 2
+        elif roll < sale.expired + sale.wrong_amount + sale.duplicate and i:
+            token_id = token_ids[rng.randrange(i)]
+        payload, signature = generate_fund_request(
+            token_id, expiry, price, signer.private_key, wallet.address
+        )
+        result.append(
+            Reservation(wallet, token_id, expiry, price, value, payload, signature)
+        )
+    return result
+
+
+def _submit(land_fund: Contract, reservation: Reservation) -> FundResult:
+    started = time.perf_counter()
+    try:
+        transaction = land_fund.fund(
+            reservation.payload,
+            reservation.signature,
+            {
+                "from": reservation.wallet,
+                "value": reservation.value,
+                "gas_limit": FUND_GAS_LIMIT,
+            },
+        )
+        revert_msg = None
+    except exceptions.VirtualMachineError as e:
+        transaction = chain.get_transaction(e.txid) if e.txid else None
+        revert_msg = e.revert_msg
+    latency = time.perf_counter() - started
+    return FundResult(
+        reservation.token_id,
+        revert_msg is None,
+        revert_msg,
+        latency,
+        transaction.block_number if transaction else None,
+        transaction.gas_used if transaction else None,
+    )
+
+
+def simulate(
+    land_fund: Contract, signer: Account, sale: SaleConfig = SaleConfig()
+) -> SaleReport:
+    """Submits signed `fund` calls of all buyers concurrently to an enabled fund."""
+    batch = reservations(signer, get_wei_land_price(), sale)
+    with ThreadPoolExecutor(max_workers=sale.concurrency) as executor:
+        results = list(executor.map(lambda r: _submit(land_fund, r), batch))
+    return summarize(results)
+
+
+def print_report(report: SaleReport):
+    print(
+        f"Submitted {report.submitted}, succeeded {report.succeeded} "
+        f"({report.success_rate:.1%})"
+    )
+    for p, latency in report.latency.items():
+        print(f"Latency p{p}: {latency:.2f}s")
+    for reason, count in sorted(report.reverts.items(), key=lambda r: -r[1]):
+        print(f"Reverted {count}: {reason}")
+    if report.per_block:
+        counts = list(report.per_block.values())
+        print(
+            f"Purchases per block: mean {sum(counts) / len(counts):.1f}, "
+            f"max {max(counts)} over {len(counts)} blocks"
+        )
+
+
+def deploy_sale(account: Account) -> Contract:
+    """Land proxy and an enabled fund allowed to mint it, on a local chain."""
+    proxy_admin = deploy_proxy_admin(account)
+    land_proxy, _ = deploy_land(
+        proxy_admin.address, opensea_proxy_registry_address(account), account=account
+    )
+    land_fund = HighriseLandFund.deploy(account, land_proxy.address, {"from": account})
+    land = Contract.from_abi("HighriseLand", land_proxy.address, HighriseLand.abi)
+    land.grantRole(land.MINTER_ROLE(), land_fund.address, {"from": account}).wait(1)
+    land_fund.enable({"from": account}).wait(1)
+    return land_fund
+
+
+def main():
+    """Reconnects the development chain with sale day block time and gas limit,
+    set by `SALE_BLOCK_TIME`, `SALE_GAS_LIMIT` and `SALE_WALLETS`."""
+    if network.is_connected():
+        network.disconnect()
+    config["networks"][SALE_NETWORK]["cmd_settings"].update(
+        block_time=int(os.environ.get("SALE_BLOCK_TIME", BLOCK_TIME)),
+        gas_limit=int(os.environ.get("SALE_GAS_LIMIT", BLOCK_GAS_LIMIT)),
+    )
+    network.connect(SALE_NETWORK)
+    account = get_account()
+    land_fund = deploy_sale(account)
+    sale = SaleConfig(wallets=int(os.environ.get("SALE_WALLETS", 1000)))
+    print_report(simulate(land_fund, account, sale))
@@ -0,0 +1,179 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, NamedTuple, Optional
+
+from eth_abi import decode_abi
+from eth_hash.auto import keccak
+from eth_keys import keys
+from eth_utils import to_checksum_address
+
+# `ECDSA.tryRecover` rejects the upper half of `s` values, so each
+# signature has a single valid form
+SECP256K1_HALF_N = 0x7FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF5D576E7357A4501DDFE92F46681B20A0
+CHECK_WORKERS = os.cpu_count() or 1
+CHECK_CHUNK_SIZE = 256
+
+FUND_LAYOUT = ["uint256", "uint256", "uint256", "address"]
+WITHDRAWAL_LAYOUT = ["uint256", "address"]
+BATCH_WITHDRAWAL_LAYOUT = ["address", "uint256[]"]
+
+
+class FundPayload(NamedTuple):
+    token_id: int
+    expiry: int
+    cost: int
+    approved_owner: str
+
+
+class WithdrawalPayload(NamedTuple):
+    token_ids: list[int]
+    approved_owner: str
+
+
+class FundSubmission(NamedTuple):
+    payload: bytes
+    signature: bytes
+    sender: str
+    value: int
+
+
+class WithdrawalSubmission(NamedTuple):
+    payload: bytes
+    signature: bytes
+    sender: str
+    # `withdrawBatch` payload
+    batch: bool = False
+
+
+def recover(hash: bytes, signature: bytes) -> str:
+    """Signer of `hash` as `ECDSA.recover` returns it, raises ValueError with
+    the revert reason of `ECDSA` otherwise."""
+    if len(signature) == 65:
+        r = int.from_bytes(signature[:32], "big")
+        s = int.from_bytes(signature[32:64], "big")
+        v = signature[64]
+    elif len(signature) == 64:
+        # EIP-2098 compact signature, `v` is the top bit of `s`
+        r = int.from_bytes(signature[:32], "big")
+        vs = int.from_bytes(signature[32:], "big")
+        s = vs & ((1 << 255) - 1)
+        v = (vs >> 255) + 27
+    else:
+        raise ValueError("ECDSA: invalid signature length")
+    if s > SECP256K1_HALF_N:
+        raise ValueError("ECDSA: invalid signature 's' value")
+    if v not in (27, 28):
+        raise ValueError("ECDSA: invalid signature 'v' value")
+    try:
+        public_key = keys.Signature(
+            vrs=(v - 27, r, s)
+        ).recover_public_key_from_msg_hash(hash)
+    except Exception:
+        # `ecrecover` returns the zero address for `r` or `s` out of range
+        # and points off the curve
+        raise ValueError("ECDSA: invalid signature")
+    return public_key.to_checksum_address()
+
+
+def _decode(layout: list[str], payload: bytes) -> tuple:
+    """`abi.decode`, which reverts without a reason on short payloads and
+    dirty address words."""
+    try:
+        return decode_abi(layout, payload)
+    except Exception:
+        raise ValueError("Payload decoding failed")
+
+
+def decode_fund_payload(payload: bytes) -> FundPayload:
+    token_id, expiry, cost, approved_owner = _decode(FUND_LAYOUT, payload)
+    return FundPayload(token_id, expiry, cost, to_checksum_address(approved_owner))
+
+
+def decode_withdrawal_payload(payload: bytes, batch: bool = False) -> WithdrawalPayload:
+    if batch:
+        approved_owner, token_ids = _decode(BATCH_WITHDRAWAL_LAYOUT, payload)
+        return WithdrawalPayload(list(token_ids), to_checksum_address(approved_owner))
+    token_id, approved_owner = _decode(WITHDRAWAL_LAYOUT, payload)
+    return WithdrawalPayload([token_id], to_checksum_address(approved_owner))
+
+
+def check_fund(
+    submission: FundSubmission,
+    owner: str,
+    now: Optional[int] = None,
+    min_validity: int = 0,
+    price: Optional[int] = None,
+) -> Optional[str]:
+    """Reason `HighriseLandFund.fund` would revert with, `None` if it would not.
+
+    Expiry is checked against `now` plus `min_validity`, the seconds a
+    transaction may wait for its block. `price` additionally rejects payloads
+    signed for another land price.
+    """
+    try:
+        signer = recover(keccak(submission.payload), submission.signature)
+        if signer != to_checksum_address(owner):
+            return "Payload verification failed"
+        payload = decode_fund_payload(submission.payload)
+    except ValueError as e:
+        return str(e)
+    if to_checksum_address(submission.sender) != payload.approved_owner:
+        return "Sender not approved to buy token"
+    now = int(time.time()) if now is None else now
+    if payload.expiry <= now + min_validity:
+        return "Reservation expired"
+    if submission.value != payload.cost:
+        return "Amount sent does not match land price"
+    if price is not None and payload.cost != price:
+        return "Cost does not match land price"
+    return None
+
+
+def check_withdrawal(submission: WithdrawalSubmission, owner: str) -> Optional[str]:
+    """Reason `withdraw` or `withdrawBatch` of `HighriseLandWithdrawal` would
+    revert with, `None` if it would not."""
+    try:
+        signer = recover(keccak(submission.payload), submission.signature)
+        if signer != to_checksum_address(owner):
+            return "HLW: Payload verification failed"
+        payload = decode_withdrawal_payload(submission.payload, submission.batch)
+    except ValueError as e:
+        return str(e)
+    if to_checksum_address(submission.sender) != payload.approved_owner:
+        return "HLW: Sender not approved to buy token"
+    return None
+
+
+def check_fund_batch(
+    submissions: Iterable[FundSubmission],
+    owner: str,
+    now: Optional[int] = None,
+    min_validity: int = 0,
+    price: Optional[int] = None,
+    workers: int = CHECK_WORKERS,
+) -> list[Optional[str]]:
+    """`check_fund` of many submissions in a pool of processes, against the
+    same `now`."""
+    now = int(time.time()) if now is None else now
+    check = partial(
+        check_fund, owner=owner, now=now, min_validity=min_validity, price=price
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(check, submissions, chunksize=CHECK_CHUNK_SIZE))
+
+
+def check_withdrawal_batch(
+    submissions: Iterable[WithdrawalSubmission],
+    owner: str,
+    workers: int = CHECK_WORKERS,
+) -> list[Optional[str]]:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                partial(check_withdrawal, owner=owner),
+                submissions,
+                chunksize=CHECK_CHUNK_SIZE,
+            )
+        )
@@ -0,0 +1,287 @@
+import os
+import threading
+from collections import defaultdict
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from brownie import HighriseLand, HighriseLandFund, HighriseLandWithdrawal, web3
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from web3._utils.events import get_event_data
+
+from .common import DEFAULT_ADMIN_ROLE, MINTER_ROLE, OWNER_ROLE
+from .helpers import Project, load_openzeppelin
+from .land_metadata import log_position
+from .ownership_indexer import BLOCK_CHUNK_SIZE
+
+# Seconds between polls, doubled after each poll without new blocks or with
+# a failed request, back to `MIN_POLL_INTERVAL` once blocks arrive
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 30.0
+
+WATCHED_EVENTS = {
+    "FundStateChangedEvent",
+    "WithdrawalStateChangedEvent",
+    "RoleGranted",
+    "RoleRevoked",
+    "Upgraded",
+    "AdminChanged",
+}
+ROLE_NAMES = {
+    bytes(DEFAULT_ADMIN_ROLE): "DEFAULT_ADMIN_ROLE",
+    bytes(MINTER_ROLE): "MINTER_ROLE",
+    bytes(OWNER_ROLE): "OWNER_ROLE",
+}
+
+
+class ContractEvent(NamedTuple):
+    address: str
+    name: str
+    args: dict
+
+
+def role_name(role: bytes) -> str:
+    return ROLE_NAMES.get(bytes(role), "0x" + bytes(role).hex())
+
+
+def next_interval(interval: float, progressed: bool) -> float:
+    if progressed:
+        return MIN_POLL_INTERVAL
+    return min(interval * 2, MAX_POLL_INTERVAL)
+
+
+class EventDecoder:
+    """Decodes logs of the watched events from the ABIs of the contracts
+    emitting them, other logs are skipped."""
+
+    def __init__(self, abis: Iterable[list[dict]]):
+        self.events: dict[bytes, dict] = {}
+        for abi in abis:
+            for item in abi:
+                if item.get("type") == "event" and item["name"] in WATCHED_EVENTS:
+                    self.events[event_abi_to_log_topic(item)] = item
+
+    @classmethod
+    def for_project(cls, oz: Optional[Project] = None) -> "EventDecoder":
+        if not oz:
+            oz = load_openzeppelin()
+        return cls(
+            [
+                HighriseLandFund.abi,
+                HighriseLandWithdrawal.abi,
+                HighriseLand.abi,
+                # `Upgraded` and `AdminChanged` are emitted by the proxy itself
+                oz.TransparentUpgradeableProxy.abi,
+            ]
+        )
+
+    @property
+    def topics(self) -> list[str]:
+        return ["0x" + topic.hex() for topic in self.events]
+
+    def decode(self, log) -> Optional[ContractEvent]:
+        if (
+            not log["topics"]
+            or (event_abi := self.events.get(bytes(log["topics"][0]))) is None
+        ):
+            return None
+        event = get_event_data(web3.codec, event_abi, log)
+        return ContractEvent(
+            to_checksum_address(log["address"]), event["event"], dict(event["args"])
+        )
+
+
+class StateView:
+    """Fund and withdrawal states, role members and proxy implementations
+    materialized from contract events.
+
+    Funds and withdrawals start disabled, as deployed. `block` is the last
+    applied block. Readers hold `lock` while `apply` runs on the watcher thread.
+    """
+
+    def __init__(
+        self,
+        funds: Iterable[str] = (),
+        withdrawals: Iterable[str] = (),
+        block: int = -1,
+    ):
+        self.block = block
+        self.fund_enabled: dict[str, bool] = {f: False for f in funds}
+        self.withdrawal_enabled: dict[str, bool] = {w: False for w in withdrawals}
+        self.roles: dict[str, dict[str, set[str]]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        self.implementations: dict[str, str] = {}
+        self.admins: dict[str, str] = {}
+        self.lock = threading.RLock()
+
+    def apply(self, events: Iterable[ContractEvent], block: Optional[int] = None):
+        """Applies events in chain order, up to and including `block`."""
+        with self.lock:
+            for event in events:
+                args = event.args
+                if event.name == "FundStateChangedEvent":
+                    self.fund_enabled[event.address] = args["enabled"]
+                elif event.name == "WithdrawalStateChangedEvent":
+                    self.withdrawal_enabled[event.address] = args["enabled"]
+                elif event.name == "RoleGranted":
+                    role = role_name(args["role"])
+                    self.roles[event.address][role].add(args["account"])
+                elif event.name == "RoleRevoked":
+                    role = role_name(args["role"])
+                    self.roles[event.address][role].discard(args["account"])
+                elif event.name == "Upgraded":
+                    self.implementations[event.address] = args["implementation"]
+                elif event.name == "AdminChanged":
+                    self.admins[event.address] = args["newAdmin"]
+            if block is not None:
+                self.block = block
+
+    def role_members(self, contract: str, role: str) -> list[str]:
+        with self.lock:
+            return sorted(self.roles.get(contract, {}).get(role, ()))
+
+    def owner(self, contract: str) -> Optional[str]:
+        """`owner()` of Highrise tokens, the single `OWNER_ROLE` member."""
+        members = self.role_members(contract, "OWNER_ROLE")
+        return members[0] if members else None
+
+
+class StateWatcher:
+    """Keeps a `StateView` up to date by polling logs of `addresses`,
+    backing off exponentially while the node has no new blocks or fails."""
+
+    def __init__(
+        self,
+        view: StateView,
+        addresses: Iterable[str],
+        decoder: EventDecoder,
+        chunk_size: int = BLOCK_CHUNK_SIZE,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        self.view = view
+        self.addresses = [to_checksum_address(a) for a in addresses]
+        self.decoder = decoder
+        self.chunk_size = chunk_size
+        self.interval = MIN_POLL_INTERVAL
+        self._stop = threading.Event()
+        # Waiting on the stop event lets `stop` end a long backoff early
+        self.sleep = sleep or self._stop.wait
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self, to_block: Optional[int] = None) -> int:
+        """Applies logs up to `to_block` in block chunks.
+
+        Returns number of events applied.
+        """
+        to_block = web3.eth.block_number if to_block is None else to_block
+        applied = 0
+        while self.view.block < to_block:
+            from_block = self.view.block + 1
+            chunk_end = min(from_block + self.chunk_size - 1, to_block)
+            logs = web3.eth.get_logs(
+                {
+                    "fromBlock": from_block,
+                    "toBlock": chunk_end,
+                    "address": self.addresses,
+                    "topics": [self.decoder.topics],
+                }
+            )
+            events = [
+                event
+                for log in sorted(logs, key=log_position)
+                if (event := self.decoder.decode(log)) is not None
+            ]
+            self.view.apply(events, chunk_end)
+            applied += len(events)
+        return applied
+
+    def run(self):
+        """Polls until `stop` is called."""
+        while not self._stop.is_set():
+            block = self.view.block
+            try:
+                self.poll()
+                self.interval = next_interval(self.interval, self.view.block > block)
+            except (OSError, ValueError) as e:
+                self.interval = next_interval(self.interval, False)
+                print(f"Polling failed, retrying in {self.interval}s: {e}")
+            if not self._stop.is_set():
+                self.sleep(self.interval)
+
+    def start(self) -> "StateWatcher":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+def query(view: StateView, command: str) -> str:
+    """Answers a watcher CLI command from the view without chain calls."""
+    words = command.split()
+    if not words:
+        return ""
+    with view.lock:
+        return _query(view, words, command)
+
+
+def _query(view: StateView, words: list[str], command: str) -> str:
+    if words[0] == "block":
+        return str(view.block)
+    if words[0] in ("funds", "withdrawals"):
+        states = view.fund_enabled if words[0] == "funds" else view.withdrawal_enabled
+        return "\n".join(
+            f"{address}: {'enabled' if enabled else 'disabled'}"
+            for address, enabled in sorted(states.items())
+        )
+    if words[0] == "roles":
+        role = words[1] if len(words) > 1 else None
+        lines = []
+        for contract in sorted(view.roles):
+            for name in sorted(view.roles[contract]):
+                if role is None or name == role:
+                    members = ", ".join(view.role_members(contract, name))
+                    lines.append(f"{contract} {name}: {members}")
+        return "\n".join(lines)
+    if words[0] == "owner" and len(words) == 2:
+        return str(view.owner(to_checksum_address(words[1])))
+    if words[0] == "proxies":
+        return "\n".join(
+            f"{proxy}: implementation {implementation}, "
+            f"admin {view.admins.get(proxy)}"
+            for proxy, implementation in sorted(view.implementations.items())
+        )
+    raise ValueError(f"Unknown command: {command}")
+
+
+def _addresses(name: str) -> list[str]:
+    return [to_checksum_address(a) for a in os.environ.get(name, "").split(",") if a]
+
+
+def main():
+    """Watches the comma separated `WATCH_FUNDS`, `WATCH_WITHDRAWALS` and
+    `WATCH_PROXIES` addresses from `WATCH_FROM_BLOCK` (0 by default) and
+    answers `block`, `funds`, `withdrawals`, `roles [ROLE]`, `owner <address>`
+    and `proxies` from the prompt, `quit` exits."""
+    funds = _addresses("WATCH_FUNDS")
+    withdrawals = _addresses("WATCH_WITHDRAWALS")
+    view = StateView(funds, withdrawals, int(os.environ.get("WATCH_FROM_BLOCK", 0)) - 1)
+    watcher = StateWatcher(
+        view,
+        [*funds, *withdrawals, *_addresses("WATCH_PROXIES")],
+        EventDecoder.for_project(),
+    ).start()
+    try:
+        while (command := input("> ").strip()) != "quit":
+            try:
+                print(query(view, command))
+            except ValueError as e:
+                print(e)
+    except EOFError:
+        pass
+    finally:
+        watcher.stop()
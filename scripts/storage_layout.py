@@ -0,0 +1,266 @@
+import hashlib
+import json
+import posixpath
+import re
+from itertools import combinations
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import solcx
+from brownie import config
+from brownie._config import _get_data_folder
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LAND_CONTRACTS = "contracts/land"
+CACHE_FOLDER = PROJECT_ROOT.joinpath("build", "storage_layouts")
+# Implementations of each proxy in deployment order
+UPGRADE_PATHS = {
+    "HighriseLand": ["HighriseLand", "HighriseLandV2", "HighriseLandV3"],
+    "HighriseEstate": ["HighriseEstate", "HighriseEstateV2"],
+}
+# Changes which corrupt storage of a live proxy
+COLLISIONS = ("deleted", "moved", "retyped", "collision")
+
+IMPORT_PATTERN = re.compile(
+    r"""^\s*import\s+(?:[^"';]*\bfrom\s+)?["']([^"']+)["']""", re.M
+)
+
+
+class Variable(NamedTuple):
+    """State variable at a byte position of the contract storage."""
+
+    label: str
+    contract: str
+    slot: int
+    offset: int
+    size: int
+    # Structural type, equal for types which are stored the same way
+    type: str
+
+    @property
+    def start(self) -> int:
+        return self.slot * 32 + self.offset
+
+    @property
+    def end(self) -> int:
+        return self.start + self.size
+
+    @property
+    def is_gap(self) -> bool:
+        return self.label == "__gap"
+
+
+class Change(NamedTuple):
+    kind: str
+    variable: Variable
+    detail: str = ""
+
+    def __str__(self) -> str:
+        v = self.variable
+        position = f"slot {v.slot}+{v.offset}"
+        return (
+            f"{self.kind} {v.contract}.{v.label} at {position} {self.detail}".rstrip()
+        )
+
+
+def _remappings() -> dict[str, Path]:
+    packages = _get_data_folder().joinpath("packages")
+    remappings = config["compiler"]["solc"]["remappings"]
+    return {
+        prefix: packages.joinpath(path)
+        for prefix, path in (remapping.split("=") for remapping in remappings)
+    }
+
+
+def _source_path(unit: str, remappings: dict[str, Path]) -> Path:
+    for prefix, path in remappings.items():
+        if unit.startswith(prefix + "/"):
+            return path.joinpath(unit[len(prefix) + 1 :])
+    return PROJECT_ROOT.joinpath(unit)
+
+
+def collect_sources(units: list[str]) -> dict[str, str]:
+    """Source units and everything they import, by solc source unit name.
+
+    Imports are resolved here so that the compiler input holds every source
+    and its hash covers OpenZeppelin and local dependencies.
+    """
+    remappings = _remappings()
+    sources: dict[str, str] = {}
+    pending = list(units)
+    while pending:
+        unit = pending.pop()
+        if unit in sources:
+            continue
+        sources[unit] = _source_path(unit, remappings).read_text()
+        for path in IMPORT_PATTERN.findall(sources[unit]):
+            if path.startswith("."):
+                path = posixpath.join(posixpath.dirname(unit), path)
+                path = posixpath.normpath(path)
+            pending.append(path)
+    return dict(sorted(sources.items()))
+
+
+def compiler_input(sources: dict[str, str]) -> dict:
+    return {
+        "language": "Solidity",
+        "sources": {unit: {"content": content} for unit, content in sources.items()},
+        "settings": {"outputSelection": {"*": {"*": ["storageLayout"]}}},
+    }
+
+
+def input_hash(input_json: dict, solc_version: str) -> str:
+    encoded = json.dumps([solc_version, input_json], sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _type(type_id: str, types: dict) -> str:
+    """Type of a storage layout entry, without AST IDs and declaring contracts."""
+    t = types[type_id]
+    if "members" in t:
+        members = ",".join(
+            f"{m['slot']}+{m['offset']}:{_type(m['type'], types)}" for m in t["members"]
+        )
+        return f"struct({members})"
+    if t["encoding"] == "mapping":
+        return f"mapping({_type(t['key'], types)}=>{_type(t['value'], types)})"
+    if "base" in t:
+        length = "" if t["encoding"] == "dynamic_array" else t["numberOfBytes"]
+        return f"{_type(t['base'], types)}[{length}]"
+    # Contract references are stored as addresses
+    return "address" if t["label"].startswith("contract ") else t["label"]
+
+
+def variables(layout: dict) -> list[Variable]:
+    """State variables of solc `storageLayout` output, in storage order."""
+    types = layout.get("types") or {}
+    return [
+        Variable(
+            entry["label"],
+            entry["contract"].split(":")[-1],
+            int(entry["slot"]),
+            entry["offset"],
+            int(types[entry["type"]]["numberOfBytes"]),
+            _type(entry["type"], types),
+        )
+        for entry in layout["storage"]
+    ]
+
+
+def storage_layouts(
+    contracts_folder: str = LAND_CONTRACTS,
+    cache_folder: Path = CACHE_FOLDER,
+) -> dict[str, list[Variable]]:
+    """Storage layout of every contract defined in `contracts_folder`.
+
+    Layouts are cached by hash of the compiler input, a recheck of unchanged
+    sources does not compile.
+    """
+    units = sorted(
+        path.relative_to(PROJECT_ROOT).as_posix()
+        for path in PROJECT_ROOT.joinpath(contracts_folder).glob("*.sol")
+    )
+    solc_version = config["compiler"]["solc"]["version"]
+    input_json = compiler_input(collect_sources(units))
+    cache_path = Path(cache_folder).joinpath(
+        f"{input_hash(input_json, solc_version)}.json"
+    )
+    if cache_path.exists():
+        layouts = json.loads(cache_path.read_text())
+    else:
+        if solc_version not in map(str, solcx.get_installed_solc_versions()):
+            solcx.install_solc(solc_version)
+        output = solcx.compile_standard(input_json, solc_version=solc_version)
+        layouts = {
+            name: contract["storageLayout"]
+            for unit in units
+            for name, contract in output["contracts"][unit].items()
+        }
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(layouts, sort_keys=True))
+    return {name: variables(layout) for name, layout in layouts.items()}
+
+
+def diff(old: list[Variable], new: list[Variable]) -> list[Change]:
+    """Storage changes of an upgrade from `old` to `new` layout.
+
+    Every variable of `old` must keep its position and type in `new`. Gaps
+    may be taken by new variables, and variables may be appended after the
+    end of `old`. Renames are reported but keep the data.
+    """
+    changes = []
+    at_start = {v.start: v for v in new}
+    old_labels = {(v.contract, v.label): v for v in old if not v.is_gap}
+    for variable in old:
+        if variable.is_gap:
+            continue
+        replacement = at_start.get(variable.start)
+        if replacement is None or replacement.is_gap:
+            moved = next(
+                (
+                    v
+                    for v in new
+                    if (v.contract, v.label) == (variable.contract, variable.label)
+                ),
+                None,
+            )
+            if moved:
+                changes.append(Change("moved", variable, f"to slot {moved.slot}"))
+                continue
+            overlapping = [
+                v
+                for v in new
+                if not v.is_gap and v.start < variable.end and variable.start < v.end
+            ]
+            if overlapping:
+                changes.append(
+                    Change("collision", variable, f"with {overlapping[0].label}")
+                )
+            else:
+                changes.append(Change("deleted", variable))
+        elif replacement.type != variable.type or replacement.size != variable.size:
+            changes.append(
+                Change("retyped", variable, f"{variable.type} to {replacement.type}")
+            )
+        elif replacement.label != variable.label:
+            changes.append(Change("renamed", variable, f"to {replacement.label}"))
+    old_end = max((v.end for v in old), default=0)
+    old_gaps = [v for v in old if v.is_gap]
+    for variable in new:
+        if variable.is_gap or (variable.contract, variable.label) in old_labels:
+            continue
+        if variable.start >= old_end:
+            changes.append(Change("appended", variable))
+        elif any(g.start <= variable.start and variable.end <= g.end for g in old_gaps):
+            changes.append(Change("gap", variable, "takes gap space"))
+    return changes
+
+
+def check(old: list[Variable], new: list[Variable]) -> list[Change]:
+    """Changes of the upgrade, raises on the first one corrupting proxy storage."""
+    changes = diff(old, new)
+    for change in changes:
+        if change.kind in COLLISIONS:
+            raise ValueError(f"Storage layout collision, {change}")
+    return changes
+
+
+def check_upgrades(
+    layouts: Optional[dict[str, list[Variable]]] = None,
+    upgrade_paths: dict[str, list[str]] = UPGRADE_PATHS,
+) -> dict[tuple[str, str], list[Change]]:
+    """Checks every implementation against all the later ones of its proxy."""
+    if layouts is None:
+        layouts = storage_layouts()
+    changes = {}
+    for versions in upgrade_paths.values():
+        for old, new in combinations(versions, 2):
+            changes[(old, new)] = check(layouts[old], layouts[new])
+    return changes
+
+
+def main():
+    for (old, new), changes in check_upgrades().items():
+        print(f"{old} -> {new}")
+        for change in changes:
+            print(f"  {change}")
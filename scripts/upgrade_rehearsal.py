@@ -0,0 +1,428 @@
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from statistics import mean
+from typing import Iterable, NamedTuple, Optional, Union
+
+from brownie import (
+    HighriseEstate,
+    HighriseEstateV2,
+    HighriseLand,
+    HighriseLandV2,
+    HighriseLandV3,
+    accounts,
+    chain,
+    config,
+    exceptions,
+    network,
+    web3,
+)
+
+from . import estate_v2, land_v3
+from .common import FORKED_LOCAL_ENVIRONMENTS, get_account, set_balance, state_methods
+
+REHEARSAL_SHARDS = 4
+# Shard nodes listen on consecutive ports after this one
+SHARD_BASE_PORT = 8600
+# Enough ether for impersonated senders to pay for replayed gas
+REPLAY_BALANCE = 10**24
+# Storage entries read per `debug_storageRangeAt` call when recording
+STORAGE_PAGE_SIZE = 1024
+ZERO_TOPIC = "0x" + "00" * 32
+
+
+class Log(NamedTuple):
+    address: str
+    topics: tuple[str, ...]
+    data: str
+
+
+class RecordedTransaction(NamedTuple):
+    hash: str
+    sender: str
+    to: str
+    value: int
+    data: str
+    gas_limit: int
+    gas_used: int
+    status: int
+    logs: tuple[Log, ...]
+
+
+class Outcome(NamedTuple):
+    """Result of a replayed transaction."""
+
+    hash: str
+    function: str
+    status: int
+    gas_used: int
+    logs: tuple[Log, ...]
+    revert_msg: Optional[str] = None
+
+
+class Divergence(NamedTuple):
+    hash: str
+    function: str
+    field: str
+    before: object
+    after: object
+
+
+class GasDelta(NamedTuple):
+    calls: int
+    before: float
+    after: float
+
+    @property
+    def delta(self) -> float:
+        return self.after - self.before
+
+
+class Report(NamedTuple):
+    gas: dict[str, GasDelta]
+    divergences: list[Divergence]
+    # Transactions whose replay on the current implementation differs from mainnet
+    drifted: list[str]
+
+
+class StateDump(NamedTuple):
+    """Chain state of the Land and Estate contracts at `block` and the
+    transactions recorded after it.
+
+    `contracts` holds `land_proxy`, `estate_proxy`, `proxy_admin` and the
+    `admin` account owning the proxy admin and the admin roles. `accounts`
+    maps addresses to `balance`, `nonce`, `code` and `storage`.
+    """
+
+    block: int
+    contracts: dict[str, str]
+    accounts: dict[str, dict]
+    transactions: list[RecordedTransaction]
+
+    def save(self, path: Union[str, Path]):
+        data = self._asdict()
+        data["transactions"] = [t._asdict() for t in self.transactions]
+        Path(path).write_text(json.dumps(data, indent=1))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "StateDump":
+        data = json.loads(Path(path).read_text())
+        transactions = [
+            RecordedTransaction(
+                **{
+                    **t,
+                    "logs": tuple(
+                        Log(address, tuple(topics), log_data)
+                        for address, topics, log_data in t["logs"]
+                    ),
+                }
+            )
+            for t in data["transactions"]
+        ]
+        return cls(data["block"], data["contracts"], data["accounts"], transactions)
+
+
+def _topic(address: str) -> str:
+    return "0x" + address.lower()[2:].rjust(64, "0")
+
+
+def shards(
+    transactions: list[RecordedTransaction],
+    count: int,
+    contracts: Iterable[str] = (),
+) -> list[list[RecordedTransaction]]:
+    """Splits transactions into `count` shards which can be replayed apart.
+
+    Transactions sharing a sender or an indexed event argument (token ID,
+    owner, operator) stay in one shard, in recorded order. Contract addresses
+    and the zero address are shared by everything and are ignored.
+    """
+    ignored = {ZERO_TOPIC} | {_topic(c) for c in contracts}
+    parents = list(range(len(transactions)))
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    first_seen: dict[str, int] = {}
+    for i, transaction in enumerate(transactions):
+        keys = {_topic(transaction.sender)}
+        keys |= {topic for log in transaction.logs for topic in log.topics[1:]}
+        for key in keys - ignored:
+            if key in first_seen:
+                parents[find(i)] = find(first_seen[key])
+            else:
+                first_seen[key] = i
+    components = defaultdict(list)
+    for i in range(len(transactions)):
+        components[find(i)].append(i)
+    # Largest groups first, each to the least loaded shard
+    loads: list[list[int]] = [[] for _ in range(count)]
+    for component in sorted(components.values(), key=len, reverse=True):
+        min(loads, key=len).extend(component)
+    return [[transactions[i] for i in sorted(load)] for load in loads if load]
+
+
+def compare(before: list[Outcome], after: list[Outcome]) -> list[Divergence]:
+    """Behavior differences of the same transactions replayed on two implementations."""
+    divergences = []
+    for old, new in zip(before, after):
+        for field in ("status", "revert_msg", "logs"):
+            if getattr(old, field) != getattr(new, field):
+                divergences.append(
+                    Divergence(
+                        old.hash,
+                        old.function,
+                        field,
+                        getattr(old, field),
+                        getattr(new, field),
+                    )
+                )
+    return divergences
+
+
+def gas_deltas(before: list[Outcome], after: list[Outcome]) -> dict[str, GasDelta]:
+    """Mean gas per function, of transactions succeeding on both implementations."""
+    gas = defaultdict(list)
+    for old, new in zip(before, after):
+        if old.status and new.status:
+            gas[old.function].append((old.gas_used, new.gas_used))
+    return {
+        function: GasDelta(
+            len(pairs), mean(p[0] for p in pairs), mean(p[1] for p in pairs)
+        )
+        for function, pairs in sorted(gas.items())
+    }
+
+
+def restore_state(dump: StateDump):
+    """Writes dumped accounts into the connected local node."""
+    set_code, set_storage, _, set_nonce = state_methods()
+    for address, account in dump.accounts.items():
+        web3.provider.make_request(set_code, [address, account["code"]])
+        set_balance(address, account["balance"])
+        web3.provider.make_request(set_nonce, [address, hex(account["nonce"])])
+        for slot, value in account["storage"].items():
+            web3.provider.make_request(
+                set_storage, [address, slot, "0x" + value[2:].rjust(64, "0")]
+            )
+
+
+def _function_names() -> dict[str, str]:
+    names = {}
+    for container in (
+        HighriseLand,
+        HighriseLandV2,
+        HighriseLandV3,
+        HighriseEstate,
+        HighriseEstateV2,
+    ):
+        names.update(container.selectors)
+    return names
+
+
+def _logs(receipt) -> tuple[Log, ...]:
+    return tuple(
+        Log(
+            log["address"],
+            tuple(topic.hex() for topic in log["topics"]),
+            web3.toHex(log["data"]),
+        )
+        for log in receipt.logs
+    )
+
+
+def replay(transactions: list[RecordedTransaction]) -> list[Outcome]:
+    """Sends recorded transactions from their original senders."""
+    names = _function_names()
+    outcomes = []
+    for transaction in transactions:
+        set_balance(transaction.sender, REPLAY_BALANCE)
+        sender = accounts.at(transaction.sender, force=True)
+        revert_msg = None
+        try:
+            receipt = sender.transfer(
+                transaction.to,
+                transaction.value,
+                gas_limit=transaction.gas_limit,
+                data=transaction.data,
+                silent=True,
+            )
+        except exceptions.VirtualMachineError as e:
+            receipt = chain.get_transaction(e.txid)
+            revert_msg = e.revert_msg
+        outcomes.append(
+            Outcome(
+                transaction.hash,
+                names.get(transaction.data[:10], transaction.data[:10]),
+                receipt.status,
+                receipt.gas_used,
+                _logs(receipt) if receipt.status else (),
+                revert_msg,
+            )
+        )
+    return outcomes
+
+
+def upgrade_contracts(dump: StateDump):
+    """Upgrades Land to `HighriseLandV3` and Estate to `HighriseEstateV2` as
+    the admin of the dumped contracts."""
+    contracts = dump.contracts
+    admin = accounts.at(contracts["admin"], force=True)
+    set_balance(admin.address, REPLAY_BALANCE)
+    deployer = get_account()
+    land = land_v3.deploy_land_v3_implementation(deployer)
+    estate = estate_v2.deploy_estate_v2_implementation(deployer)
+    land_v3.upgrade_proxy(
+        land.address, contracts["land_proxy"], contracts["proxy_admin"], admin
+    )
+    estate_v2.upgrade_proxy(
+        estate.address, contracts["estate_proxy"], contracts["proxy_admin"], admin
+    )
+    land_v3.set_estate_contract(
+        contracts["land_proxy"], contracts["estate_proxy"], admin
+    )
+
+
+def rehearse_shard(
+    dump: StateDump, transactions: list[RecordedTransaction]
+) -> tuple[list[Outcome], list[Outcome]]:
+    """Replays `transactions` before and after the upgrade on the connected node.
+
+    Dumped state is restored on local development nodes, forked networks
+    already hold it.
+    """
+    if network.show_active() not in FORKED_LOCAL_ENVIRONMENTS:
+        restore_state(dump)
+    chain.snapshot()
+    before = replay(transactions)
+    chain.revert()
+    upgrade_contracts(dump)
+    after = replay(transactions)
+    return before, after
+
+
+def _rehearse_shard_process(
+    args: tuple[str, int, list[RecordedTransaction], str],
+) -> tuple[list[Outcome], list[Outcome]]:
+    dump_path, port, transactions, network_name = args
+    # Every shard runs its own node
+    network.disconnect(kill_rpc=False)
+    config["networks"][network_name]["cmd_settings"]["port"] = port
+    network.connect(network_name)
+    try:
+        return rehearse_shard(StateDump.load(dump_path), transactions)
+    finally:
+        network.disconnect()
+
+
+def rehearse(
+    dump_path: Union[str, Path],
+    shard_count: int = REHEARSAL_SHARDS,
+    base_port: int = SHARD_BASE_PORT,
+) -> Report:
+    """Replays the recorded transactions of a state dump on the current and on
+    the upgraded implementations, in parallel shards."""
+    dump = StateDump.load(dump_path)
+    network_name = network.show_active()
+    parts = shards(dump.transactions, shard_count, dump.contracts.values())
+    before, after = [], []
+    with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+        for shard_before, shard_after in executor.map(
+            _rehearse_shard_process,
+            [
+                (str(dump_path), base_port + i, part, network_name)
+                for i, part in enumerate(parts)
+            ],
+        ):
+            before += shard_before
+            after += shard_after
+    recorded = {t.hash: t.status for t in dump.transactions}
+    return Report(
+        gas_deltas(before, after),
+        compare(before, after),
+        [o.hash for o in before if o.status != recorded[o.hash]],
+    )
+
+
+def print_report(report: Report):
+    print(f"{'function':<32}{'calls':>8}{'before':>12}{'after':>12}{'delta':>10}")
+    for function, gas in report.gas.items():
+        print(
+            f"{function:<32}{gas.calls:>8}{gas.before:>12.0f}"
+            f"{gas.after:>12.0f}{gas.delta:>+10.0f}"
+        )
+    for divergence in report.divergences:
+        print(
+            f"Divergence in {divergence.function} {divergence.hash} "
+            f"{divergence.field}: {divergence.before} -> {divergence.after}"
+        )
+    if report.drifted:
+        print(f"{len(report.drifted)} transactions replay differently than on chain")
+
+
+def _storage(address: str, block_hash: str, tx_index: int) -> dict[str, str]:
+    storage, start = {}, "0x" + "00" * 32
+    while start:
+        result = web3.provider.make_request(
+            "debug_storageRangeAt",
+            [block_hash, tx_index, address, start, STORAGE_PAGE_SIZE],
+        )["result"]
+        for entry in result["storage"].values():
+            if entry["key"] is None:
+                raise ValueError("Node does not keep storage key preimages")
+            storage[entry["key"]] = entry["value"]
+        start = result["nextKey"]
+    return storage
+
+
+def record(
+    path: Union[str, Path],
+    block: int,
+    contracts: dict[str, str],
+    addresses: Iterable[str],
+    transaction_hashes: Iterable[str],
+):
+    """Dumps state of `addresses` at `block` and the given later transactions.
+
+    Needs an archive node with `debug_storageRangeAt`, proxies, their
+    implementations and the OpenSea registry should all be dumped.
+    """
+    block_data = web3.eth.get_block(block)
+    dumped = {}
+    for address in addresses:
+        dumped[address] = {
+            "balance": web3.eth.get_balance(address, block),
+            "nonce": web3.eth.get_transaction_count(address, block),
+            "code": web3.toHex(web3.eth.get_code(address, block)),
+            "storage": _storage(
+                address, web3.toHex(block_data.hash), len(block_data.transactions)
+            ),
+        }
+    transactions = []
+    for transaction_hash in transaction_hashes:
+        transaction = web3.eth.get_transaction(transaction_hash)
+        receipt = web3.eth.get_transaction_receipt(transaction_hash)
+        transactions.append(
+            RecordedTransaction(
+                transaction_hash,
+                transaction["from"],
+                transaction["to"],
+                transaction["value"],
+                web3.toHex(transaction["input"]),
+                transaction["gas"],
+                receipt["gasUsed"],
+                receipt["status"],
+                _logs(receipt),
+            )
+        )
+    StateDump(block, contracts, dumped, transactions).save(path)
+
+
+def main():
+    report = rehearse(os.environ["REHEARSAL_DUMP"])
+    print_report(report)
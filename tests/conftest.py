@@ -5,10 +5,27 @@ from brownie.network.contract import ProjectContract
 
 from scripts.common import encode_function_data
 from scripts.helpers import Project
+from scripts.profiling import profile, profiler
 
 from . import LAND_BASE_TOKEN_URI, LAND_NAME, LAND_SYMBOL
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef):
+    with profile(f"fixture {fixturedef.argname}"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with profile(f"test {item.nodeid}"):
+        yield
+
+
+def pytest_terminal_summary(terminalreporter):
+    profiler.finish(terminalreporter.write_line)
+
+
 @pytest.fixture(scope="session")
 def oz(pm):
     project = pm("OpenZeppelin/openzeppelin-contracts@4.5.0/")
@@ -0,0 +1,84 @@
+from time import time
+from types import SimpleNamespace
+
+from brownie import Contract, HighriseLand
+from brownie.network.account import Account, LocalAccount
+
+from scripts.common import get_wei_land_price
+from scripts.fund_reconciliation import FundLedger, purchases
+from scripts.land_metadata import ZERO_ADDRESS
+from scripts.mint import generate_fund_request
+from scripts.sale_simulator import deploy_sale
+
+DAY = 86400
+
+
+def log(event: str, block: int, index: int, transaction: bytes, **args):
+    return SimpleNamespace(
+        event=event,
+        args=args,
+        blockNumber=block,
+        transactionIndex=0,
+        logIndex=index,
+        transactionHash=transaction,
+    )
+
+
+def test_fund_ledger(tmp_path):
+    alice, bob = "0x" + "a" * 40, "0x" + "b" * 40
+    logs = [
+        log("FundLandEvent", 1, 1, b"\x01", sender=alice, fundAmount=10),
+        log(
+            "Transfer", 1, 0, b"\x01", **{"from": ZERO_ADDRESS, "to": alice}, tokenId=7
+        ),
+        log("Transfer", 2, 0, b"\x02", **{"from": ZERO_ADDRESS, "to": bob}, tokenId=8),
+        log("FundLandEvent", 2, 1, b"\x02", sender=bob, fundAmount=10),
+        log("FundLandEvent", 3, 0, b"\x03", sender=alice, fundAmount=5),
+    ]
+    timestamps = {1: 0, 2: DAY - 1, 3: DAY}
+    ledger = FundLedger()
+    ledger.apply(purchases(reversed(logs), timestamps.get))
+    assert ledger.funded == {alice: 15, bob: 10}
+    assert ledger.tokens == {alice: [7], bob: [8]}
+    assert ledger.daily_funded == {"1970-01-01": 20, "1970-01-02": 5}
+    assert ledger.daily_purchases == {"1970-01-01": 2, "1970-01-02": 1}
+    assert ledger.total_funded() == 25
+
+    ledger.block = 3
+    ledger.save(tmp_path / "ledger.json")
+    restored = FundLedger.load(tmp_path / "ledger.json")
+    assert restored.block == 3
+    assert restored.funded == ledger.funded
+    assert restored.tokens == ledger.tokens
+    assert restored.daily_funded == ledger.daily_funded
+    assert FundLedger.load(tmp_path / "missing.json").total_funded() == 0
+    # Without a checkpoint indexing starts at the deployment block
+    assert FundLedger.load(tmp_path / "missing.json", 100).block == 99
+    assert FundLedger.load(tmp_path / "ledger.json", 100).block == 3
+
+
+def test_fund_reconciliation(
+    admin: LocalAccount, alice: Account, bob: Account, tmp_path
+):
+    land_fund = deploy_sale(admin)
+    land = Contract.from_abi("HighriseLand", land_fund.landContract(), HighriseLand.abi)
+    price = get_wei_land_price()
+    land.mint(bob, 100, {"from": admin}).wait(1)
+    for token_id, buyer in [(1, alice), (2, bob), (3, alice)]:
+        payload, sig = generate_fund_request(
+            token_id, int(time() + 60), price, admin.private_key, buyer.address
+        )
+        land_fund.fund(payload, sig, {"from": buyer, "value": price}).wait(1)
+
+    ledger = FundLedger()
+    assert ledger.sync(land_fund, land, chunk_size=2) == 3
+    assert ledger.funded == {alice.address: 2 * price, bob.address: price}
+    assert ledger.tokens == {alice.address: [1, 3], bob.address: [2]}
+    assert sum(ledger.daily_purchases.values()) == 3
+    assert ledger.cross_check(land_fund) == []
+
+    ledger.save(tmp_path / "ledger.json")
+    restored = FundLedger.load(tmp_path / "ledger.json")
+    assert restored.sync(land_fund, land) == 0
+    ledger.funded[bob.address] += 1
+    assert [m.wallet for m in ledger.cross_check(land_fund)] == [bob.address]
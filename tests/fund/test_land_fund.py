@@ -30,6 +30,7 @@ def initialized_land_fund(
     admin: LocalAccount, land_contract
 ) -> tuple[ProjectContract, ProjectContract]:
     land_fund = HighriseLandFund.deploy(
+        admin,
         land_contract.address,
         {"from": admin},
         publish_source=config["networks"][network.show_active()].get("verify"),
@@ -0,0 +1,98 @@
+from time import time
+
+import pytest
+from brownie import (
+    Contract,
+    HighriseLandFund,
+    HighriseLandFundFactory,
+    HighriseLandFundInitializable,
+    exceptions,
+)
+from brownie.network.account import Account, LocalAccount
+from brownie.network.contract import ProjectContract
+
+from scripts.common import get_wei_land_price
+from scripts.mint import generate_fund_request
+
+
+@pytest.fixture
+def fund_factory(admin: LocalAccount, land_contract) -> ProjectContract:
+    implementation = HighriseLandFundInitializable.deploy({"from": admin})
+    factory = HighriseLandFundFactory.deploy(
+        implementation, land_contract, {"from": admin}
+    )
+    land_contract.grantRole(
+        land_contract.getRoleAdmin(land_contract.MINTER_ROLE()),
+        factory,
+        {"from": admin},
+    ).wait(1)
+    return factory
+
+
+def create_fund(factory: ProjectContract, admin: LocalAccount, enabled: bool):
+    tx = factory.createFund(enabled, {"from": admin})
+    tx.wait(1)
+    fund = Contract.from_abi(
+        "HighriseLandFundInitializable",
+        tx.events["FundCreated"]["fund"],
+        HighriseLandFundInitializable.abi,
+    )
+    return fund, tx
+
+
+def test_create_fund(
+    admin: LocalAccount,
+    fund_factory: ProjectContract,
+    land_contract: ProjectContract,
+    alice: Account,
+):
+    fund, _ = create_fund(fund_factory, admin, True)
+    assert fund.owner() == admin
+    assert fund.landContract() == land_contract
+    assert land_contract.hasRole(land_contract.MINTER_ROLE(), fund)
+    price = get_wei_land_price()
+    payload, sig = generate_fund_request(
+        1, int(time() + 60), price, admin.private_key, alice.address
+    )
+    fund.fund(payload, sig, {"from": alice, "value": price}).wait(1)
+    assert land_contract.ownerOf(1) == alice
+    assert fund.addressToAmountFunded(alice) == price
+
+    # Sales are independent
+    other_fund, _ = create_fund(fund_factory, admin, False)
+    assert other_fund != fund
+    assert other_fund.fundState() == 1
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        other_fund.fund(payload, sig, {"from": alice, "value": price})
+    assert "Contract not enabled for funding" in str(excinfo.value)
+
+
+def test_fund_factory_access(
+    admin: LocalAccount,
+    fund_factory: ProjectContract,
+    land_contract: ProjectContract,
+    alice: Account,
+):
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        fund_factory.createFund(True, {"from": alice})
+    assert "Sender is not the owner" in str(excinfo.value)
+    fund, _ = create_fund(fund_factory, admin, True)
+    implementation = HighriseLandFundInitializable.at(fund_factory.implementation())
+    for contract in [fund, implementation]:
+        with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+            contract.initialize(alice, land_contract, True, {"from": alice})
+        assert "Initializable: contract is already initialized" in str(excinfo.value)
+
+
+def test_clone_gas(
+    admin: LocalAccount, fund_factory: ProjectContract, land_contract: ProjectContract
+):
+    full_fund = HighriseLandFund.deploy(admin, land_contract, {"from": admin})
+    grant = land_contract.grantRole(
+        land_contract.MINTER_ROLE(), full_fund, {"from": admin}
+    )
+    enable = full_fund.enable({"from": admin})
+    full_gas = full_fund.tx.gas_used + grant.gas_used + enable.gas_used
+    _, tx = create_fund(fund_factory, admin, True)
+    print(f"Sale fund gas: deploy {full_gas}, clone {tx.gas_used}")
+    assert tx.gas_used * 2 < full_gas
@@ -0,0 +1,105 @@
+from time import time
+
+import pytest
+from brownie import HighriseLandSplitFund, exceptions
+from brownie.network.account import Account, LocalAccount
+from brownie.network.contract import ProjectContract
+
+from scripts.common import get_wei_land_price
+from scripts.mint import generate_fund_request
+
+# Calldata of signatures differs in zero bytes
+CALLDATA_GAS_TOLERANCE = 200
+
+
+@pytest.fixture
+def enabled_split_fund(
+    admin: LocalAccount, land_contract, bob: Account, charlie: Account
+) -> ProjectContract:
+    split_fund = HighriseLandSplitFund.deploy(
+        admin, land_contract.address, [bob, charlie], [3, 1], {"from": admin}
+    )
+    land_contract.grantRole(
+        land_contract.MINTER_ROLE(), split_fund.address, {"from": admin}
+    ).wait(1)
+    split_fund.enable({"from": admin}).wait(1)
+    return split_fund
+
+
+def fund(split_fund: ProjectContract, admin: LocalAccount, buyer: Account, token_id):
+    price = get_wei_land_price()
+    payload, sig = generate_fund_request(
+        token_id, int(time() + 60), price, admin.private_key, buyer.address
+    )
+    tx = split_fund.fund(payload, sig, {"from": buyer, "value": price})
+    tx.wait(1)
+    return tx
+
+
+def test_release_while_enabled(
+    admin: LocalAccount,
+    enabled_split_fund: ProjectContract,
+    alice: Account,
+    bob: Account,
+    charlie: Account,
+):
+    price = get_wei_land_price()
+    fund(enabled_split_fund, admin, alice, 1)
+    fund(enabled_split_fund, admin, alice, 2)
+    bob_balance = bob.balance()
+    enabled_split_fund.release["address"](bob, {"from": charlie}).wait(1)
+    assert bob.balance() == bob_balance + 2 * price * 3 // 4
+
+    fund(enabled_split_fund, admin, alice, 3)
+    charlie_balance = charlie.balance()
+    enabled_split_fund.release["address"](charlie, {"from": bob}).wait(1)
+    assert charlie.balance() == charlie_balance + 3 * price // 4
+    assert enabled_split_fund.released["address"](bob) == 2 * price * 3 // 4
+    assert enabled_split_fund.balance() == 3 * price // 4
+    assert enabled_split_fund.addressToAmountFunded(alice) == 3 * price
+    assert enabled_split_fund.fundState() == 0
+
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        enabled_split_fund.release["address"](alice, {"from": alice})
+    assert "revert: PaymentSplitter: account has no shares" in str(excinfo.value)
+
+
+def test_fund_gas_unaffected_by_releases(
+    admin: LocalAccount,
+    enabled_split_fund: ProjectContract,
+    alice: Account,
+    bob: Account,
+    charlie: Account,
+):
+    # First purchase of a wallet initializes its funded amount
+    fund(enabled_split_fund, admin, alice, 1)
+    gas_used = [fund(enabled_split_fund, admin, alice, 2).gas_used]
+    for token_id, payee in [(3, bob), (4, charlie), (5, bob)]:
+        enabled_split_fund.release["address"](payee, {"from": payee}).wait(1)
+        gas_used.append(fund(enabled_split_fund, admin, alice, token_id).gas_used)
+    print(f"fund gas with releases in between: {gas_used}")
+    assert max(gas_used) - min(gas_used) <= CALLDATA_GAS_TOLERANCE
+
+    # Purchases and releases sent together all go through
+    price = get_wei_land_price()
+    transactions = []
+    for token_id in range(6, 10):
+        payload, sig = generate_fund_request(
+            token_id, int(time() + 60), price, admin.private_key, alice.address
+        )
+        transactions.append(
+            enabled_split_fund.fund(
+                payload,
+                sig,
+                {"from": alice, "value": price, "required_confs": 0},
+            )
+        )
+        transactions.append(
+            enabled_split_fund.release["address"](
+                bob, {"from": bob, "required_confs": 0}
+            )
+        )
+    for tx in transactions:
+        tx.wait(1)
+    assert all(tx.status == 1 for tx in transactions)
+    assert enabled_split_fund.addressToAmountFunded(alice) == 9 * price
@@ -0,0 +1,78 @@
+from brownie import Contract, HighriseLand, chain
+from brownie.network.account import Account, LocalAccount
+
+from scripts.common import get_wei_land_price
+from scripts.mint import generate_fund_request
+from scripts.reservation_service import (
+    RELEASE_GRACE,
+    RESERVATION_TTL,
+    ReservationService,
+)
+from scripts.sale_simulator import deploy_sale, sale_token_ids
+
+KEY = "0x" + "11" * 32
+WALLETS = ["0x" + f"{i:040x}" for i in range(1, 6)]
+
+
+class Clock:
+    def __init__(self, now: int):
+        self.now = now
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def test_reservation_locks():
+    clock = Clock(1_000_000)
+    token_ids = sale_token_ids(3)
+    with ReservationService(
+        token_ids, 100, KEY, workers=2, warm_size=2, clock=clock
+    ) as service:
+        first, second, third, sold_out = service.reserve_many(WALLETS[:4])
+        assert sold_out is None
+        assert {first.token_id, second.token_id, third.token_id} == set(token_ids)
+        assert first.expiry == clock.now + RESERVATION_TTL
+        assert (first.payload, first.signature) == generate_fund_request(
+            first.token_id, first.expiry, 100, KEY, WALLETS[0]
+        )
+        assert service.reserve(WALLETS[0]) == first
+
+        service.mark_sold([second.token_id])
+        # `fund` rejects a reservation once `expiry` is not after the block time
+        clock.now = first.expiry
+        assert service.reserve(WALLETS[0]) is None
+        clock.now = first.expiry + RELEASE_GRACE
+        renewed = service.reserve(WALLETS[0])
+        other = service.reserve(WALLETS[4])
+        assert {renewed.token_id, other.token_id} == {first.token_id, third.token_id}
+        assert service.reserve(WALLETS[1]) is None
+        assert service.available() == 0
+
+
+def test_mark_sold_warm_token():
+    token_ids = sale_token_ids(4)
+    with ReservationService(token_ids, 100, KEY, workers=1, warm_size=2) as service:
+        # Sold while waiting in the warm queue and in the inventory
+        service.mark_sold(token_ids[:1] + token_ids[3:])
+        assert service.available() == 2
+        reservations = service.reserve_many(WALLETS[:3])
+    assert [r.token_id for r in reservations[:2]] == token_ids[1:3]
+    assert reservations[2] is None
+
+
+def test_reservation_funds_land(admin: LocalAccount, alice: Account):
+    land_fund = deploy_sale(admin)
+    land = Contract.from_abi("HighriseLand", land_fund.landContract(), HighriseLand.abi)
+    minted, unsold = sale_token_ids(2)
+    land.mint(admin, minted, {"from": admin}).wait(1)
+    price = get_wei_land_price()
+    with ReservationService.from_chain(
+        land, (0, 0), (0, 1), price, admin.private_key, workers=1, clock=chain.time
+    ) as service:
+        assert service.available() == 1
+        reservation = service.reserve(alice.address)
+    assert reservation.token_id == unsold
+    land_fund.fund(
+        reservation.payload, reservation.signature, {"from": alice, "value": price}
+    ).wait(1)
+    assert land.ownerOf(unsold) == alice
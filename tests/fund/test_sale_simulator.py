@@ -0,0 +1,50 @@
+from brownie.network.account import LocalAccount
+
+from scripts.sale_simulator import (
+    FundResult,
+    SaleConfig,
+    deploy_sale,
+    percentile,
+    simulate,
+    summarize,
+)
+
+
+def test_summarize():
+    results = [
+        FundResult(1, True, None, 1.0, 10, 150_000),
+        FundResult(2, True, None, 3.0, 10, 150_000),
+        FundResult(3, True, None, 2.0, 11, 150_000),
+        FundResult(1, False, "ERC721: token already minted", 2.5, 11, 90_000),
+        FundResult(4, False, "Reservation expired", 0.5, 12, 30_000),
+    ]
+    report = summarize(results)
+    assert report.submitted == 5
+    assert report.success_rate == 0.6
+    assert report.latency[50] == 2.0
+    assert report.latency[99] == 3.0
+    assert report.reverts == {
+        "ERC721: token already minted": 1,
+        "Reservation expired": 1,
+    }
+    assert report.per_block == {10: 2, 11: 1}
+    assert percentile([], 50) == 0.0
+
+
+def test_simulate_sale(admin: LocalAccount):
+    land_fund = deploy_sale(admin)
+    sale = SaleConfig(
+        wallets=40, concurrency=8, expired=0.25, wrong_amount=0.25, duplicate=0.25
+    )
+    report = simulate(land_fund, admin, sale)
+    print(report)
+    assert report.submitted == 40
+    assert report.succeeded + sum(report.reverts.values()) == 40
+    assert sum(report.per_block.values()) == report.succeeded
+    assert report.reverts["Reservation expired"] > 0
+    assert report.reverts["Amount sent does not match land price"] > 0
+    assert set(report.reverts) <= {
+        "Reservation expired",
+        "Amount sent does not match land price",
+        "ERC721: token already minted",
+    }
@@ -0,0 +1,140 @@
+from brownie import chain, exceptions
+from brownie.network.account import Account, LocalAccount
+from eth_account import Account as EthAccount
+
+from scripts.common import get_wei_land_price
+from scripts.land_withdrawal import (
+    generate_batch_withdrawal_requests,
+    generate_withdrawal_request,
+)
+from scripts.mint import generate_fund_request
+from scripts.sale_simulator import deploy_sale
+from scripts.signature_check import (
+    FundSubmission,
+    WithdrawalSubmission,
+    check_fund,
+    check_fund_batch,
+    check_withdrawal,
+    check_withdrawal_batch,
+)
+
+SECP256K1_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+NOW = 1_700_000_000
+PRICE = 10**16
+
+KEY, OTHER_KEY = "0x" + "11" * 32, "0x" + "22" * 32
+
+signer = EthAccount.from_key(KEY)
+other_signer = EthAccount.from_key(OTHER_KEY)
+buyer = "0x" + "b" * 40
+
+
+def malleable(signature: bytes) -> bytes:
+    """The other valid secp256k1 signature of the same message."""
+    r, s, v = signature[:32], int.from_bytes(signature[32:64], "big"), signature[64]
+    return r + (SECP256K1_N - s).to_bytes(32, "big") + bytes([55 - v])
+
+
+def compact(signature: bytes) -> bytes:
+    """EIP-2098 form of a 65 byte signature."""
+    s = int.from_bytes(signature[32:64], "big")
+    return signature[:32] + (s | (signature[64] - 27) << 255).to_bytes(32, "big")
+
+
+def submission(
+    expiry: int = NOW + 60, cost: int = PRICE, key: str = KEY, **kwargs
+) -> FundSubmission:
+    payload, signature = generate_fund_request(1, expiry, cost, key, buyer)
+    return FundSubmission(payload, signature, buyer, cost)._replace(**kwargs)
+
+
+def test_check_fund():
+    valid = submission()
+    assert check_fund(valid, signer.address, now=NOW) is None
+    assert check_fund(valid, signer.address, now=NOW, price=PRICE) is None
+    compact_signature = valid._replace(signature=compact(valid.signature))
+    assert check_fund(compact_signature, signer.address, now=NOW) is None
+
+    cases = [
+        (submission(key=OTHER_KEY), "Payload verification failed"),
+        (
+            valid._replace(signature=malleable(valid.signature)),
+            "ECDSA: invalid signature 's' value",
+        ),
+        (
+            valid._replace(signature=valid.signature[:64] + bytes([1])),
+            "ECDSA: invalid signature 'v' value",
+        ),
+        (
+            valid._replace(signature=valid.signature[:63]),
+            "ECDSA: invalid signature length",
+        ),
+        (
+            valid._replace(signature=bytes(64) + bytes([27])),
+            "ECDSA: invalid signature",
+        ),
+        (valid._replace(sender="0x" + "c" * 40), "Sender not approved to buy token"),
+        (submission(expiry=NOW), "Reservation expired"),
+        (valid._replace(value=PRICE - 1), "Amount sent does not match land price"),
+    ]
+    for case, reason in cases:
+        assert check_fund(case, signer.address, now=NOW) == reason
+    assert check_fund(valid, signer.address, now=NOW, min_validity=60) == (
+        "Reservation expired"
+    )
+    assert check_fund(submission(cost=2 * PRICE), signer.address, NOW, price=PRICE) == (
+        "Cost does not match land price"
+    )
+
+    batch = [valid, *(case for case, _ in cases)] * 50
+    assert check_fund_batch(batch, signer.address, now=NOW, workers=2) == [
+        check_fund(s, signer.address, now=NOW) for s in batch
+    ]
+
+
+def test_check_withdrawal():
+    single = WithdrawalSubmission(*generate_withdrawal_request(1, buyer, KEY), buyer)
+    [batch] = generate_batch_withdrawal_requests([1, 2, 3], buyer, KEY)
+    batch = WithdrawalSubmission(*batch, buyer, batch=True)
+    assert check_withdrawal(single, signer.address) is None
+    assert check_withdrawal(batch, signer.address) is None
+    assert check_withdrawal(single, other_signer.address) == (
+        "HLW: Payload verification failed"
+    )
+    assert check_withdrawal(batch._replace(batch=False), signer.address) == (
+        "HLW: Sender not approved to buy token"
+    )
+    assert check_withdrawal_batch([single, batch], signer.address, workers=2) == [
+        None,
+        None,
+    ]
+
+
+def test_check_matches_fund_reverts(admin: LocalAccount, alice: Account):
+    land_fund = deploy_sale(admin)
+    price = get_wei_land_price()
+    now = chain.time()
+    payload, signature = generate_fund_request(
+        1, now + 600, price, admin.private_key, alice.address
+    )
+    valid = FundSubmission(payload, signature, alice.address, price)
+    expired_payload, expired_signature = generate_fund_request(
+        1, now - 1, price, admin.private_key, alice.address
+    )
+    submissions = [
+        valid._replace(signature=malleable(signature)),
+        valid._replace(signature=signature[:64] + bytes([1])),
+        valid._replace(value=price - 1),
+        valid._replace(payload=expired_payload, signature=expired_signature),
+        valid,
+    ]
+    for item in submissions:
+        reason = check_fund(item, admin.address, now=now)
+        try:
+            land_fund.fund(
+                item.payload, item.signature, {"from": alice, "value": item.value}
+            )
+            revert_msg = None
+        except exceptions.VirtualMachineError as e:
+            revert_msg = e.revert_msg
+        assert revert_msg == reason
@@ -2,8 +2,10 @@ import pytest
 from brownie import (
     Contract,
     HighriseEstate,
+    HighriseEstateV2,
     HighriseLand,
     HighriseLandV2,
+    HighriseLandV3,
     config,
     network,
 )
@@ -133,3 +135,99 @@ def estate_with_land_upgrade(
         Contract.from_abi("HighriseLandV2", land_proxy.address, HighriseLandV2.abi),
         token_ids,
     )
+
+
+@pytest.fixture
+def land_v2_contract(
+    admin: LocalAccount,
+    opensea_proxy_registry: ProjectContract,
+    oz: Project,
+) -> ProjectContract:
+    land_v2 = HighriseLandV2.deploy({"from": admin})
+    land_encoded_initializer_function = encode_function_data(
+        land_v2.initialize,
+        LAND_NAME,
+        LAND_SYMBOL,
+        LAND_BASE_TOKEN_URI,
+        opensea_proxy_registry.address,
+    )
+    proxy_admin = oz.ProxyAdmin.deploy({"from": admin})
+    land_proxy = oz.TransparentUpgradeableProxy.deploy(
+        land_v2.address,
+        proxy_admin.address,
+        land_encoded_initializer_function,
+        {"from": admin, "gas_limit": 2000000},
+    )
+    return Contract.from_abi("HighriseLandV2", land_proxy.address, HighriseLandV2.abi)
+
+
+@pytest.fixture
+def estate_v1_with_land_v1(
+    admin: LocalAccount,
+    estate_contract_impl: ProjectContract,
+    land_contract_impl: ProjectContract,
+    opensea_proxy_registry: ProjectContract,
+    oz: Project,
+) -> tuple[ProjectContract, ProjectContract, ProjectContract]:
+    """Land and estate proxies with initial implementations, sharing a proxy admin."""
+    proxy_admin = oz.ProxyAdmin.deploy({"from": admin})
+    land_encoded_initializer_function = encode_function_data(
+        land_contract_impl.initialize,
+        LAND_NAME,
+        LAND_SYMBOL,
+        LAND_BASE_TOKEN_URI,
+        opensea_proxy_registry.address,
+    )
+    land_proxy = oz.TransparentUpgradeableProxy.deploy(
+        land_contract_impl.address,
+        proxy_admin.address,
+        land_encoded_initializer_function,
+        {"from": admin, "gas_limit": 2000000},
+    )
+    estate_encoded_initializer_function = encode_function_data(
+        estate_contract_impl.initialize,
+        ESTATE_NAME,
+        ESTATE_SYMBOL,
+        ESTATE_BASE_TOKEN_URI,
+        land_proxy.address,
+        opensea_proxy_registry.address,
+    )
+    estate_proxy = oz.TransparentUpgradeableProxy.deploy(
+        estate_contract_impl.address,
+        proxy_admin.address,
+        estate_encoded_initializer_function,
+        {"from": admin, "gas_limit": 2000000},
+    )
+    return (
+        Contract.from_abi("HighriseEstate", estate_proxy.address, HighriseEstate.abi),
+        Contract.from_abi("HighriseLand", land_proxy.address, HighriseLand.abi),
+        proxy_admin,
+    )
+
+
+@pytest.fixture
+def estate_v2_with_land_v3(
+    admin: LocalAccount,
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+) -> tuple[ProjectContract, ProjectContract]:
+    """Land and estate proxies deployed with initial implementations and
+    upgraded to the latest ones, as done on live networks.
+    """
+    estate_proxy, land_proxy, proxy_admin = estate_v1_with_land_v1
+    land_v3 = HighriseLandV3.deploy({"from": admin})
+    upgrade(admin, land_proxy, land_v3.address, proxy_admin_contract=proxy_admin).wait(
+        1
+    )
+    estate_v2 = HighriseEstateV2.deploy({"from": admin})
+    upgrade(
+        admin, estate_proxy, estate_v2.address, proxy_admin_contract=proxy_admin
+    ).wait(1)
+
+    land = Contract.from_abi("HighriseLandV3", land_proxy.address, HighriseLandV3.abi)
+    land.setEstateContract(estate_proxy, {"from": admin}).wait(1)
+    return (
+        Contract.from_abi(
+            "HighriseEstateV2", estate_proxy.address, HighriseEstateV2.abi
+        ),
+        land,
+    )
@@ -0,0 +1,252 @@
+from typing import NamedTuple
+
+from brownie import (
+    Contract,
+    HighriseEstate,
+    HighriseEstateV2,
+    HighriseLand,
+    HighriseLandV2,
+    HighriseLandV3,
+    LandFuzzBatch,
+    exceptions,
+)
+from brownie.network.account import LocalAccount
+from brownie.network.contract import ContractContainer, ProjectContract
+from hypothesis import strategies as st
+
+from scripts.common import encode_function_data
+from scripts.coordinates import (
+    coordinates_to_token_id,
+    estate_parcels,
+    estate_token_id,
+)
+from scripts.helpers import Project
+
+from .. import (
+    ESTATE_BASE_TOKEN_URI,
+    ESTATE_NAME,
+    ESTATE_SYMBOL,
+    LAND_BASE_TOKEN_URI,
+    LAND_NAME,
+    LAND_SYMBOL,
+)
+
+# Fuzzed map is GRID x GRID parcels, estates are 3x3 and may overlap
+GRID = 6
+ACTORS = 4
+# Operations sent in a single batch transaction
+BATCH_SIZE = 16
+PARCELS = [coordinates_to_token_id((x, y)) for x in range(GRID) for y in range(GRID)]
+ESTATE_ORIGINS = [(x, y) for x in range(GRID - 2) for y in range(GRID - 2)]
+ESTATE_OPERATIONS = ("mintEstate", "burnEstate")
+# Land and estate implementations sharing a proxy, in upgrade order
+IMPLEMENTATIONS = [
+    (HighriseLand, HighriseEstate),
+    (HighriseLandV2, HighriseEstate),
+    (HighriseLandV3, HighriseEstateV2),
+]
+
+actor = st.integers(min_value=0, max_value=ACTORS - 1)
+parcel = st.sampled_from(PARCELS)
+estate_origin = st.sampled_from(ESTATE_ORIGINS)
+operation = st.one_of(
+    st.tuples(st.just("mint"), actor, parcel),
+    st.tuples(st.just("transferFrom"), actor, actor, actor, parcel),
+    st.tuples(st.just("safeTransferFrom"), actor, actor, actor, parcel),
+    st.tuples(st.just("approve"), actor, actor, parcel),
+    st.tuples(st.just("setApprovalForAll"), actor, actor, st.booleans()),
+    st.tuples(st.just("mintEstate"), actor, estate_origin),
+    st.tuples(st.just("burnEstate"), actor, estate_origin),
+)
+
+
+class Deployment(NamedTuple):
+    name: str
+    land: ProjectContract
+    estate: ProjectContract
+    batch: ProjectContract
+    actors: list[str]
+    # Deployment addresses by role, so that events of deployments compare equal
+    names: dict[str, str]
+
+
+def deploy(
+    land_container: ContractContainer,
+    estate_container: ContractContainer,
+    admin: LocalAccount,
+    registry: ProjectContract,
+    oz: Project,
+) -> Deployment:
+    proxy_admin = oz.ProxyAdmin.deploy({"from": admin})
+    land_impl = land_container.deploy({"from": admin})
+    land_proxy = oz.TransparentUpgradeableProxy.deploy(
+        land_impl,
+        proxy_admin,
+        encode_function_data(
+            land_impl.initialize,
+            LAND_NAME,
+            LAND_SYMBOL,
+            LAND_BASE_TOKEN_URI,
+            registry.address,
+        ),
+        {"from": admin, "gas_limit": 2000000},
+    )
+    land = Contract.from_abi(land_container._name, land_proxy, land_container.abi)
+    estate_impl = estate_container.deploy({"from": admin})
+    estate_proxy = oz.TransparentUpgradeableProxy.deploy(
+        estate_impl,
+        proxy_admin,
+        encode_function_data(
+            estate_impl.initialize,
+            ESTATE_NAME,
+            ESTATE_SYMBOL,
+            ESTATE_BASE_TOKEN_URI,
+            land.address,
+            registry.address,
+        ),
+        {"from": admin, "gas_limit": 2000000},
+    )
+    estate = Contract.from_abi(
+        estate_container._name, estate_proxy, estate_container.abi
+    )
+    if hasattr(land, "setEstateContract"):
+        land.setEstateContract(estate, {"from": admin}).wait(1)
+    batch = LandFuzzBatch.deploy(ACTORS, {"from": admin})
+    actors = [batch.actors(i) for i in range(ACTORS)]
+    land.grantRole(land.MINTER_ROLE(), actors[0], {"from": admin}).wait(1)
+    names = {land.address: "land", estate.address: "estate", batch.address: "batch"}
+    names.update({a: f"actor{i}" for i, a in enumerate(actors)})
+    return Deployment(
+        f"{land_container._name}+{estate_container._name}",
+        land,
+        estate,
+        batch,
+        actors,
+        names,
+    )
+
+
+def calls(deployment: Deployment, operation: tuple) -> list[tuple]:
+    """Batch calls of a fuzzed operation, `(actor, target, calldata)`."""
+    land, estate, actors = deployment.land, deployment.estate, deployment.actors
+    kind, *args = operation
+    if kind == "mint":
+        to, token_id = args
+        return [(0, land, land.mint.encode_input(actors[to], token_id))]
+    if kind == "transferFrom":
+        sender, owner, to, token_id = args
+        data = land.transferFrom.encode_input(actors[owner], actors[to], token_id)
+        return [(sender, land, data)]
+    if kind == "safeTransferFrom":
+        sender, owner, to, token_id = args
+        data = land.safeTransferFrom["address,address,uint256"].encode_input(
+            actors[owner], actors[to], token_id
+        )
+        return [(sender, land, data)]
+    if kind == "approve":
+        sender, to, token_id = args
+        return [(sender, land, land.approve.encode_input(actors[to], token_id))]
+    if kind == "setApprovalForAll":
+        sender, operator, approved = args
+        data = land.setApprovalForAll.encode_input(actors[operator], approved)
+        return [(sender, land, data)]
+    sender, origin = args
+    parcels = estate_parcels(origin, 3)
+    if kind == "mintEstate":
+        return [
+            (sender, land, land.approve.encode_input(estate, p)) for p in parcels
+        ] + [(sender, estate, estate.mintFromParcels.encode_input(parcels))]
+    return [(sender, estate, estate.burn.encode_input(estate_token_id(parcels)))]
+
+
+def normalize(value, names: dict[str, str]):
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(v, names) for v in value)
+    if isinstance(value, str):
+        return names.get(value, value)
+    return value
+
+
+def events(deployment: Deployment, transaction) -> list[tuple]:
+    return [
+        (
+            deployment.names.get(event.address, event.address),
+            event.name,
+            tuple((k, normalize(v, deployment.names)) for k, v in event.items()),
+        )
+        for event in transaction.events
+    ]
+
+
+def owner_of(contract: ProjectContract, token_id: int):
+    try:
+        return contract.ownerOf(token_id)
+    except exceptions.VirtualMachineError:
+        return None
+
+
+class DifferentialMachine:
+    """Sends the same random batches of operations to every implementation."""
+
+    def __init__(cls, deployments: list[Deployment], admin: LocalAccount):
+        cls.deployments = deployments
+        cls.admin = admin
+
+    def setup(self):
+        self.parcels = set()
+        self.estates = set()
+
+    def rule_batch(
+        self, operations=st.lists(operation, min_size=1, max_size=BATCH_SIZE)
+    ):
+        results = []
+        for deployment in self.deployments:
+            batch_calls = [c for o in operations for c in calls(deployment, o)]
+            transaction = deployment.batch.run(batch_calls, {"from": self.admin})
+            results.append((deployment.name, events(deployment, transaction)))
+        reference_name, reference = results[0]
+        for name, result in results[1:]:
+            assert result == reference, f"{name} events differ from {reference_name}"
+        for kind, *args in operations:
+            if kind in ESTATE_OPERATIONS:
+                parcels = estate_parcels(args[-1], 3)
+                self.parcels.update(parcels)
+                self.estates.add(estate_token_id(parcels))
+            elif kind != "setApprovalForAll":
+                self.parcels.add(args[-1])
+
+    def teardown(self):
+        owners = []
+        for deployment in self.deployments:
+            owners.append(
+                (
+                    {
+                        t: normalize(owner_of(deployment.land, t), deployment.names)
+                        for t in self.parcels
+                    },
+                    {
+                        t: normalize(owner_of(deployment.estate, t), deployment.names)
+                        for t in self.estates
+                    },
+                )
+            )
+        for deployment, deployment_owners in zip(self.deployments[1:], owners[1:]):
+            assert deployment_owners == owners[0], f"{deployment.name} owners differ"
+
+
+def test_differential_fuzz(
+    state_machine,
+    admin: LocalAccount,
+    opensea_proxy_registry: ProjectContract,
+    oz: Project,
+):
+    deployments = [
+        deploy(land, estate, admin, opensea_proxy_registry, oz)
+        for land, estate in IMPLEMENTATIONS
+    ]
+    state_machine(
+        DifferentialMachine,
+        deployments,
+        admin,
+        settings={"max_examples": 50, "stateful_step_count": 5},
+    )
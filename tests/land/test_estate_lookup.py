@@ -0,0 +1,40 @@
+from scripts.coordinates import coordinates_to_token_id, estate_parcels
+from scripts.estate_lookup import EstateLookup, region_token_ids
+
+
+class FakeEstate:
+    def __init__(self, estates: dict[int, list[int]]):
+        self.estates = estates
+        self.lookups = 0
+
+    def parcelToEstate(self, token_id: int) -> tuple[bool, int]:
+        self.lookups += 1
+        for estate_id, parcels in self.estates.items():
+            if token_id in parcels:
+                return True, estate_id
+        return False, 0
+
+    def estatesToParcels(self, token_id: int, index: int) -> int:
+        return self.estates[token_id][index]
+
+
+def test_region_token_ids():
+    token_ids = region_token_ids((-1, -1), (1, 0))
+    assert len(token_ids) == 6
+    assert token_ids[0] == coordinates_to_token_id((-1, -1))
+    assert token_ids[-1] == coordinates_to_token_id((1, 0))
+
+
+def test_resolve_region():
+    estates = {}
+    for coords, size in [((0, 0), 6), ((-3, 6), 3)]:
+        parcels = estate_parcels(coords, size)
+        estates[parcels[(size - 1) * size]] = parcels
+    contract = FakeEstate(estates)
+    resolved = EstateLookup(contract, chunk_size=4).resolve_region((-5, -5), (10, 10))
+    assert len(resolved) == 16 * 16
+    for token_id, estate_id in resolved.items():
+        expected = next((e for e, p in estates.items() if token_id in p), None)
+        assert estate_id == expected
+    # Parcels of a found estate are not looked up again
+    assert contract.lookups < 16 * 16 - 36
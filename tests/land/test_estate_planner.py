@@ -0,0 +1,80 @@
+import pytest
+
+from scripts.coordinates import estate_parcels
+from scripts.estate_planner import PLAN_ESTATE, PLAN_LAND, Square, plan
+
+
+def estates_of(*squares: tuple[tuple[int, int], int]) -> dict[int, list[int]]:
+    return {
+        Square(*coords, size).token_id: estate_parcels(coords, size)
+        for coords, size in squares
+    }
+
+
+def test_square():
+    square = Square.from_parcels(estate_parcels((-3, 6), 6))
+    assert square == Square(-3, 6, 6)
+    assert square.parcels == estate_parcels((-3, 6), 6)
+    assert square.token_id == square.parcels[30]
+    assert square.overlaps(Square(2, 11, 3))
+    assert not square.overlaps(Square(3, 6, 3))
+    assert not square.overlaps(Square(-3, 12, 3))
+
+
+def test_merge():
+    estates = estates_of(((0, 0), 3), ((3, 0), 3), ((0, 3), 3), ((3, 3), 3))
+    result = plan(estates, [((0, 0), 6)])
+    # Parcels stay in the estate contract, nothing to pull or return
+    assert [o.method for o in result.operations] == ["reshape"]
+    source_ids, shapes = result.operations[0].args
+    assert sorted(source_ids) == sorted(estates)
+    assert shapes == [estate_parcels((0, 0), 6)]
+    assert result.gas < result.naive_gas / 4
+
+
+def test_split_and_resize():
+    estates = estates_of(((0, 0), 6))
+    result = plan(estates, [((0, 0), 3), ((3, 3), 3)])
+    assert [o.method for o in result.operations] == ["reshape"]
+
+    # Growing pulls only the 45 new parcels, with a single grant
+    result = plan(estates, [((0, 0), 9)])
+    assert [(o.contract, o.method) for o in result.operations] == [
+        (PLAN_LAND, "grantEstateTransfer"),
+        (PLAN_ESTATE, "reshape"),
+    ]
+    assert result.gas < result.naive_gas
+    # Growing down and right keeps the estate ID and rewrites parcels in place
+    result = plan(estates, [((0, -3), 9)])
+    assert Square(0, -3, 9).token_id in estates
+    assert result.gas < result.naive_gas / 2
+    result = plan(estates, [((0, 0), 9)], granted=False)
+    assert result.operations[0].method == "approveForTransfer"
+    assert len(result.operations[0].args[0]) == 81 - 36
+
+
+def test_untouched_estates():
+    estates = estates_of(((0, 0), 3), ((30, 30), 3))
+    assert plan(estates, [((0, 0), 3)]).operations == []
+    result = plan(estates, [((-3, 0), 3)])
+    # Disjoint target is a plain mint
+    assert [o.method for o in result.operations] == [
+        "grantEstateTransfer",
+        "mintFromParcels",
+    ]
+    assert result.gas == result.naive_gas
+
+
+def test_independent_groups():
+    estates = estates_of(((0, 0), 3), ((3, 0), 3), ((0, 3), 3), ((3, 3), 3))
+    estates.update(estates_of(((30, 30), 6)))
+    result = plan(estates, [((0, 0), 6), ((30, 30), 3)])
+    reshapes = [o.args for o in result.operations if o.method == "reshape"]
+    assert sorted(len(source_ids) for source_ids, _ in reshapes) == [1, 4]
+
+
+def test_invalid_targets():
+    with pytest.raises(ValueError):
+        plan({}, [((0, 0), 4)])
+    with pytest.raises(ValueError):
+        plan({}, [((0, 0), 6), ((3, 3), 3)])
@@ -0,0 +1,99 @@
+import pytest
+
+from scripts.coordinates import estate_parcels
+from scripts.estate_planner import PLAN_LAND, GasCosts, plan
+from scripts.gas_model import (
+    GRANTED_MINT,
+    GasModel,
+    OperationGas,
+    Sample,
+    approval_transactions,
+    batch,
+    mint_transactions,
+    plan_transactions,
+    schedule,
+)
+
+MODEL = GasModel(
+    {
+        "mint": OperationGas(100_000),
+        "approveForTransfer": OperationGas(25_000, 28_000),
+        "grantEstateTransfer": OperationGas(46_000),
+        "mintFromParcels": OperationGas(120_000, 60_000),
+        GRANTED_MINT: OperationGas(125_000, 55_000),
+        "burn": OperationGas(60_000, 35_000),
+    }
+)
+
+
+def test_fit(tmp_path):
+    samples = [Sample("mint", 1, gas) for gas in (99_000, 101_000)]
+    samples += [
+        Sample("approveForTransfer", units, 25_000 + 28_000 * units)
+        for units in (9, 36, 81)
+    ]
+    model = GasModel.fit(samples)
+    assert model["mint"] == OperationGas(100_000)
+    assert model["approveForTransfer"] == OperationGas(25_000, 28_000)
+    assert model.estimate("approveForTransfer", 10) == 305_000
+    with pytest.raises(ValueError):
+        model.estimate("burn")
+
+    model.save(tmp_path / "gas.json")
+    assert GasModel.load(tmp_path / "gas.json").operations == model.operations
+
+
+def test_estate_costs():
+    costs = MODEL.estate_costs()
+    defaults = GasCosts()
+    assert costs.approve == 28_000
+    assert costs.grant == 46_000
+    assert costs.pull == 60_000 - defaults.fresh_slot
+    assert costs.release == 35_000
+    assert costs.fresh_slot == defaults.fresh_slot
+    assert MODEL.estate_costs(granted=True).pull == 55_000 - defaults.fresh_slot
+    assert GasModel().estate_costs() == defaults
+
+
+def test_batch():
+    token_ids = list(range(100))
+    # 35 approvals fit under 1M gas, 100 go in three even transactions
+    transactions = approval_transactions(MODEL, token_ids, "0x1", 1_000_000)
+    assert [len(t.args[1]) for t in transactions] == [34, 33, 33]
+    assert sum((t.args[1] for t in transactions), []) == token_ids
+    assert all(t.gas <= 1_000_000 for t in transactions)
+
+    transactions = mint_transactions(MODEL, token_ids[:3], "0x1", 1_000_000)
+    assert [t.args for t in transactions] == [("0x1", 0), ("0x1", 1), ("0x1", 2)]
+
+    assert batch(MODEL, PLAN_LAND, "grantEstateTransfer", [1, 2], 1_000_000)[
+        0
+    ].args == ([1, 2],)
+    with pytest.raises(ValueError):
+        batch(MODEL, PLAN_LAND, "mint", token_ids, 50_000)
+
+
+def test_schedule():
+    transactions = mint_transactions(MODEL, list(range(1000)), "0x1", 30_000_000)
+    blocks = schedule(transactions, 30_000_000)
+    # 270 mints fit in 90% of a block
+    assert [len(block) for block in blocks] == [270, 270, 270, 190]
+    assert [t for block in blocks for t in block] == transactions
+    with pytest.raises(ValueError):
+        schedule(transactions, 100_000)
+
+
+def test_plan_transactions():
+    parcels = estate_parcels((0, 0), 12)
+    result = plan({}, [((0, 0), 12)], MODEL.estate_costs(), granted=False)
+    mint_gas = result.operations[1].gas
+    transactions = plan_transactions(result, MODEL, "0x1", mint_gas)
+    assert [t.method for t in transactions] == ["approveForTransfer", "mintFromParcels"]
+    # Approvals are split, estate mint is sent whole
+    with pytest.raises(ValueError):
+        plan_transactions(result, MODEL, "0x1", mint_gas - 1)
+    approvals = result._replace(operations=result.operations[:1])
+    transactions = plan_transactions(approvals, MODEL, "0x1", 2_500_000)
+    assert transactions == approval_transactions(MODEL, parcels, "0x1", 2_500_000)
+    assert [t.args[0] for t in transactions] == ["0x1", "0x1"]
+    assert transactions[0].args[1] + transactions[1].args[1] == parcels
@@ -0,0 +1,200 @@
+from typing import Optional
+
+import pytest
+from brownie import chain
+from brownie.network.contract import ProjectContract
+
+from scripts.coordinates import (
+    MAX_COORD,
+    MIN_COORD,
+    coordinates_to_token_id,
+    estate_parcels,
+    estate_token_id,
+    map_token_ids,
+    token_id_to_coordinates,
+)
+from scripts.land_metadata import (
+    ESTATE,
+    LAND,
+    MetadataReader,
+    fetch_estates,
+    publish,
+    validate,
+)
+from scripts.metadata_diff import (
+    DELETED,
+    apply,
+    build_manifest,
+    changes,
+    estate_parcels_on_chain,
+    republish,
+)
+
+from .. import ESTATE_BASE_TOKEN_URI, LAND_BASE_TOKEN_URI
+
+
+def test_coordinates_codec():
+    token_ids = list(map_token_ids())
+    assert len(token_ids) == len(set(token_ids)) == 251001
+    assert token_id_to_coordinates(token_ids[0]) == (MIN_COORD, MIN_COORD)
+    assert token_id_to_coordinates(token_ids[-1]) == (MAX_COORD, MAX_COORD)
+    for coords in [(0, 0), (-6, 5), (250, -250), (-1, -1)]:
+        assert token_id_to_coordinates(coordinates_to_token_id(coords)) == coords
+    parcels = estate_parcels((0, 0), 3)
+    assert parcels == [0, 65536, 131072, 1, 65537, 131073, 2, 65538, 131074]
+    assert estate_token_id(parcels) == 2
+
+
+@pytest.mark.parametrize("out_name", ["metadata", "metadata.tar.gz"])
+def test_publish(tmp_path, out_name: str):
+    estate_ids = estate_parcels((-3, -3), 3)
+    land_token_ids = estate_parcels((-3, -3), 6)
+    estate_id = estate_token_id(estate_ids)
+    estates = {estate_id: estate_ids}
+    out = tmp_path / out_name
+    written = publish(out, estates, land_token_ids=land_token_ids, chunk_size=5)
+    assert written == len(land_token_ids) + 1
+
+    with MetadataReader(out) as reader:
+        for token_id in land_token_ids:
+            document = reader.document(LAND, token_id)
+            x, y = token_id_to_coordinates(token_id)
+            assert document["name"] == f"Highrise Land ({x}, {y})"
+            assert document["attributes"][:2] == [
+                {"trait_type": "X", "value": x},
+                {"trait_type": "Y", "value": y},
+            ]
+            in_estate = [a["value"] for a in document["attributes"][2:]]
+            assert in_estate == ([estate_id] if token_id in estate_ids else [])
+        estate = reader.document(ESTATE, estate_id)
+        assert estate["parcels"] == estate_ids
+        assert {"trait_type": "Size", "value": "3x3"} in estate["attributes"]
+        assert reader.read(LAND, coordinates_to_token_id((100, 100))) is None
+
+
+def test_validate_against_chain(
+    estate_with_land: tuple[ProjectContract, ProjectContract],
+    admin: str,
+    alice: str,
+    tmp_path,
+):
+    estate_contract, land_contract = estate_with_land
+    token_ids = estate_parcels((0, 0), 3)
+    for token_id in token_ids:
+        land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+        land_contract.approve(estate_contract.address, token_id, {"from": alice})
+    estate_contract.mintFromParcels(token_ids, {"from": alice}).wait(1)
+    land_contract.mint(alice, coordinates_to_token_id((5, 5)), {"from": admin})
+
+    estates = fetch_estates(estate_contract)
+    assert estates == {estate_token_id(token_ids): token_ids}
+    land_token_ids = token_ids + [coordinates_to_token_id((5, 5))]
+    publish(tmp_path, estates, land_token_ids=land_token_ids, workers=2)
+    arguments = dict(
+        land_base_uri=LAND_BASE_TOKEN_URI,
+        estate_base_uri=ESTATE_BASE_TOKEN_URI,
+        sample_size=20,
+        seed=1,
+    )
+    assert validate(tmp_path, land_contract, estate_contract, **arguments) == []
+
+    # Missing document is reported
+    (tmp_path / "land" / "00" / "0").unlink()
+    errors = validate(tmp_path, land_contract, estate_contract, **arguments)
+    assert errors == ["Land 0: document missing"]
+
+
+class BurnedEstate:
+    def __init__(self, parcel_ids: list[int]):
+        self.parcel_ids = parcel_ids
+
+    def estatesToParcels(
+        self, token_id: int, index: int, block_identifier: Optional[int] = None
+    ) -> int:
+        return self.parcel_ids[index]
+
+
+def test_estate_parcels_from_first_parcel():
+    for coords, size in [((0, 0), 3), ((-6, -6), 12), ((247, 241), 9)]:
+        parcels = estate_parcels(coords, size)
+        contract = BurnedEstate(parcels)
+        assert estate_parcels_on_chain(contract, estate_token_id(parcels)) == parcels
+
+
+def test_apply_skips_unchanged(tmp_path):
+    estate_ids = estate_parcels((0, 0), 3)
+    estate_id = estate_token_id(estate_ids)
+    land_token_ids = estate_parcels((0, 0), 6)
+    publish(tmp_path, {}, land_token_ids=land_token_ids, workers=1)
+    assert len(build_manifest(tmp_path)) == len(land_token_ids)
+
+    changed = {(ESTATE, estate_id): estate_ids}
+    changed.update({(LAND, p): estate_id for p in estate_ids})
+    result = apply(tmp_path, changed)
+    assert len(result.written) == 10 and result.skipped == []
+    assert apply(tmp_path, changed).skipped == result.written
+
+    # Burn, estate document removed and parcels are back to plain land
+    changed = {(ESTATE, estate_id): DELETED}
+    changed.update({(LAND, p): None for p in estate_ids})
+    result = apply(tmp_path, changed)
+    assert result.deleted == [f"estates/02/{estate_id}"]
+    assert len(result.written) == 9
+    with MetadataReader(tmp_path) as reader:
+        assert reader.read(ESTATE, estate_id) is None
+        assert len(reader.document(LAND, estate_ids[0])["attributes"]) == 2
+
+
+def test_republish_block_range(
+    estate_with_land: tuple[ProjectContract, ProjectContract],
+    admin: str,
+    alice: str,
+    tmp_path,
+):
+    estate_contract, land_contract = estate_with_land
+    first, second = estate_parcels((0, 0), 3), estate_parcels((3, 0), 3)
+    for token_id in first + second:
+        land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+        land_contract.approve(estate_contract.address, token_id, {"from": alice})
+    estate_contract.mintFromParcels(first, {"from": alice}).wait(1)
+    publish(tmp_path, fetch_estates(estate_contract), land_token_ids=first + second)
+    build_manifest(tmp_path)
+
+    from_block = chain.height + 1
+    estate_contract.burn(estate_token_id(first), {"from": alice}).wait(1)
+    estate_contract.mintFromParcels(second, {"from": alice}).wait(1)
+    result = republish(tmp_path, estate_contract, from_block)
+
+    # Only parcels of both estates and the estates themselves are touched
+    assert len(result.written) == 9 + 9 + 1
+    assert result.deleted == [f"estates/02/{estate_token_id(first)}"]
+    with MetadataReader(tmp_path) as reader:
+        assert reader.document(ESTATE, estate_token_id(second))["parcels"] == second
+
+    # Nothing changes when the same range is replayed
+    result = republish(tmp_path, estate_contract, from_block)
+    assert result.written == [] and len(result.skipped) == 19
+
+
+def test_changes_of_estate_id_minted_again(
+    estate_with_land: tuple[ProjectContract, ProjectContract],
+    admin: str,
+    alice: str,
+):
+    estate_contract, land_contract = estate_with_land
+    # Both estates have the ID of parcel (0, 2)
+    small, large = estate_parcels((0, 0), 3), estate_parcels((0, -3), 6)
+    assert estate_token_id(small) == estate_token_id(large)
+    for token_id in set(small + large):
+        land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+        land_contract.approve(estate_contract.address, token_id, {"from": alice})
+    estate_contract.mintFromParcels(small, {"from": alice}).wait(1)
+    burn = estate_contract.burn(estate_token_id(small), {"from": alice})
+    burn.wait(1)
+    for token_id in small:
+        land_contract.approve(estate_contract.address, token_id, {"from": alice})
+    estate_contract.mintFromParcels(large, {"from": alice}).wait(1)
+
+    changed = changes(estate_contract, burn.block_number, burn.block_number)
+    assert changed[(ESTATE, estate_token_id(small))] is DELETED
+    assert sorted(p for kind, p in changed if kind == LAND) == sorted(small)
@@ -0,0 +1,507 @@
+import pytest
+from brownie import (
+    Contract,
+    HighriseEstateV2,
+    HighriseLandV3,
+    ReentrantEstateOwner,
+    chain,
+    exceptions,
+    web3,
+)
+from brownie.network import accounts
+from brownie.network.account import LocalAccount
+from brownie.network.contract import ProjectContract
+
+from scripts.common import upgrade
+from scripts.coordinates import coordinates_to_token_id, estate_parcels
+from scripts.estate import mint_estate, supports_estate_transfer_grant
+from scripts.estate_lookup import EstateLookup
+from scripts.estate_planner import Square, plan
+from scripts.estate_v2 import execute_plan
+from scripts.gas_model import GasModel, calibrate, mint_transactions, schedule
+from scripts.land_metadata import ESTATE, LAND
+from scripts.metadata_diff import DELETED, changes
+
+from .. import LAND_BASE_TOKEN_URI, LAND_NAME
+
+# Storage slots of the deployed `HighriseLand`, in C3 linearization order
+# Initializable, Context, ERC165, ERC2981, ERC721, ERC721Enumerable, ERC721Royalty,
+# AccessControl, AccessControlEnumerable and contract variables
+DEFAULT_ROYALTY_SLOT = 101
+NAME_SLOT = 151
+OWNERS_SLOT = 153
+BASE_TOKEN_URI_SLOT = 401
+OPENSEA_PROXY_REGISTRY_SLOT = 402
+ERC2981_INTERFACE_ID = "0x2a55205a"
+
+
+def storage_at(contract: ProjectContract, slot: int) -> int:
+    return int.from_bytes(web3.eth.get_storage_at(contract.address, slot), "big")
+
+
+def mapping_slot(key: int, slot: int) -> int:
+    return int.from_bytes(
+        web3.keccak(key.to_bytes(32, "big") + slot.to_bytes(32, "big")), "big"
+    )
+
+
+def string_slot(value: str) -> int:
+    """Slot content of a string, inline for up to 31 bytes, length otherwise."""
+    encoded = value.encode()
+    if len(encoded) > 31:
+        return len(encoded) * 2 + 1
+    return int.from_bytes(encoded.ljust(31, b"\0") + bytes([len(encoded) * 2]), "big")
+
+
+def test_opensea_proxy_cache(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    opensea_proxy_registry: ProjectContract,
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+    charlie: LocalAccount,
+):
+    _, land_contract = estate_v2_with_land_v3
+    alice_opensea_proxy = accounts.add()
+    bob_opensea_proxy = accounts.add()
+    opensea_proxy_registry.setProxy(alice, alice_opensea_proxy, {"from": admin})
+    opensea_proxy_registry.setProxy(bob, bob_opensea_proxy, {"from": admin})
+    land_contract.mint(alice, 1, {"from": admin}).wait(1)
+    land_contract.mint(bob, 2, {"from": admin}).wait(1)
+
+    # Only admin manages the cache
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        land_contract.cacheOpenseaProxies([alice], {"from": alice})
+    assert "revert: AccessControl" in str(excinfo.value)
+    land_contract.cacheOpenseaProxies([alice], {"from": admin}).wait(1)
+    assert land_contract.openseaProxy(alice) == alice_opensea_proxy
+    assert land_contract.openseaProxy(bob) == "0x" + "0" * 40
+
+    # Registry disabled, only cached proxy is approved
+    land_contract.setOpenseaProxyRegistryEnabled(False, {"from": admin}).wait(1)
+    assert not land_contract.openseaProxyRegistryEnabled()
+    assert land_contract.isApprovedForAll(alice, alice_opensea_proxy)
+    assert not land_contract.isApprovedForAll(bob, bob_opensea_proxy)
+    land_contract.safeTransferFrom(
+        alice, charlie, 1, {"from": alice_opensea_proxy}
+    ).wait(1)
+    with pytest.raises(exceptions.VirtualMachineError):
+        land_contract.safeTransferFrom(bob, charlie, 2, {"from": bob_opensea_proxy})
+
+    # Registry enabled again
+    land_contract.setOpenseaProxyRegistryEnabled(True, {"from": admin}).wait(1)
+    land_contract.safeTransferFrom(bob, charlie, 2, {"from": bob_opensea_proxy}).wait(1)
+    assert land_contract.ownerOf(1) == land_contract.ownerOf(2) == charlie
+
+    # Only registry proxies are cached, caching again follows registry changes
+    assert not hasattr(land_contract, "setOpenseaProxy")
+    new_alice_opensea_proxy = accounts.add()
+    opensea_proxy_registry.setProxy(alice, new_alice_opensea_proxy, {"from": admin})
+    assert land_contract.isApprovedForAll(alice, alice_opensea_proxy)
+    land_contract.cacheOpenseaProxies([alice], {"from": admin}).wait(1)
+    assert land_contract.openseaProxy(alice) == new_alice_opensea_proxy
+    assert not land_contract.isApprovedForAll(alice, alice_opensea_proxy)
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        land_contract.uncacheOpenseaProxies([alice], {"from": alice})
+    assert "revert: AccessControl" in str(excinfo.value)
+    land_contract.uncacheOpenseaProxies([alice], {"from": admin}).wait(1)
+    assert land_contract.openseaProxy(alice) == "0x" + "0" * 40
+    assert land_contract.isApprovedForAll(alice, new_alice_opensea_proxy)
+
+    # Local approvals are not affected
+    land_contract.setApprovalForAll(bob, True, {"from": charlie}).wait(1)
+    assert land_contract.isApprovedForAll(charlie, bob)
+
+
+def test_transfer_gas(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    land_v2_contract: ProjectContract,
+    opensea_proxy_registry: ProjectContract,
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+    charlie: LocalAccount,
+):
+    _, land_v3_contract = estate_v2_with_land_v3
+    alice_opensea_proxy = accounts.add()
+    opensea_proxy_registry.setProxy(alice, alice_opensea_proxy, {"from": admin})
+    gas = {}
+    for version, land_contract in [("v2", land_v2_contract), ("v3", land_v3_contract)]:
+        for token_id in range(4):
+            land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+        # Owner, no enumeration bookkeeping in v3
+        tx = land_contract.safeTransferFrom(alice, charlie, 3, {"from": alice})
+        gas[f"{version} owner"] = tx.gas_used
+        # Operator approved by the owner
+        land_contract.setApprovalForAll(bob, True, {"from": alice}).wait(1)
+        tx = land_contract.safeTransferFrom(alice, charlie, 0, {"from": bob})
+        gas[f"{version} operator"] = tx.gas_used
+        # OpenSea proxy, looked up in the registry
+        tx = land_contract.safeTransferFrom(
+            alice, charlie, 1, {"from": alice_opensea_proxy}
+        )
+        gas[f"{version} registry hit"] = tx.gas_used
+    # OpenSea proxy, cached in storage
+    land_v3_contract.cacheOpenseaProxies([alice], {"from": admin}).wait(1)
+    tx = land_v3_contract.safeTransferFrom(
+        alice, charlie, 2, {"from": alice_opensea_proxy}
+    )
+    gas["v3 cached proxy"] = tx.gas_used
+    for name, gas_used in gas.items():
+        print(f"Transfer gas, {name}: {gas_used}")
+
+    # Transfers no longer update enumeration indices
+    assert gas["v3 owner"] < gas["v2 owner"]
+    # Local approval no longer pays for the registry call
+    assert gas["v3 operator"] < gas["v2 operator"]
+    # Cached proxy skips the registry call
+    assert gas["v3 cached proxy"] < gas["v3 registry hit"]
+
+
+def test_storage_layout(
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+    opensea_proxy_registry: ProjectContract,
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+):
+    _, land_contract, proxy_admin = estate_v1_with_land_v1
+    land_contract.mint(alice, 1, {"from": admin}).wait(1)
+    expected = {
+        DEFAULT_ROYALTY_SLOT: 500 << 160 | int(admin.address, 16),
+        NAME_SLOT: string_slot(LAND_NAME),
+        mapping_slot(1, OWNERS_SLOT): int(alice.address, 16),
+        BASE_TOKEN_URI_SLOT: string_slot(LAND_BASE_TOKEN_URI),
+        OPENSEA_PROXY_REGISTRY_SLOT: int(opensea_proxy_registry.address, 16),
+    }
+    # Slots are pinned against the deployed implementation
+    for slot, value in expected.items():
+        assert storage_at(land_contract, slot) == value
+
+    land_v3 = HighriseLandV3.deploy({"from": admin})
+    upgrade(
+        admin, land_contract, land_v3.address, proxy_admin_contract=proxy_admin
+    ).wait(1)
+    land_contract = Contract.from_abi(
+        "HighriseLandV3", land_contract.address, HighriseLandV3.abi
+    )
+    for slot, value in expected.items():
+        assert storage_at(land_contract, slot) == value
+    assert land_contract.ownerOf(1) == alice
+    assert land_contract.supportsInterface(ERC2981_INTERFACE_ID)
+    royalty_info = land_contract.royaltyInfo(1, 100)
+    assert royalty_info[0] == admin
+    assert royalty_info[1] == 5
+
+    # Default royalty is written to the same packed slot
+    land_contract.setDefaultRoyalty(bob, 300, {"from": admin}).wait(1)
+    assert storage_at(land_contract, DEFAULT_ROYALTY_SLOT) == 300 << 160 | int(
+        bob.address, 16
+    )
+    royalty_info = land_contract.royaltyInfo(2, 100)
+    assert royalty_info[0] == bob
+    assert royalty_info[1] == 3
+    # New variables are appended after the deployed ones
+    land_contract.setOpenseaProxyRegistryEnabled(False, {"from": admin}).wait(1)
+    assert storage_at(land_contract, OPENSEA_PROXY_REGISTRY_SLOT + 2) == 1
+
+
+def test_royalty_info_gas(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    land_v2_contract: ProjectContract,
+):
+    _, land_v3_contract = estate_v2_with_land_v3
+    v2_gas = land_v2_contract.royaltyInfo.estimate_gas(1, 100)
+    v3_gas = land_v3_contract.royaltyInfo.estimate_gas(1, 100)
+    print(f"royaltyInfo gas, v2: {v2_gas}, v3: {v3_gas}")
+    # Per-token royalty lookup is skipped
+    assert v3_gas < v2_gas
+
+
+def test_estate_transfer_grant(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+):
+    estate_contract, land_contract = estate_v2_with_land_v3
+    assert land_contract.estateContract() == estate_contract
+    parcels = estate_parcels((0, 0), 3)
+    for token_id in parcels:
+        land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        land_contract.grantEstateTransfer(chain.time() - 1, {"from": alice})
+    assert "revert: HRLAND: Grant already expired" in str(excinfo.value)
+    # Only the estate contract consumes grants
+    land_contract.grantEstateTransfer(chain.time() + 600, {"from": alice}).wait(1)
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        land_contract.transferToEstate(alice, parcels, {"from": bob})
+    assert "revert: HRLAND: Sender is not estate contract" in str(excinfo.value)
+    # Grant of another owner does not move alice's parcels
+    land_contract.grantEstateTransfer(chain.time() + 600, {"from": bob}).wait(1)
+    with pytest.raises(exceptions.VirtualMachineError):
+        estate_contract.mintFromParcels(parcels, {"from": bob})
+
+    # Single grant, no per-parcel approvals
+    tx = estate_contract.mintFromParcels(parcels, {"from": alice})
+    estate_id = tx.events["EstateMinted"]["tokenId"]
+    assert estate_contract.ownerOf(estate_id) == alice
+    for token_id in parcels:
+        assert land_contract.ownerOf(token_id) == estate_contract
+    # Grant is one-shot
+    assert land_contract.estateTransferGrant(alice) == 0
+    estate_contract.burn(estate_id, {"from": alice}).wait(1)
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        estate_contract.mintFromParcels(parcels, {"from": alice})
+    assert "revert: HRESTATE: Estate contract not approved" in str(excinfo.value)
+
+    # Expired grant falls back to per-parcel approvals
+    land_contract.grantEstateTransfer(chain.time() + 600, {"from": alice}).wait(1)
+    chain.sleep(601)
+    chain.mine()
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        estate_contract.mintFromParcels(parcels, {"from": alice})
+    assert "revert: HRESTATE: Estate contract not approved" in str(excinfo.value)
+    land_contract.approveForTransfer(estate_contract, parcels, {"from": alice}).wait(1)
+    estate_contract.mintFromParcels(parcels, {"from": alice}).wait(1)
+    assert estate_contract.ownerOf(estate_id) == alice
+
+
+def test_estate_v2_before_land_v3(
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    alice: LocalAccount,
+):
+    estate_contract, land_contract, proxy_admin = estate_v1_with_land_v1
+    estate_v2 = HighriseEstateV2.deploy({"from": admin})
+    upgrade(
+        admin, estate_contract, estate_v2.address, proxy_admin_contract=proxy_admin
+    ).wait(1)
+    assert not supports_estate_transfer_grant(land_contract.address)
+    parcels = estate_parcels((0, 0), 3)
+    for token_id in parcels:
+        land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+    # Land without grants, parcels are approved one by one
+    estate_id = mint_estate(
+        estate_contract.address, land_contract.address, parcels, alice
+    )
+    assert estate_contract.ownerOf(estate_id) == alice
+    for token_id in parcels:
+        assert land_contract.ownerOf(token_id) == estate_contract
+
+
+def test_estate_mint_gas(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    alice: LocalAccount,
+):
+    estate_contract, land_contract = estate_v2_with_land_v3
+    gas = {}
+    for flow, coords in [("approvals", (0, 0)), ("grant", (6, 0))]:
+        parcels = estate_parcels(coords, 6)
+        for token_id in parcels:
+            land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+        if flow == "approvals":
+            tx = land_contract.approveForTransfer(
+                estate_contract, parcels, {"from": alice}
+            )
+        else:
+            tx = land_contract.grantEstateTransfer(chain.time() + 600, {"from": alice})
+        gas[f"{flow} approve"] = tx.gas_used
+        tx = estate_contract.mintFromParcels(parcels, {"from": alice})
+        gas[f"{flow} mint"] = tx.gas_used
+    for name, gas_used in gas.items():
+        print(f"6x6 estate gas, {name}: {gas_used}")
+
+    assert gas["grant approve"] < gas["approvals approve"] / 10
+    assert gas["grant mint"] < gas["approvals mint"]
+
+
+def test_gas_model_calibration(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    alice: LocalAccount,
+):
+    estate_contract, land_contract = estate_v2_with_land_v3
+    samples = calibrate(estate_contract, land_contract, admin, alice)
+    model = GasModel.fit(samples)
+    for operation, gas in sorted(model.operations.items()):
+        print(f"Gas model, {operation}: {gas.base} + {gas.per_unit} per unit")
+
+    # Batch operations are linear in parcels, within 10% of every benchmark
+    for sample in samples:
+        if sample.units > 1:
+            estimate = model.estimate(sample.operation, sample.units)
+            assert abs(estimate - sample.gas) < sample.gas / 10
+    mints = mint_transactions(
+        model, estate_parcels((0, 3), 12), alice.address, chain.block_gas_limit
+    )
+    blocks = schedule(mints, chain.block_gas_limit)
+    print(f"Land mints per block: {len(blocks[0])}")
+    assert sum(len(block) for block in blocks) == 144
+
+
+def test_estate_reshape(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+):
+    estate_contract, land_contract = estate_v2_with_land_v3
+    for token_id in estate_parcels((0, -3), 9):
+        land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+    corners = [(0, 0), (3, 0), (0, 3), (3, 3)]
+    estates = {}
+    for coords in corners:
+        parcels = estate_parcels(coords, 3)
+        land_contract.grantEstateTransfer(chain.time() + 600, {"from": alice}).wait(1)
+        tx = estate_contract.mintFromParcels(parcels, {"from": alice})
+        estates[tx.events["EstateMinted"]["tokenId"]] = parcels
+    from_block = chain.height
+
+    # Merge four 3x3 estates, no parcel leaves the estate contract
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        estate_contract.merge(list(estates), estate_parcels((0, 0), 6), {"from": bob})
+    assert "revert: HRESTATE: Sender is not estate owner" in str(excinfo.value)
+    result = plan(estates, [((0, 0), 6)])
+    execute_plan(result, estate_contract.address, land_contract.address, alice)
+    merged_id = Square(0, 0, 6).token_id
+    assert estate_contract.balanceOf(alice) == 1
+    assert estate_contract.ownerOf(merged_id) == alice
+    assert (
+        estate_contract.estatesToParcels(merged_id, 35) == estate_parcels((0, 0), 6)[35]
+    )
+
+    # Grow down and right, only 45 parcels are pulled and the ID is kept
+    land_contract.grantEstateTransfer(chain.time() + 600, {"from": alice}).wait(1)
+    tx = estate_contract.reshape(
+        [merged_id], [estate_parcels((0, -3), 9)], {"from": alice}
+    )
+    print(f"Reshape 6x6 into 9x9 gas: {tx.gas_used}")
+    assert len([e for e in tx.events["Transfer"] if e["to"] == estate_contract]) == 45
+    assert estate_contract.ownerOf(merged_id) == alice
+    assert land_contract.balanceOf(alice) == 0
+
+    # Split into two estates, the rest of parcels is returned
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        estate_contract.split(
+            merged_id,
+            [estate_parcels((0, -3), 6), estate_parcels((3, 0), 3)],
+            {"from": alice},
+        )
+    assert "revert: HRESTATE: Estates overlap" in str(excinfo.value)
+    tx = estate_contract.split(
+        merged_id,
+        [estate_parcels((0, -3), 3), estate_parcels((3, 0), 6)],
+        {"from": alice},
+    )
+    returned = set(tx.events["EstateReshaped"]["returnedParcelIds"])
+    assert len(returned) == 81 - 9 - 36
+    for token_id in returned:
+        assert land_contract.ownerOf(token_id) == alice
+    assert estate_contract.balanceOf(alice) == 2
+    with pytest.raises(exceptions.VirtualMachineError):
+        estate_contract.ownerOf(merged_id)
+
+    # Metadata of returned parcels is cleared, resulting estates are rendered
+    changed = changes(estate_contract, from_block)
+    for token_id in returned:
+        assert changed[(LAND, token_id)] is None
+    assert changed[(ESTATE, Square(3, 0, 6).token_id)] == estate_parcels((3, 0), 6)
+    assert changed[(ESTATE, merged_id)] is DELETED
+
+
+def test_estate_reshape_reentrant_receiver(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    bob: LocalAccount,
+):
+    estate_contract, land_contract = estate_v2_with_land_v3
+    owner = ReentrantEstateOwner.deploy(
+        land_contract, estate_contract, bob, {"from": admin}
+    )
+    parcels = estate_parcels((0, 0), 6)
+    for token_id in parcels:
+        land_contract.mint(owner, token_id, {"from": admin}).wait(1)
+    tx = owner.mintFromParcels(parcels, {"from": admin})
+    estate_id = tx.return_value
+
+    # Split off a 3x3 with a new ID, the 6x6 is burned and 27 parcels returned
+    small = estate_parcels((0, 0), 3)
+    tx = owner.split(estate_id, [small], {"from": admin})
+    (small_id,) = tx.return_value
+    assert owner.callbacks() == 27
+    # Parcels are returned after the burn, the callbacks can't sell the 6x6
+    assert not owner.sold()
+    assert estate_contract.balanceOf(bob) == 0
+    assert estate_contract.ownerOf(small_id) == owner
+    assert land_contract.balanceOf(owner) == 27
+    with pytest.raises(exceptions.VirtualMachineError):
+        estate_contract.ownerOf(estate_id)
+
+
+def test_parcel_to_estate(
+    estate_v2_with_land_v3: tuple[ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    alice: LocalAccount,
+):
+    estate_contract, land_contract = estate_v2_with_land_v3
+    # Columns cross the -1/0 boundary of Y and share index slots
+    parcels = estate_parcels((-1, -2), 6)
+    for token_id in parcels:
+        land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+    land_contract.grantEstateTransfer(chain.time() + 600, {"from": alice}).wait(1)
+    tx = estate_contract.mintFromParcels(parcels, {"from": alice})
+    estate_id = tx.events["EstateMinted"]["tokenId"]
+    for token_id in parcels:
+        assert estate_contract.parcelToEstate(token_id) == (True, estate_id)
+    assert estate_contract.parcelToEstate(coordinates_to_token_id((-2, -2))) == (
+        False,
+        0,
+    )
+
+    # Index follows reshapes
+    tx = estate_contract.split(
+        estate_id, [estate_parcels((-1, -2), 3)], {"from": alice}
+    )
+    small_id = tx.events["EstateMinted"]["tokenId"]
+    resolved = EstateLookup(estate_contract).resolve_region((-3, -4), (6, 5))
+    for token_id, resolved_id in resolved.items():
+        expected = small_id if token_id in estate_parcels((-1, -2), 3) else None
+        assert resolved_id == expected
+
+    # Burn clears the index
+    estate_contract.burn(small_id, {"from": alice}).wait(1)
+    for token_id in parcels:
+        assert estate_contract.parcelToEstate(token_id) == (False, 0)
+
+
+def test_index_estates_after_upgrade(
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+):
+    estate_contract, land_contract, proxy_admin = estate_v1_with_land_v1
+    parcels = estate_parcels((0, 0), 3)
+    for token_id in parcels:
+        land_contract.mint(alice, token_id, {"from": admin}).wait(1)
+        land_contract.approve(estate_contract, token_id, {"from": alice}).wait(1)
+    tx = estate_contract.mintFromParcels(parcels, {"from": alice})
+    estate_id = tx.events["EstateMinted"]["tokenId"]
+
+    estate_v2 = HighriseEstateV2.deploy({"from": admin})
+    upgrade(
+        admin, estate_contract, estate_v2.address, proxy_admin_contract=proxy_admin
+    ).wait(1)
+    estate_contract = Contract.from_abi(
+        "HighriseEstateV2", estate_contract.address, HighriseEstateV2.abi
+    )
+    assert estate_contract.parcelToEstate(parcels[0]) == (False, 0)
+    # Anyone can backfill, only live estates are indexed
+    with pytest.raises(exceptions.VirtualMachineError):
+        estate_contract.indexEstates([estate_id + 1], {"from": bob})
+    estate_contract.indexEstates([estate_id], {"from": bob}).wait(1)
+    for token_id in parcels:
+        assert estate_contract.parcelToEstate(token_id) == (True, estate_id)
@@ -0,0 +1,87 @@
+from brownie import HighriseLandFund, HighriseLandV2, HighriseLandWithdrawal, web3
+from brownie.network.account import Account, LocalAccount
+from brownie.network.contract import ProjectContract
+
+from scripts.common import MINTER_ROLE, upgrade
+from scripts.helpers import Project
+from scripts.state_watcher import (
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    EventDecoder,
+    StateView,
+    StateWatcher,
+    query,
+)
+
+
+def test_state_watcher(
+    admin: LocalAccount,
+    alice: Account,
+    oz: Project,
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+):
+    estate, land, proxy_admin = estate_v1_with_land_v1
+    fund = HighriseLandFund.deploy(admin, land, {"from": admin})
+    withdrawal = HighriseLandWithdrawal.deploy(admin, land, {"from": admin})
+    view = StateView([fund.address], [withdrawal.address])
+    watcher = StateWatcher(
+        view, [fund, withdrawal, land, estate], EventDecoder.for_project(oz)
+    )
+    watcher.poll()
+    assert view.block == web3.eth.block_number
+    assert view.fund_enabled == {fund.address: False}
+    assert view.withdrawal_enabled == {withdrawal.address: False}
+    for contract in [land, estate]:
+        assert view.owner(contract.address) == admin
+        assert view.implementations[
+            contract.address
+        ] == proxy_admin.getProxyImplementation(contract)
+        assert view.admins[contract.address] == proxy_admin
+    assert view.role_members(land.address, "MINTER_ROLE") == [admin]
+
+    fund.enable({"from": admin}).wait(1)
+    withdrawal.enable({"from": admin}).wait(1)
+    land.grantRole(MINTER_ROLE, fund, {"from": admin}).wait(1)
+    land.grantRole(MINTER_ROLE, alice, {"from": admin}).wait(1)
+    land.revokeRole(MINTER_ROLE, alice, {"from": admin}).wait(1)
+    land_v2 = HighriseLandV2.deploy({"from": admin})
+    upgrade(admin, land, land_v2.address, proxy_admin_contract=proxy_admin).wait(1)
+    assert watcher.poll() == 6
+    assert view.fund_enabled[fund.address]
+    assert view.withdrawal_enabled[withdrawal.address]
+    assert view.role_members(land.address, "MINTER_ROLE") == sorted(
+        [admin.address, fund.address]
+    )
+    assert view.implementations[land.address] == land_v2
+    assert query(view, "funds") == f"{fund.address}: enabled"
+    assert query(view, f"owner {land.address}") == admin.address
+    assert watcher.poll() == 0
+
+
+def test_state_watcher_backoff(admin: LocalAccount, oz: Project):
+    view = StateView()
+    intervals = []
+
+    def sleep(interval: float):
+        intervals.append(interval)
+        if len(intervals) == 3:
+            # New block, the watcher polls at the minimal interval again
+            admin.transfer(admin, 0).wait(1)
+        if len(intervals) == 8:
+            watcher.stop()
+
+    watcher = StateWatcher(
+        view, [admin.address], EventDecoder.for_project(oz), sleep=sleep
+    )
+    watcher.run()
+    assert intervals == [
+        MIN_POLL_INTERVAL,
+        MIN_POLL_INTERVAL * 2,
+        MIN_POLL_INTERVAL * 4,
+        MIN_POLL_INTERVAL,
+        MIN_POLL_INTERVAL * 2,
+        MIN_POLL_INTERVAL * 4,
+        MIN_POLL_INTERVAL * 8,
+        MIN_POLL_INTERVAL * 16,
+    ]
+    assert max(intervals) <= MAX_POLL_INTERVAL
@@ -0,0 +1,231 @@
+from pathlib import Path
+from typing import Iterable
+
+from brownie import chain
+from brownie.network.account import LocalAccount
+from brownie.network.contract import ProjectContract
+
+from scripts.coordinates import estate_parcels
+from scripts.upgrade_rehearsal import (
+    Log,
+    Outcome,
+    RecordedTransaction,
+    StateDump,
+    compare,
+    gas_deltas,
+    record,
+    rehearse,
+    rehearse_shard,
+    restore_state,
+    shards,
+)
+
+LAND = "0x" + "1" * 40
+ALICE, BOB, CHARLIE = "0x" + "a" * 40, "0x" + "b" * 40, "0x" + "c" * 40
+TRANSFER_TOPIC = "0x" + "dd" * 32
+
+
+def topic(value: str) -> str:
+    return "0x" + value[2:].rjust(64, "0")
+
+
+def transfer(tx_hash: str, sender: str, to: str, token_id: int) -> RecordedTransaction:
+    log = Log(
+        LAND, (TRANSFER_TOPIC, topic(sender), topic(to), topic(hex(token_id))), "0x"
+    )
+    return RecordedTransaction(
+        tx_hash, sender, LAND, 0, "0x", 100_000, 50_000, 1, (log,)
+    )
+
+
+def recorded(receipt) -> RecordedTransaction:
+    return RecordedTransaction(
+        receipt.txid,
+        receipt.sender.address,
+        receipt.receiver,
+        receipt.value,
+        receipt.input,
+        receipt.gas_limit,
+        receipt.gas_used,
+        receipt.status,
+        (),
+    )
+
+
+def test_shards(tmp_path):
+    transactions = [
+        transfer("0x01", ALICE, BOB, 1),
+        transfer("0x02", CHARLIE, CHARLIE, 2),
+        # Bob moves the token he got from Alice, same shard as the first transfer
+        transfer("0x03", BOB, CHARLIE, 1),
+        transfer("0x04", "0x" + "d" * 40, "0x" + "e" * 40, 3),
+    ]
+    parts = shards(transactions, 2, [LAND])
+    assert [[t.hash for t in part] for part in parts] == [
+        ["0x01", "0x02", "0x03"],
+        ["0x04"],
+    ]
+    assert shards(transactions, 1) == [transactions]
+
+    dump = StateDump(1, {"land_proxy": LAND}, {}, transactions)
+    dump.save(tmp_path / "dump.json")
+    assert StateDump.load(tmp_path / "dump.json") == dump
+
+
+def test_compare():
+    log = Log(LAND, (TRANSFER_TOPIC,), "0x")
+    before = [
+        Outcome("0x01", "transferFrom", 1, 60_000, (log,)),
+        Outcome("0x02", "transferFrom", 1, 50_000, (log,)),
+        Outcome("0x03", "mint", 1, 120_000, ()),
+    ]
+    after = [
+        Outcome("0x01", "transferFrom", 1, 40_000, (log,)),
+        Outcome("0x02", "transferFrom", 1, 30_000, (log,)),
+        Outcome("0x03", "mint", 0, 30_000, (), "revert: Paused"),
+    ]
+    assert [(d.hash, d.field) for d in compare(before, after)] == [
+        ("0x03", "status"),
+        ("0x03", "revert_msg"),
+    ]
+    deltas = gas_deltas(before, after)
+    assert list(deltas) == ["transferFrom"]
+    assert deltas["transferFrom"].calls == 2
+    assert deltas["transferFrom"].delta == -20_000
+
+
+def test_rehearse_shard(
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+):
+    estate_contract, land_contract, proxy_admin = estate_v1_with_land_v1
+    parcels = estate_parcels((0, 0), 3)
+    receipts = [land_contract.mint(alice, t, {"from": admin}) for t in parcels]
+    receipts += [
+        land_contract.approve(estate_contract, t, {"from": alice}) for t in parcels
+    ]
+    receipts.append(estate_contract.mintFromParcels(parcels, {"from": alice}))
+    receipts.append(land_contract.mint(alice, 1, {"from": admin}))
+    receipts.append(land_contract.transferFrom(alice, bob, 1, {"from": alice}))
+    transactions = [recorded(receipt) for receipt in receipts]
+    chain.undo(len(receipts))
+    dump = StateDump(
+        chain.height,
+        {
+            "land_proxy": land_contract.address,
+            "estate_proxy": estate_contract.address,
+            "proxy_admin": proxy_admin.address,
+            "admin": admin.address,
+        },
+        {},
+        transactions,
+    )
+
+    before, after = rehearse_shard(dump, transactions)
+    assert all(outcome.status for outcome in before)
+    assert compare(before, after) == []
+    deltas = gas_deltas(before, after)
+    for function, gas in deltas.items():
+        print(f"Rehearsal gas, {function}: {gas.before:.0f} -> {gas.after:.0f}")
+    assert deltas["transferFrom"].delta < 0
+
+
+def record_dump(
+    path: Path,
+    block: int,
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+    implementations: list[ProjectContract],
+    opensea_proxy_registry: ProjectContract,
+    admin: LocalAccount,
+    transaction_hashes: Iterable[str] = (),
+) -> StateDump:
+    """Records Land and Estate state at `block` and the transactions after it."""
+    estate_contract, land_contract, proxy_admin = estate_v1_with_land_v1
+    contracts = {
+        "land_proxy": land_contract.address,
+        "estate_proxy": estate_contract.address,
+        "proxy_admin": proxy_admin.address,
+        "admin": admin.address,
+    }
+    addresses = [
+        *contracts.values(),
+        *(implementation.address for implementation in implementations),
+        opensea_proxy_registry.address,
+    ]
+    record(path, block, contracts, addresses, transaction_hashes)
+    return StateDump.load(path)
+
+
+def test_restore_state(
+    tmp_path,
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+    estate_contract_impl: ProjectContract,
+    land_contract_impl: ProjectContract,
+    opensea_proxy_registry: ProjectContract,
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+):
+    _, land_contract, _ = estate_v1_with_land_v1
+    receipts = [land_contract.mint(alice, t, {"from": admin}) for t in (1, 2)]
+    receipts.append(land_contract.transferFrom(alice, bob, 2, {"from": alice}))
+    dump = record_dump(
+        tmp_path / "dump.json",
+        chain.height,
+        estate_v1_with_land_v1,
+        [estate_contract_impl, land_contract_impl],
+        opensea_proxy_registry,
+        admin,
+    )
+    assert dump.accounts[land_contract.address]["storage"]
+
+    chain.undo(len(receipts))
+    assert land_contract.totalSupply() == 0
+    restore_state(dump)
+    assert land_contract.totalSupply() == 2
+    assert land_contract.ownerOf(1) == alice
+    assert land_contract.ownerOf(2) == bob
+    assert land_contract.balanceOf(alice) == 1
+
+
+def test_rehearse(
+    tmp_path,
+    estate_v1_with_land_v1: tuple[ProjectContract, ProjectContract, ProjectContract],
+    estate_contract_impl: ProjectContract,
+    land_contract_impl: ProjectContract,
+    opensea_proxy_registry: ProjectContract,
+    admin: LocalAccount,
+    alice: LocalAccount,
+    bob: LocalAccount,
+    charlie: LocalAccount,
+):
+    estate_contract, land_contract, _ = estate_v1_with_land_v1
+    parcels = estate_parcels((0, 0), 3)
+    for token_id in parcels:
+        land_contract.mint(alice, token_id, {"from": admin})
+    land_contract.mint(bob, 1, {"from": admin})
+    block = chain.height
+    # Alice merges her parcels while Bob, sharing nothing with her, sells his
+    receipts = [
+        land_contract.approve(estate_contract, t, {"from": alice}) for t in parcels
+    ]
+    receipts.append(estate_contract.mintFromParcels(parcels, {"from": alice}))
+    receipts.append(land_contract.transferFrom(bob, charlie, 1, {"from": bob}))
+    dump = record_dump(
+        tmp_path / "dump.json",
+        block,
+        estate_v1_with_land_v1,
+        [estate_contract_impl, land_contract_impl],
+        opensea_proxy_registry,
+        admin,
+        [receipt.txid for receipt in receipts],
+    )
+    assert len(shards(dump.transactions, 2, dump.contracts.values())) == 2
+
+    report = rehearse(tmp_path / "dump.json", shard_count=2)
+    assert report.divergences == []
+    assert report.drifted == []
+    assert report.gas["mintFromParcels"].calls == 1
+    assert report.gas["transferFrom"].calls == 1
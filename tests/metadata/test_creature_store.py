@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from scripts.creature_store import (
+    CREATURE_METADATA_DIR,
+    CreatureStore,
+    build_store,
+    creature_token_id,
+    read_creature_files,
+)
+
+
+@pytest.fixture(scope="module")
+def creature_store(tmp_path_factory) -> CreatureStore:
+    store_path = build_store(
+        store_path=tmp_path_factory.mktemp("creatures") / "creature.hrcs"
+    )
+    with CreatureStore(store_path) as store:
+        yield store
+
+
+def test_round_trip_is_byte_identical(creature_store: CreatureStore):
+    count = 0
+    for number, raw in read_creature_files():
+        assert creature_store.raw(number) == raw
+        count += 1
+    assert count == len(creature_store) == 11111
+
+
+def test_store_is_smaller_than_directory(creature_store: CreatureStore, tmp_path):
+    store_path = build_store(store_path=tmp_path / "creature.hrcs")
+    directory_size = sum(len(raw) for _, raw in read_creature_files())
+    assert store_path.stat().st_size * 10 < directory_size
+
+
+def test_lookup_by_token_id(creature_store: CreatureStore):
+    token_id = creature_token_id(1)
+    path = CREATURE_METADATA_DIR / f"{token_id}.json"
+    assert creature_store.raw_by_token_id(token_id) == path.read_bytes()
+    document = json.loads(path.read_bytes())
+    assert creature_store.traits(1) == {
+        a["trait_type"]: a["value"] for a in document["attributes"]
+    }
+    assert 11112 not in creature_store
+    with pytest.raises(KeyError):
+        creature_store.raw(11112)
+
+
+def test_invalid_store(tmp_path):
+    store_path = tmp_path / "invalid.hrcs"
+    store_path.write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError):
+        CreatureStore(store_path)
@@ -0,0 +1,84 @@
+import json
+from collections import Counter
+
+import pytest
+
+from scripts.creature_store import CreatureStore, build_store, read_creature_files
+from scripts.creature_traits import TraitIndex
+
+
+@pytest.fixture(scope="module")
+def creatures() -> dict[int, dict[str, str]]:
+    return {
+        number: {a["trait_type"]: a["value"] for a in json.loads(raw)["attributes"]}
+        for number, raw in read_creature_files()
+    }
+
+
+@pytest.fixture(scope="module")
+def trait_index() -> TraitIndex:
+    return TraitIndex.from_directory()
+
+
+def test_filters_match_json_scan(
+    trait_index: TraitIndex, creatures: dict[int, dict[str, str]]
+):
+    legendary = [n for n, t in creatures.items() if t["Rarity"] == "Legendary"]
+    assert trait_index.filter({"Rarity": "Legendary"}) == legendary
+    for hair in trait_index.frequencies("Hair"):
+        conditions = {"Hair": hair, "Rarity": "Legendary"}
+        expected = [
+            n
+            for n, t in creatures.items()
+            if t.get("Hair") == hair and t["Rarity"] == "Legendary"
+        ]
+        assert trait_index.filter(conditions) == expected
+        assert trait_index.count(conditions) == len(expected)
+    eyes = ["Round Black Eyes", "Unknown Eyes"]
+    assert trait_index.filter({"Eyes": eyes, "Aura": "None"}) == [
+        n
+        for n, t in creatures.items()
+        if t.get("Eyes") in eyes and t.get("Aura") == "None"
+    ]
+    assert trait_index.count({"Hair": "Unknown Hair"}) == 0
+    assert trait_index.count({}) == len(creatures)
+
+
+def test_frequencies_match_json_scan(
+    trait_index: TraitIndex, creatures: dict[int, dict[str, str]]
+):
+    for trait_type in trait_index.trait_types:
+        expected = Counter(t[trait_type] for t in creatures.values() if trait_type in t)
+        assert trait_index.frequencies(trait_type) == expected
+
+
+def test_rarity_scores_match_json_scan(
+    trait_index: TraitIndex, creatures: dict[int, dict[str, str]]
+):
+    total = len(creatures)
+    counts = {
+        trait_type: Counter(t.get(trait_type) for t in creatures.values())
+        for trait_type in trait_index.trait_types
+    }
+    scores = trait_index.rarity_scores()
+    for number, traits in creatures.items():
+        expected = sum(
+            total / counts[trait_type][traits.get(trait_type)]
+            for trait_type in trait_index.trait_types
+        )
+        assert scores[number] == pytest.approx(expected)
+    ranks = trait_index.rarity_ranks()
+    rarest = max(scores, key=lambda n: (scores[n], -n))
+    assert ranks[rarest] == 1
+    assert sorted(ranks.values()) == list(range(1, total + 1))
+
+
+def test_index_from_store(trait_index: TraitIndex, tmp_path):
+    with CreatureStore(build_store(store_path=tmp_path / "creature.hrcs")) as store:
+        store_index = TraitIndex.from_store(store)
+    assert store_index.numbers == trait_index.numbers
+    assert store_index.rarity_scores() == trait_index.rarity_scores()
+    for trait_type in trait_index.trait_types:
+        assert store_index.frequencies(trait_type) == trait_index.frequencies(
+            trait_type
+        )
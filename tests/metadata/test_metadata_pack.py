@@ -0,0 +1,58 @@
+import gzip
+
+import pytest
+
+from scripts.coordinates import estate_parcels, estate_token_id
+from scripts.creature_store import CREATURE_METADATA_DIR, read_creature_files
+from scripts.land_metadata import publish
+from scripts.metadata_pack import Pack, export, pack
+
+
+@pytest.fixture(scope="module")
+def creature_pack(tmp_path_factory):
+    pack_dir = tmp_path_factory.mktemp("creature-pack")
+    return pack_dir, pack(CREATURE_METADATA_DIR, pack_dir)
+
+
+def test_pack_reports_savings(creature_pack):
+    _, report = creature_pack
+    assert report.files == 11111
+    assert report.raw_bytes == sum(len(raw) for _, raw in read_creature_files())
+    assert report.storage_savings > 0.3
+    assert report.transfer_savings > 0.8
+
+
+def test_export_is_byte_identical(creature_pack, tmp_path):
+    pack_dir, _ = creature_pack
+    assert export(pack_dir, tmp_path, workers=2) == 11111
+    for path in CREATURE_METADATA_DIR.glob("*.json"):
+        exported = tmp_path / path.name
+        assert exported.read_bytes() == path.read_bytes()
+        assert gzip.decompress((tmp_path / f"{path.name}.gz").read_bytes()) == (
+            path.read_bytes()
+        )
+
+
+def test_land_export_to_cdn_layout(tmp_path):
+    estate_ids = estate_parcels((0, 0), 3)
+    estate_id = estate_token_id(estate_ids)
+    land_token_ids = estate_parcels((-3, -3), 6)
+    publish(
+        tmp_path / "published",
+        {estate_id: estate_ids},
+        land_token_ids=land_token_ids,
+        workers=1,
+    )
+    report = pack(tmp_path / "published", tmp_path / "pack")
+    assert report.files == len(land_token_ids) + 1
+    assert report.transfer_savings > 0.5
+
+    export(tmp_path / "pack", tmp_path / "cdn", gzipped=False, workers=1)
+    packed = Pack(tmp_path / "pack")
+    for token_id in land_token_ids:
+        path = f"land/{token_id % 256:02x}/{token_id}"
+        cdn_file = tmp_path / "cdn" / "metadata" / str(token_id)
+        assert cdn_file.read_bytes() == (tmp_path / "published" / path).read_bytes()
+        assert packed.read(path) == cdn_file.read_bytes()
+    assert (tmp_path / "cdn" / "estates-metadata" / str(estate_id)).exists()
+    assert not list((tmp_path / "cdn").rglob("*.gz"))
@@ -0,0 +1,60 @@
+from brownie import (
+    Contract,
+    HighriseCreate2Deployer,
+    HighriseEstate,
+    HighriseLand,
+    HighriseLandFund,
+    HighriseLandWithdrawal,
+    web3,
+)
+from brownie.network.account import LocalAccount
+from brownie.network.contract import ProjectContract
+
+from scripts.common import DEFAULT_ADMIN_ROLE, MINTER_ROLE, OWNER_ROLE
+from scripts.create2 import deploy_plan, plan
+from scripts.helpers import Project
+
+
+def test_create2_deployment(
+    admin: LocalAccount,
+    opensea_proxy_registry: ProjectContract,
+    oz: Project,
+):
+    factory = HighriseCreate2Deployer.deploy({"from": admin})
+    registry = opensea_proxy_registry.address
+    deployments = plan("test", admin.address, factory.address, registry)
+    other_environment = plan("other", admin.address, factory.address, registry)
+    assert not {d.address for d in deployments.values()} & {
+        d.address for d in other_environment.values()
+    }
+    for deployment in deployments.values():
+        assert deployment.address == factory.computeAddress(
+            admin, deployment.salt, web3.keccak(deployment.init_code)
+        )
+        assert not web3.eth.get_code(deployment.address)
+
+    deploy_plan(deployments, factory.address, admin)
+    addresses = {name: d.address for name, d in deployments.items()}
+    assert all(web3.eth.get_code(a) for a in addresses.values())
+    assert oz.ProxyAdmin.at(addresses["proxy_admin"]).owner() == admin
+    land = Contract.from_abi("HighriseLand", addresses["land_proxy"], HighriseLand.abi)
+    estate = Contract.from_abi(
+        "HighriseEstate", addresses["estate_proxy"], HighriseEstate.abi
+    )
+    for contract in [land, estate]:
+        assert contract.owner() == admin
+        assert contract.hasRole(DEFAULT_ADMIN_ROLE, admin)
+        assert not contract.hasRole(DEFAULT_ADMIN_ROLE, factory)
+        assert not contract.hasRole(OWNER_ROLE, factory)
+        assert contract.royaltyInfo(1, 10000)[0] == admin
+    assert land.hasRole(MINTER_ROLE, addresses["land_fund"])
+    assert land.hasRole(MINTER_ROLE, addresses["land_withdrawal"])
+    assert not land.hasRole(MINTER_ROLE, factory)
+    assert land.getRoleMemberCount(MINTER_ROLE) == 3
+    land_fund = HighriseLandFund.at(addresses["land_fund"])
+    assert land_fund.owner() == admin
+    assert land_fund.landContract() == land
+    assert HighriseLandWithdrawal.at(addresses["land_withdrawal"]).owner() == admin
+
+    # Reruns skip deployed contracts
+    deploy_plan(deployments, factory.address, admin)
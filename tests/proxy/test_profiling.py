@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import pytest
+from brownie import Contract, HighriseLand, HighriseLandV2
+from brownie.network.account import Account
+from brownie.network.contract import ProjectContract
+
+from scripts import profiling
+from scripts.common import upgrade
+from scripts.profiling import Profiler
+
+
+def test_profiler(
+    admin: Account,
+    land_proxy: ProjectContract,
+    proxy_admin: ProjectContract,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    trace = tmp_path / "trace.folded"
+    profiler = Profiler(trace)
+    monkeypatch.setattr(profiling, "profiler", profiler)
+    land = Contract.from_abi("HighriseLand", land_proxy.address, HighriseLand.abi)
+    land_v2 = HighriseLandV2.deploy({"from": admin})
+    with profiling.profile("release"):
+        mint = land.mint(admin, 1, {"from": admin})
+        assert land.ownerOf(1) == admin
+        upgrade(admin, land_proxy, land_v2.address, proxy_admin_contract=proxy_admin)
+    lines = []
+    profiler.finish(lines.append)
+
+    minted, upgraded = profiler.transactions
+    assert minted.stack == ("release",)
+    assert minted.label == "HighriseLand.mint"
+    assert minted.gas_used == mint.gas_used
+    assert minted.calldata_size == 4 + 2 * 32
+    assert 0 <= minted.confirmation_wait <= minted.wall_time
+    assert upgraded.stack == ("release", "upgrade")
+    assert upgraded.label == "ProxyAdmin.upgrade"
+    assert {row.label for row in profiler.summary()} == {
+        "HighriseLand.mint",
+        "ProxyAdmin.upgrade",
+    }
+
+    folded = {line.rsplit(" ", 1)[0] for line in trace.read_text().splitlines()}
+    assert "release;tx HighriseLand.mint" in folded
+    assert "release;upgrade;tx ProxyAdmin.upgrade" in folded
+    assert "release;rpc eth_call" in folded
+    assert any("HighriseLand.mint" in line for line in lines)
+    assert lines[-1] == f"Profile trace written to {trace}"
+
+    # Deployment before profiling started is not recorded, nor anything after
+    land.mint(admin, 2, {"from": admin})
+    assert len(profiler.transactions) == 2
@@ -0,0 +1,131 @@
+import pytest
+
+from scripts.storage_layout import (
+    check,
+    check_upgrades,
+    diff,
+    input_hash,
+    storage_layouts,
+    variables,
+)
+
+TYPES = {
+    "t_uint256": {"encoding": "inplace", "label": "uint256", "numberOfBytes": "32"},
+    "t_uint128": {"encoding": "inplace", "label": "uint128", "numberOfBytes": "16"},
+    "t_address": {"encoding": "inplace", "label": "address", "numberOfBytes": "20"},
+    "t_contract(ProxyRegistry)12": {
+        "encoding": "inplace",
+        "label": "contract ProxyRegistry",
+        "numberOfBytes": "20",
+    },
+    "t_array(t_uint256)3_storage": {
+        "base": "t_uint256",
+        "encoding": "inplace",
+        "label": "uint256[3]",
+        "numberOfBytes": "96",
+    },
+    "t_array(t_uint256)2_storage": {
+        "base": "t_uint256",
+        "encoding": "inplace",
+        "label": "uint256[2]",
+        "numberOfBytes": "64",
+    },
+    "t_mapping(t_address,t_uint256)": {
+        "encoding": "mapping",
+        "key": "t_address",
+        "label": "mapping(address => uint256)",
+        "numberOfBytes": "32",
+        "value": "t_uint256",
+    },
+}
+
+
+def layout(*storage: tuple[str, str, int, int, str]) -> list:
+    return variables(
+        {
+            "storage": [
+                {
+                    "astId": i,
+                    "contract": f"contracts/{contract}.sol:{contract}",
+                    "label": label,
+                    "offset": offset,
+                    "slot": str(slot),
+                    "type": type_id,
+                }
+                for i, (contract, label, slot, offset, type_id) in enumerate(storage)
+            ],
+            "types": TYPES,
+        }
+    )
+
+
+V1 = layout(
+    ("Base", "_value", 0, 0, "t_uint256"),
+    ("Base", "__gap", 1, 0, "t_array(t_uint256)3_storage"),
+    ("Land", "_registry", 4, 0, "t_contract(ProxyRegistry)12"),
+)
+
+
+def kinds(changes) -> list[tuple[str, str]]:
+    return [(c.kind, c.variable.label) for c in changes]
+
+
+def test_compatible_upgrade():
+    v2 = layout(
+        ("Base", "_value", 0, 0, "t_uint256"),
+        ("Base", "_balances", 1, 0, "t_mapping(t_address,t_uint256)"),
+        ("Base", "__gap", 2, 0, "t_array(t_uint256)2_storage"),
+        # Contract references are stored as addresses
+        ("Land", "_registry", 4, 0, "t_address"),
+        ("Land", "_extra", 5, 0, "t_uint256"),
+    )
+    assert kinds(check(V1, v2)) == [("gap", "_balances"), ("appended", "_extra")]
+
+
+def test_collisions():
+    # Gap not shrunk, contract variables shift by one slot
+    v2 = layout(
+        ("Base", "_value", 0, 0, "t_uint256"),
+        ("Base", "_balances", 1, 0, "t_mapping(t_address,t_uint256)"),
+        ("Base", "__gap", 2, 0, "t_array(t_uint256)3_storage"),
+        ("Land", "_registry", 5, 0, "t_address"),
+    )
+    assert kinds(diff(V1, v2)) == [("moved", "_registry"), ("gap", "_balances")]
+    with pytest.raises(ValueError, match="moved Land._registry at slot 4"):
+        check(V1, v2)
+
+    v2 = layout(
+        ("Base", "_value", 0, 0, "t_uint128"),
+        ("Base", "_other", 0, 16, "t_uint128"),
+        ("Base", "__gap", 1, 0, "t_array(t_uint256)2_storage"),
+        ("Base", "_pair", 3, 0, "t_array(t_uint256)2_storage"),
+    )
+    assert kinds(diff(V1, v2)) == [("retyped", "_value"), ("collision", "_registry")]
+
+    v2 = layout(
+        ("Base", "_value", 0, 0, "t_uint256"),
+        ("Base", "__gap", 1, 0, "t_array(t_uint256)3_storage"),
+        ("Land", "registry", 4, 0, "t_address"),
+    )
+    assert kinds(check(V1, v2)) == [("renamed", "_registry")]
+
+
+def test_input_hash():
+    input_json = {"sources": {"A.sol": {"content": "contract A {}"}}}
+    changed = {"sources": {"A.sol": {"content": "contract A { uint256 a; }"}}}
+    assert input_hash(input_json, "0.8.12") != input_hash(changed, "0.8.12")
+    assert input_hash(input_json, "0.8.12") != input_hash(input_json, "0.8.13")
+
+
+def test_land_upgrades(tmp_path):
+    layouts = storage_layouts(cache_folder=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+    # Recheck of unchanged sources is served from the cache
+    assert storage_layouts(cache_folder=tmp_path) == layouts
+    changes = check_upgrades(layouts)
+    v3_changes = changes[("HighriseLandV2", "HighriseLandV3")]
+    appended = [c.variable.label for c in v3_changes if c.kind == "appended"]
+    assert appended[:2] == ["_openseaProxies", "_estate"]
+    # V2 only adds `approveForTransfer`, V3 appends the same storage to both
+    assert changes[("HighriseLand", "HighriseLandV2")] == []
+    assert changes[("HighriseLand", "HighriseLandV3")] == v3_changes
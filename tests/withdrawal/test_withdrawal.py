@@ -1,12 +1,20 @@
+from itertools import islice
+
 import pytest
-from brownie import HighriseLandWithdrawal, exceptions
+from brownie import Contract, HighriseLandV3, HighriseLandWithdrawal, exceptions
 from brownie.network.account import LocalAccount
 from brownie.network.contract import ProjectContract
 from eth_abi import encode_abi
 from eth_account import Account
 from eth_account._utils.signing import sign_message_hash
+from eth_hash.auto import keccak
 from eth_keys import keys
-from eth_utils import keccak
+
+from scripts.common import encode_function_data
+from scripts.helpers import Project
+from scripts.land_withdrawal import generate_batch_withdrawal_requests
+
+from .. import LAND_BASE_TOKEN_URI, LAND_NAME, LAND_SYMBOL
 
 
 def generate_withdrawal_request(
@@ -23,7 +31,7 @@ def generate_withdrawal_request(
 @pytest.fixture
 def withdrawal_contract(admin: LocalAccount, land_contract) -> ProjectContract:
     withdrawal_contract = HighriseLandWithdrawal.deploy(
-        land_contract.address, {"from": admin}
+        admin, land_contract.address, {"from": admin}
     )
     return withdrawal_contract
 
@@ -48,6 +56,36 @@ def enabled_withdrawal_contract(
     return withdrawal_minter_contract
 
 
+@pytest.fixture
+def land_v3_contract(
+    admin: LocalAccount, opensea_proxy_registry: ProjectContract, oz: Project
+) -> ProjectContract:
+    land_impl = HighriseLandV3.deploy({"from": admin})
+    proxy_admin = oz.ProxyAdmin.deploy({"from": admin})
+    land_proxy = oz.TransparentUpgradeableProxy.deploy(
+        land_impl,
+        proxy_admin,
+        encode_function_data(
+            land_impl.initialize,
+            LAND_NAME,
+            LAND_SYMBOL,
+            LAND_BASE_TOKEN_URI,
+            opensea_proxy_registry.address,
+        ),
+        {"from": admin, "gas_limit": 2000000},
+    )
+    return Contract.from_abi("HighriseLandV3", land_proxy, HighriseLandV3.abi)
+
+
+def deploy_enabled_withdrawal(admin: LocalAccount, land) -> ProjectContract:
+    withdrawal_contract = HighriseLandWithdrawal.deploy(
+        admin, land.address, {"from": admin}
+    )
+    land.grantRole(land.MINTER_ROLE(), withdrawal_contract, {"from": admin}).wait(1)
+    withdrawal_contract.enable({"from": admin}).wait(1)
+    return withdrawal_contract
+
+
 def test_withdraw(
     admin: LocalAccount,
     enabled_withdrawal_contract: ProjectContract,
@@ -110,3 +148,104 @@ def test_modifier_only_owner(
     assert "Sender is not the owner" in str(excinfo.value)
 
     withdrawal_minter_contract.disable({"from": admin}).wait(1)
+
+
+def test_withdraw_batch(
+    admin: LocalAccount,
+    enabled_withdrawal_contract: ProjectContract,
+    land_contract: ProjectContract,
+    alice: Account,
+    charlie: Account,
+):
+    token_ids = [20, 21, 22, 23, 24]
+    (payload, sig), (rest_payload, rest_sig) = generate_batch_withdrawal_requests(
+        token_ids, alice.address, admin.private_key, batch_size=3
+    )
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        enabled_withdrawal_contract.withdrawBatch(payload, sig, {"from": charlie})
+    assert "Sender not approved to buy token" in str(excinfo.value)
+    # A batch payload is not a valid single token payload
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        enabled_withdrawal_contract.withdraw(payload, sig, {"from": alice})
+    assert "Sender not approved to buy token" in str(excinfo.value)
+
+    tx = enabled_withdrawal_contract.withdrawBatch(payload, sig, {"from": alice})
+    tx.wait(1)
+    assert [e["tokenId"] for e in tx.events["WithdrawLandEvent"]] == token_ids[:3]
+    enabled_withdrawal_contract.withdrawBatch(
+        rest_payload, rest_sig, {"from": alice}
+    ).wait(1)
+    assert all(land_contract.ownerOf(t) == alice for t in token_ids)
+    # Payloads cannot be replayed
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        enabled_withdrawal_contract.withdrawBatch(payload, sig, {"from": alice})
+    assert "token already minted" in str(excinfo.value)
+
+
+def test_withdraw_many(
+    admin: LocalAccount,
+    enabled_withdrawal_contract: ProjectContract,
+    land_contract: ProjectContract,
+    alice: Account,
+    invalid_admin: LocalAccount,
+):
+    token_ids = [30, 31, 32]
+    requests = [
+        generate_withdrawal_request(t, alice.address, admin.private_key)
+        for t in token_ids
+    ]
+    invalid = generate_withdrawal_request(33, alice.address, invalid_admin.private_key)
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        enabled_withdrawal_contract.withdrawMany(
+            *zip(*requests, invalid), {"from": alice}
+        )
+    assert "Payload verification failed" in str(excinfo.value)
+    with pytest.raises(exceptions.VirtualMachineError) as excinfo:
+        enabled_withdrawal_contract.withdrawMany(
+            [p for p, _ in requests], [], {"from": alice}
+        )
+    assert "Payload and signature count differ" in str(excinfo.value)
+
+    enabled_withdrawal_contract.withdrawMany(*zip(*requests), {"from": alice}).wait(1)
+    assert all(land_contract.ownerOf(t) == alice for t in token_ids)
+
+
+def test_withdrawal_gas_per_parcel(
+    admin: LocalAccount,
+    land_contract: ProjectContract,
+    land_v3_contract: ProjectContract,
+    alice: Account,
+):
+    parcels = 10
+    gas_per_parcel = {}
+    for land in [land_contract, land_v3_contract]:
+        withdrawal_contract = deploy_enabled_withdrawal(admin, land)
+        token_ids = iter(range(100, 100 + 3 * parcels))
+        single = [
+            withdrawal_contract.withdraw(
+                *generate_withdrawal_request(t, alice.address, admin.private_key),
+                {"from": alice},
+            ).gas_used
+            for t in islice(token_ids, parcels)
+        ]
+        requests = [
+            generate_withdrawal_request(t, alice.address, admin.private_key)
+            for t in islice(token_ids, parcels)
+        ]
+        many = withdrawal_contract.withdrawMany(*zip(*requests), {"from": alice})
+        [batch_request] = generate_batch_withdrawal_requests(
+            list(token_ids), alice.address, admin.private_key
+        )
+        batch = withdrawal_contract.withdrawBatch(*batch_request, {"from": alice})
+        gas_per_parcel[land._name] = {
+            "withdraw": sum(single) // parcels,
+            "withdrawMany": many.gas_used // parcels,
+            "withdrawBatch": batch.gas_used // parcels,
+        }
+    print(f"Withdrawal gas per parcel, {parcels} parcels: {gas_per_parcel}")
+    for gas in gas_per_parcel.values():
+        assert gas["withdrawBatch"] < gas["withdrawMany"] < gas["withdraw"]
+    assert (
+        gas_per_parcel["HighriseLandV3"]["withdrawBatch"]
+        < gas_per_parcel["HighriseLand"]["withdrawBatch"]
+    )